@@ -0,0 +1,184 @@
+"""Accept-Encoding negotiated compression for large JSON responses.
+
+Applied as ASGI middleware to a fixed set of paths (package listings, journal
+export, config snapshots) whose bodies repeat the same keys, source ids and
+path prefixes. gzip is always available; zstd is preferred when the optional
+``zstandard`` package is installed and the client lists it. With a trained
+dictionary (``ZSTD_DICT``), clients that send its id in ``X-Zstd-Dictionary``
+get dictionary-compressed bodies, which helps most on small and medium
+listings where plain zstd has little history to work with.
+
+Bodies under ``minimum_size`` and responses that already carry a
+Content-Encoding pass through. Streaming responses are compressed chunk by
+chunk with a flushed stream compressor, so clients still see data as it is
+produced.
+"""
+
+from __future__ import annotations
+
+import zlib
+from collections.abc import Iterable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+DICTIONARY_HEADER = "X-Zstd-Dictionary"
+
+
+def parse_accept_encoding(value: str) -> dict[str, float]:
+    """Map each listed coding to its q-value ("gzip;q=0.5, br" -> {"gzip": 0.5, "br": 1.0})."""
+    codings: dict[str, float] = {}
+    for part in value.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, raw = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(raw)
+                except ValueError:
+                    quality = 0.0
+        codings[coding] = quality
+    return codings
+
+
+def train_zstd_dictionary(samples: Iterable[bytes], size: int = 110 * 1024) -> bytes:
+    """Train a zstd dictionary from sample bodies (e.g. one manifest JSON per sample)."""
+    if zstandard is None:
+        raise RuntimeError("zstandard is not installed")
+    return zstandard.train_dictionary(size, list(samples)).as_bytes()
+
+
+class _Encoder:
+    """Stream encoder: ``chunk(data, final)`` returns bytes that are decodable so far."""
+
+    def __init__(self, coding: str, gzip_level: int, zstd_level: int, dictionary: object | None) -> None:
+        self.coding = coding
+        if coding == "zstd":
+            compressor = zstandard.ZstdCompressor(level=zstd_level, dict_data=dictionary)
+            self._obj = compressor.compressobj()
+        else:
+            self._obj = zlib.compressobj(gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def chunk(self, data: bytes, final: bool) -> bytes:
+        out = self._obj.compress(data)
+        if self.coding == "zstd":
+            mode = zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            return out + self._obj.flush(mode)
+        return out + (self._obj.flush() if final else self._obj.flush(zlib.Z_SYNC_FLUSH))
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        paths: Iterable[str],
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+        zstd_dictionary: bytes | None = None,
+    ) -> None:
+        self.app = app
+        self.paths = frozenset(paths)
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+        self._dictionary = None
+        if zstd_dictionary and zstandard is not None:
+            self._dictionary = zstandard.ZstdCompressionDict(zstd_dictionary)
+
+    @property
+    def dictionary_id(self) -> int | None:
+        return self._dictionary.dict_id() if self._dictionary is not None else None
+
+    def negotiate(self, headers: Headers) -> tuple[str | None, object | None]:
+        """Pick (coding, zstd dictionary) for a request; (None, None) means identity."""
+        accepted = parse_accept_encoding(headers.get("accept-encoding", ""))
+        if zstandard is not None and accepted.get("zstd", 0) > 0:
+            dictionary = None
+            if self._dictionary is not None and headers.get(DICTIONARY_HEADER) == str(self.dictionary_id):
+                dictionary = self._dictionary
+            return "zstd", dictionary
+        if accepted.get("gzip", 0) > 0:
+            return "gzip", None
+        return None, None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        coding, dictionary = self.negotiate(Headers(scope=scope))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingSend(self, send, coding, dictionary)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingSend:
+    """``send`` wrapper that decides on the first body chunk whether to compress."""
+
+    def __init__(self, middleware: CompressionMiddleware, send: Send, coding: str, dictionary: object | None) -> None:
+        self.middleware = middleware
+        self.send = send
+        self.coding = coding
+        self.dictionary = dictionary
+        self.start: Message | None = None
+        self.encoder: _Encoder | None = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send_start()
+            await self.send(message)
+            return
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            await self._first_body(body, more_body)
+            return
+        if self.encoder is None:
+            await self.send(message)
+            return
+        await self.send(
+            {"type": "http.response.body", "body": self.encoder.chunk(body, not more_body), "more_body": more_body}
+        )
+
+    async def _send_start(self) -> None:
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self.send(start)
+
+    async def _first_body(self, body: bytes, more_body: bool) -> None:
+        headers = MutableHeaders(raw=self.start["headers"])
+        if "content-encoding" in headers:
+            await self._send_start()
+            await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+        headers.add_vary_header("Accept-Encoding")
+        if not more_body and len(body) < self.middleware.minimum_size:
+            await self._send_start()
+            await self.send({"type": "http.response.body", "body": body, "more_body": False})
+            return
+        self.encoder = _Encoder(self.coding, self.middleware.gzip_level, self.middleware.zstd_level, self.dictionary)
+        data = self.encoder.chunk(body, not more_body)
+        headers["Content-Encoding"] = self.coding
+        if self.dictionary is not None:
+            headers[DICTIONARY_HEADER] = str(self.middleware.dictionary_id)
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(data))
+        await self._send_start()
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
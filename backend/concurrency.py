@@ -0,0 +1,114 @@
+"""Concurrency primitives for dispatcher state shared across request threads."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+from collections.abc import Iterator, MutableMapping
+from operator import itemgetter
+from typing import Any
+
+_SEQ = itemgetter(0)
+
+
+class ShardedDict(MutableMapping):
+    """Dict split into independently locked shards, keyed by ``hash(key)``.
+
+    Iteration preserves global insertion order (like ``dict``) by tagging each
+    entry with a sequence number and merging shard snapshots, so API listings do
+    not change order with sharding. ``values()`` and ``items()`` return
+    snapshots, which makes them safe to iterate while other threads write.
+    """
+
+    def __init__(self, shards: int = 16, data: dict | None = None) -> None:
+        self._count = max(1, shards)
+        self._shards: list[dict[Any, tuple[int, Any]]] = [{} for _ in range(self._count)]
+        self._locks = [threading.RLock() for _ in range(self._count)]
+        self._seq = itertools.count()
+        if data:
+            self.update(data)
+
+    def _slot(self, key: Any) -> int:
+        return hash(key) % self._count
+
+    def lock_for(self, key: Any) -> threading.RLock:
+        """Lock guarding ``key``; hold it for read-modify-write of one value."""
+        return self._locks[self._slot(key)]
+
+    def __getitem__(self, key: Any) -> Any:
+        slot = self._slot(key)
+        with self._locks[slot]:
+            return self._shards[slot][key][1]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        slot = self._slot(key)
+        with self._locks[slot]:
+            shard = self._shards[slot]
+            existing = shard.get(key)
+            seq = existing[0] if existing is not None else next(self._seq)
+            shard[key] = (seq, value)
+
+    def __delitem__(self, key: Any) -> None:
+        slot = self._slot(key)
+        with self._locks[slot]:
+            del self._shards[slot][key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._shards[self._slot(key)]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def __iter__(self) -> Iterator[Any]:
+        return (key for key, _ in self.items())
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        slot = self._slot(key)
+        with self._locks[slot]:
+            entry = self._shards[slot].get(key)
+        return default if entry is None else entry[1]
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        slot = self._slot(key)
+        with self._locks[slot]:
+            entry = self._shards[slot].pop(key, None)
+        if entry is None:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        return entry[1]
+
+    def _entries(self) -> Iterator[tuple[int, Any, Any]]:
+        snapshots = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                snapshots.append([(seq, key, value) for key, (seq, value) in shard.items()])
+        return heapq.merge(*snapshots, key=_SEQ)
+
+    def items(self) -> list[tuple[Any, Any]]:  # type: ignore[override]
+        return [(key, value) for _, key, value in self._entries()]
+
+    def values(self) -> list[Any]:  # type: ignore[override]
+        return [value for _, _, value in self._entries()]
+
+    def keys(self) -> list[Any]:  # type: ignore[override]
+        return [key for _, key, _ in self._entries()]
+
+    def snapshot(self) -> dict[Any, Any]:
+        """Ordered copy with each dict value shallow-copied under its shard lock."""
+        out: dict[Any, Any] = {}
+        snapshots = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                snapshots.append(
+                    [(seq, key, dict(value) if isinstance(value, dict) else value) for key, (seq, value) in shard.items()]
+                )
+        for _, key, value in heapq.merge(*snapshots, key=_SEQ):
+            out[key] = value
+        return out
+
+    def clear(self) -> None:
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
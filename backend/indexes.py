@@ -0,0 +1,556 @@
+"""In-memory secondary indexes over dispatcher jobs.
+
+Indexes are derived data: they are never persisted and are rebuilt from
+``DispatcherState.jobs`` on load.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import math
+import random
+import sys
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+_COMMON = Path(__file__).resolve().parent.parent / "clients" / "common"
+if str(_COMMON) not in sys.path:
+    sys.path.insert(0, str(_COMMON))
+
+from merkle import MAX_DEPTH as MERKLE_DEPTH, MerkleTree  # noqa: E402  (engines build the same tree)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter for cheap "definitely not seen" checks."""
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.01) -> None:
+        capacity = max(1, int(capacity))
+        bits = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.size = max(8, bits)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def clear(self) -> None:
+        self._bits = bytearray(len(self._bits))
+
+
+class ChecksumIndex:
+    """Content-addressed index: checksum -> package ids, in ingest order.
+
+    With ``bloom_capacity`` set, lookups for never-seen checksums are answered
+    by a Bloom filter before touching the hash map. Deleted checksums stay in
+    the filter, which only costs an extra map probe.
+    """
+
+    def __init__(self, bloom_capacity: int | None = None) -> None:
+        self._ids: dict[str, list[str]] = {}
+        self._by_job: dict[str, str] = {}
+        self._bloom = BloomFilter(bloom_capacity) if bloom_capacity else None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, job_id: str, checksum: str | None) -> None:
+        """Index (or re-index) a job under its current checksum."""
+        previous = self._by_job.get(job_id)
+        if previous == checksum:
+            return
+        if previous is not None:
+            self.discard(job_id)
+        if not checksum:
+            return
+        self._ids.setdefault(checksum, []).append(job_id)
+        self._by_job[job_id] = checksum
+        if self._bloom is not None:
+            self._bloom.add(checksum)
+
+    def discard(self, job_id: str) -> None:
+        checksum = self._by_job.pop(job_id, None)
+        if checksum is None:
+            return
+        ids = self._ids.get(checksum, [])
+        if job_id in ids:
+            ids.remove(job_id)
+        if not ids:
+            self._ids.pop(checksum, None)
+
+    def ids(self, checksum: str | None) -> list[str]:
+        if not checksum:
+            return []
+        if self._bloom is not None and checksum not in self._bloom:
+            return []
+        return list(self._ids.get(checksum, ()))
+
+    def first(self, checksum: str | None, exclude: str | None = None) -> str | None:
+        """Oldest package id carrying ``checksum`` (other than ``exclude``)."""
+        for job_id in self.ids(checksum):
+            if job_id != exclude:
+                return job_id
+        return None
+
+    def clear(self) -> None:
+        self._ids.clear()
+        self._by_job.clear()
+        if self._bloom is not None:
+            self._bloom.clear()
+
+
+def id_order_key(job_id: str) -> tuple[int, int, str]:
+    """Sort key matching allocation order for ``job-<n>`` ids (others sort after)."""
+    _, _, number = job_id.rpartition("-")
+    if number.isdigit():
+        return (0, int(number), job_id)
+    return (1, 0, job_id)
+
+
+class BacklogIndex:
+    """Per-source ids of unfinished (not completed) packages, in allocation order.
+
+    Each source keeps a sorted key list, so a page after a cursor is a bisect
+    plus a slice: resume cost follows the source's backlog, not the job count.
+    """
+
+    def __init__(self) -> None:
+        self._keys: dict[str, list[tuple[int, int, str]]] = {}
+        self._source_of: dict[str, str] = {}
+
+    def update(self, job_id: str, job: dict) -> None:
+        source_id = job.get("source_id")
+        unfinished = source_id is not None and job.get("status") != "completed"
+        current = self._source_of.get(job_id)
+        if unfinished and current == source_id:
+            return
+        if current is not None:
+            self.discard(job_id)
+        if unfinished:
+            bisect.insort(self._keys.setdefault(source_id, []), id_order_key(job_id))
+            self._source_of[job_id] = source_id
+
+    def discard(self, job_id: str) -> None:
+        source_id = self._source_of.pop(job_id, None)
+        if source_id is None:
+            return
+        keys = self._keys[source_id]
+        key = id_order_key(job_id)
+        pos = bisect.bisect_left(keys, key)
+        if pos < len(keys) and keys[pos] == key:
+            del keys[pos]
+        if not keys:
+            del self._keys[source_id]
+
+    def count(self, source_id: str) -> int:
+        return len(self._keys.get(source_id, ()))
+
+    def page(self, source_id: str, after: str | None = None, limit: int | None = None) -> list[str]:
+        """Unfinished ids of ``source_id`` after the ``after`` id (exclusive)."""
+        keys = self._keys.get(source_id, [])
+        start = bisect.bisect_right(keys, id_order_key(after)) if after else 0
+        end = len(keys) if limit is None else start + limit
+        return [key[2] for key in keys[start:end]]
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._source_of.clear()
+
+
+class MerkleIndex:
+    """Per-source Merkle trees over (path, checksum, status), one entry per path.
+
+    Engines build the same tree locally (``clients/common/merkle.py``, keyed by
+    path) and compare digests top-down to find the branches that differ. A
+    path that was ingested more than once is represented by its latest job
+    (``created_at``, then job number), so re-ingests do not leave a stale
+    entry that keeps its bucket divergent.
+    """
+
+    def __init__(self) -> None:
+        self._trees: dict[str, MerkleTree] = {}
+        # job_id -> (source_id, path, order, (path, checksum, status))
+        self._jobs: dict[str, tuple[str, str, tuple, tuple]] = {}
+        self._by_path: dict[tuple[str, str], set[str]] = {}
+
+    def update(self, job_id: str, job: dict) -> None:
+        source_id = job.get("source_id")
+        path = job.get("path")
+        if source_id is None or path is None:
+            self.discard(job_id)
+            return
+        record = (source_id, path, _job_order(job_id, job), (path, job.get("checksum"), job.get("status")))
+        if self._jobs.get(job_id) == record:
+            return
+        self.discard(job_id)
+        self._jobs[job_id] = record
+        self._by_path.setdefault((source_id, path), set()).add(job_id)
+        self._refresh(source_id, path)
+
+    def discard(self, job_id: str) -> None:
+        record = self._jobs.pop(job_id, None)
+        if record is None:
+            return
+        key = (record[0], record[1])
+        jobs = self._by_path[key]
+        jobs.discard(job_id)
+        if not jobs:
+            del self._by_path[key]
+        self._refresh(*key)
+
+    def _refresh(self, source_id: str, path: str) -> None:
+        """Point the tree entry for ``path`` at its latest job, or drop it."""
+        jobs = self._by_path.get((source_id, path))
+        if jobs:
+            latest = max(jobs, key=lambda job_id: self._jobs[job_id][2])
+            self._trees.setdefault(source_id, MerkleTree()).update(path, *self._jobs[latest][3])
+            return
+        tree = self._trees.get(source_id)
+        if tree is not None:
+            tree.discard(path)
+            if not len(tree):
+                del self._trees[source_id]
+
+    def tree(self, source_id: str) -> MerkleTree:
+        return self._trees.get(source_id) or MerkleTree()
+
+    def clear(self) -> None:
+        self._trees.clear()
+        self._jobs.clear()
+        self._by_path.clear()
+
+
+def _job_order(job_id: str, job: dict) -> tuple[str, int, str]:
+    number = job_id.rpartition("-")[2]
+    return (job.get("created_at") or "", int(number) if number.isdigit() else -1, job_id)
+
+
+def _parent_dirs(path: str) -> list[str]:
+    """Directory prefixes of ``path``: "a/b/c.txt" -> ["", "a/", "a/b/"]."""
+    dirs = [""]
+    end = path.find("/")
+    while end != -1:
+        dirs.append(path[: end + 1])
+        end = path.find("/", end + 1)
+    return dirs
+
+
+class PathIndex:
+    """Sorted (path, job_id) keys with per-directory count/size aggregates.
+
+    Kept globally and per source. A prefix page is a bisect plus a slice, and
+    directory totals are maintained incrementally (O(path depth) per update),
+    so browsing does not scan the packages under a directory.
+    """
+
+    def __init__(self) -> None:
+        self._keys: dict[str | None, list[tuple[str, str]]] = {None: []}
+        self._entries: dict[str, tuple[str, str, int]] = {}  # job_id -> (source_id, path, size)
+        self._dirs: dict[tuple[str | None, str], list[int]] = {}  # (scope, dir) -> [count, bytes]
+        self._children: dict[tuple[str | None, str], set[str]] = {}
+
+    def update(self, job_id: str, job: dict) -> None:
+        path = job.get("path")
+        entry = (job.get("source_id") or "", path, int(job.get("size_bytes") or 0)) if path else None
+        if self._entries.get(job_id) == entry:
+            return
+        self.discard(job_id)
+        if entry is None:
+            return
+        self._entries[job_id] = entry
+        source_id, path, size = entry
+        for scope in (None, source_id):
+            bisect.insort(self._keys.setdefault(scope, []), (path, job_id))
+            self._add_to_dirs(scope, path, 1, size)
+
+    def discard(self, job_id: str) -> None:
+        entry = self._entries.pop(job_id, None)
+        if entry is None:
+            return
+        source_id, path, size = entry
+        for scope in (None, source_id):
+            keys = self._keys[scope]
+            pos = bisect.bisect_left(keys, (path, job_id))
+            if pos < len(keys) and keys[pos] == (path, job_id):
+                del keys[pos]
+            if not keys and scope is not None:
+                del self._keys[scope]
+            self._add_to_dirs(scope, path, -1, -size)
+
+    def _add_to_dirs(self, scope: str | None, path: str, count: int, size: int) -> None:
+        dirs = _parent_dirs(path)
+        for i, directory in enumerate(dirs):
+            totals = self._dirs.setdefault((scope, directory), [0, 0])
+            totals[0] += count
+            totals[1] += size
+            if totals[0] == 0:
+                del self._dirs[(scope, directory)]
+                if i:
+                    children = self._children.get((scope, dirs[i - 1]))
+                    if children is not None:
+                        children.discard(directory)
+                        if not children:
+                            del self._children[(scope, dirs[i - 1])]
+            elif i and count > 0:
+                self._children.setdefault((scope, dirs[i - 1]), set()).add(directory)
+
+    def totals(self, prefix: str, source_id: str | None = None) -> tuple[int, int]:
+        """(count, bytes) of packages whose path starts with ``prefix``."""
+        directory = prefix[: prefix.rfind("/") + 1]
+        if directory == prefix:
+            return tuple(self._dirs.get((source_id, prefix), (0, 0)))
+        count = size = 0
+        for path, job_id in self._range(prefix, source_id):
+            count += 1
+            size += self._entries[job_id][2]
+        return count, size
+
+    def directories(self, prefix: str, source_id: str | None = None) -> list[tuple[str, int, int]]:
+        """Immediate subdirectories matching ``prefix`` as (dir, count, bytes)."""
+        directory = prefix[: prefix.rfind("/") + 1]
+        children = self._children.get((source_id, directory), ())
+        return [
+            (child, *self._dirs[(source_id, child)])
+            for child in sorted(children)
+            if child.startswith(prefix)
+        ]
+
+    def page(
+        self, prefix: str, source_id: str | None = None, after: tuple[str, str] | None = None, limit: int = 100
+    ) -> list[tuple[str, str]]:
+        """(path, job_id) keys under ``prefix``, starting after the ``after`` key."""
+        out = []
+        for key in self._range(prefix, source_id, after):
+            if len(out) >= limit:
+                break
+            out.append(key)
+        return out
+
+    def _range(self, prefix: str, source_id: str | None, after: tuple[str, str] | None = None):
+        keys = self._keys.get(source_id, [])
+        start = bisect.bisect_left(keys, (prefix, ""))
+        if after is not None:
+            start = max(start, bisect.bisect_right(keys, after))
+        for pos in range(start, len(keys)):
+            key = keys[pos]
+            if not key[0].startswith(prefix):
+                return
+            yield key
+
+    def clear(self) -> None:
+        self._keys = {None: []}
+        self._entries.clear()
+        self._dirs.clear()
+        self._children.clear()
+
+
+def seen_epoch(last_seen_at: str | None) -> float | None:
+    """Epoch seconds of an ISO ``last_seen_at`` (None when missing, unparseable or naive)."""
+    if not last_seen_at:
+        return None
+    try:
+        seen = datetime.fromisoformat(last_seen_at.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    if seen.tzinfo is None:
+        return None
+    return seen.timestamp()
+
+
+class _SkipNode:
+    __slots__ = ("key", "next")
+
+    def __init__(self, key: Any, level: int) -> None:
+        self.key = key
+        self.next: list[_SkipNode | None] = [None] * level
+
+
+class SkipList:
+    """Sorted unique keys with expected O(log n) add, remove, max and range start.
+
+    Level promotion uses a fixed-seed ``random.Random``, so layouts (and
+    timings) are reproducible across runs.
+    """
+
+    MAX_LEVEL = 24
+    P = 0.25
+
+    def __init__(self) -> None:
+        self._head = _SkipNode(None, self.MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+        self._random = random.Random(0x5EED)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _predecessors(self, key: Any) -> list[_SkipNode]:
+        """Per level, the last node whose key is < ``key``."""
+        update = [self._head] * self.MAX_LEVEL
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            nxt = node.next[i]
+            while nxt is not None and nxt.key < key:
+                node = nxt
+                nxt = node.next[i]
+            update[i] = node
+        return update
+
+    def add(self, key: Any) -> None:
+        update = self._predecessors(key)
+        level = 1
+        while level < self.MAX_LEVEL and self._random.random() < self.P:
+            level += 1
+        self._level = max(self._level, level)
+        node = _SkipNode(key, level)
+        for i in range(level):
+            node.next[i] = update[i].next[i]
+            update[i].next[i] = node
+        self._size += 1
+
+    def remove(self, key: Any) -> bool:
+        update = self._predecessors(key)
+        node = update[0].next[0]
+        if node is None or node.key != key:
+            return False
+        for i in range(len(node.next)):
+            update[i].next[i] = node.next[i]
+        while self._level > 1 and self._head.next[self._level - 1] is None:
+            self._level -= 1
+        self._size -= 1
+        return True
+
+    def last(self) -> Any:
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.next[i] is not None:
+                node = node.next[i]
+        return None if node is self._head else node.key
+
+    def irange(self, low: Any = None, high: Any = None) -> Iterator[Any]:
+        """Keys with ``low <= key < high`` in order (either bound may be None)."""
+        node = self._predecessors(low)[0].next[0] if low is not None else self._head.next[0]
+        while node is not None and (high is None or node.key < high):
+            yield node.key
+            node = node.next[0]
+
+    def clear(self) -> None:
+        self._head = _SkipNode(None, self.MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+
+
+class LivenessIndex:
+    """Sources ordered by last-seen epoch in a skip list.
+
+    A heartbeat moves one source (expected O(log n)); the most recent sighting
+    is the last key, and "seen between" queries start with an O(log n) search,
+    so active/stale checks do not parse every source.
+    """
+
+    def __init__(self) -> None:
+        self._keys = SkipList()
+        self._epochs: dict[str, float] = {}
+
+    def update(self, source_id: str, source: dict) -> None:
+        epoch = seen_epoch(source.get("last_seen_at"))
+        if self._epochs.get(source_id) == epoch:
+            return
+        self.discard(source_id)
+        if epoch is not None:
+            self._keys.add((epoch, source_id))
+            self._epochs[source_id] = epoch
+
+    def discard(self, source_id: str) -> None:
+        epoch = self._epochs.pop(source_id, None)
+        if epoch is not None:
+            self._keys.remove((epoch, source_id))
+
+    def latest(self) -> float | None:
+        last = self._keys.last()
+        return last[0] if last is not None else None
+
+    def epoch(self, source_id: str) -> float | None:
+        return self._epochs.get(source_id)
+
+    def seen_between(self, low: float | None = None, high: float | None = None) -> list[str]:
+        """Source ids seen at ``low <= epoch < high``, least recently seen first."""
+        keys = self._keys.irange(None if low is None else (low,), None if high is None else (high,))
+        return [source_id for _, source_id in keys]
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._epochs.clear()
+
+
+class CreationIndex:
+    """Job ids per ``package_type``, sorted by ``created_at`` epoch.
+
+    Unparseable timestamps sort last (age 0, like the API's age computation).
+    Range lookups are bisects; callers re-check exact predicates on the result.
+    """
+
+    def __init__(self) -> None:
+        self._keys: dict[str | None, list[tuple[float, str]]] = {}
+        self._entries: dict[str, tuple[str | None, float]] = {}
+
+    def update(self, job_id: str, job: dict) -> None:
+        created = seen_epoch(job.get("created_at"))
+        entry = (job.get("package_type"), math.inf if created is None else created)
+        if self._entries.get(job_id) == entry:
+            return
+        self.discard(job_id)
+        self._entries[job_id] = entry
+        bisect.insort(self._keys.setdefault(entry[0], []), (entry[1], job_id))
+
+    def discard(self, job_id: str) -> None:
+        entry = self._entries.pop(job_id, None)
+        if entry is None:
+            return
+        keys = self._keys[entry[0]]
+        pos = bisect.bisect_left(keys, (entry[1], job_id))
+        if pos < len(keys) and keys[pos] == (entry[1], job_id):
+            del keys[pos]
+        if not keys:
+            del self._keys[entry[0]]
+
+    def created_between(
+        self,
+        package_types: list[str | None] | None = None,
+        low: float | None = None,
+        high: float | None = None,
+        limit: int | None = None,
+    ) -> list[str]:
+        """Ids created at ``low <= epoch <= high`` for the given types (None = every type).
+
+        Oldest first within each type; at most ``limit`` ids.
+        """
+        out: list[str] = []
+        types = list(self._keys) if package_types is None else package_types
+        for package_type in types:
+            keys = self._keys.get(package_type, [])
+            start = bisect.bisect_left(keys, (low,)) if low is not None else 0
+            end = bisect.bisect_right(keys, (high, "\uffff")) if high is not None else len(keys)
+            if limit is not None:
+                end = min(end, start + limit - len(out))
+            out.extend(job_id for _, job_id in keys[start:end])
+            if limit is not None and len(out) >= limit:
+                break
+        return out
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._entries.clear()
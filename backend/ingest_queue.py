@@ -0,0 +1,140 @@
+"""Bounded in-process ingest queue drained by a small worker pool.
+
+Used when ``INGEST_QUEUE=1``: the ingest route validates and enqueues, and
+workers materialize jobs in batches. A full queue is reported to the caller so
+the route can answer 429 instead of piling up latency. Workers run alongside
+request threads, so the handler must only touch state through the locked
+``DispatcherState`` methods.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class QueueFull(Exception):
+    """Raised by ``IngestQueue.submit`` when the queue is at capacity."""
+
+
+class IngestQueue:
+    def __init__(
+        self,
+        handler: Callable[[list[Any]], None],
+        *,
+        maxsize: int = 10_000,
+        workers: int = 1,
+        batch_size: int = 100,
+    ) -> None:
+        self._handler = handler
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+        self._workers = max(1, workers)
+        self._batch_size = max(1, batch_size)
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._submit_lock = threading.Lock()
+        self._count_lock = threading.Lock()  # worker counters; accepted/rejected use _submit_lock
+        self.accepted = 0
+        self.rejected = 0
+        self.processed = 0
+        self.failed = 0
+        self.batches = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self._workers):
+                thread = threading.Thread(target=self._run, name=f"ingest-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Drain outstanding items, then stop the workers."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(_STOP)
+        for thread in threads:
+            thread.join(timeout)
+
+    def submit(self, make_item: Callable[[], Any]) -> Any:
+        """Admit one item, building it only once a slot is free; return the item.
+
+        Submitters serialize on a lock and workers only remove items, so the
+        capacity check cannot be invalidated before ``put``. Nothing (e.g. an id)
+        is allocated for a request that is rejected.
+        """
+        self.start()
+        with self._submit_lock:
+            if self._queue.full():
+                self.rejected += 1
+                raise QueueFull
+            item = make_item()
+            self._queue.put_nowait(item)
+            self.accepted += 1
+        return item
+
+    def join(self) -> None:
+        """Block until every submitted item has been handled."""
+        self._queue.join()
+
+    def stats(self) -> dict:
+        with self._submit_lock:
+            accepted, rejected = self.accepted, self.rejected
+        with self._count_lock:
+            processed, failed, batches = self.processed, self.failed, self.batches
+        return {
+            "depth": self._queue.qsize(),
+            "maxsize": self._queue.maxsize,
+            "workers": self._workers,
+            "batch_size": self._batch_size,
+            "accepted": accepted,
+            "rejected": rejected,
+            "processed": processed,
+            "failed": failed,
+            "batches": batches,
+        }
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            batch = [item]
+            stopping = False
+            while len(batch) < self._batch_size:
+                try:
+                    extra = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if extra is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(extra)
+            ok = False
+            try:
+                self._handler(batch)
+                ok = True
+            except Exception:  # noqa: BLE001
+                logger.exception("ingest batch failed", extra={"event_type": "ingest_batch_failed"})
+            finally:
+                with self._count_lock:
+                    if ok:
+                        self.processed += len(batch)
+                    else:
+                        self.failed += len(batch)
+                    self.batches += 1
+                for _ in batch:
+                    self._queue.task_done()
+            if stopping:
+                return
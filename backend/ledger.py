@@ -0,0 +1,119 @@
+"""Hash chain and signed checkpoints for the yard ledger (journal).
+
+Each event carries ``prev_hash`` (the previous event's ``hash``, or
+``GENESIS_HASH`` for the first sealed event) and its own ``hash``: SHA-256 of
+the canonical JSON of the event without ``hash``. Editing, removing or
+reordering an event breaks every later link.
+
+Every ``JOURNAL_CHECKPOINT_EVERY`` events a checkpoint records
+(``event_id``, ``hash``) with an HMAC-SHA256 signature. The key
+(``JOURNAL_HMAC_KEY``, or a key file next to the database) is kept out of the
+state itself, so rewriting the ledger and its checkpoints together is still
+detected. Verification starts at a checkpoint and only rehashes the events
+after it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import os
+import secrets
+from datetime import datetime, timezone
+from pathlib import Path
+
+GENESIS_HASH = "0" * 64
+
+
+def event_number(event_id: str) -> int:
+    """"evt-42" -> 42."""
+    return int(event_id.removeprefix("evt-"))
+
+
+def event_hash(event: dict) -> str:
+    body = {k: v for k, v in event.items() if k != "hash"}
+    raw = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def seal(event: dict, prev_hash: str | None) -> dict:
+    """Link ``event`` (which already has its ``event_id``) after ``prev_hash``."""
+    event = {**event, "prev_hash": prev_hash or GENESIS_HASH}
+    event["hash"] = event_hash(event)
+    return event
+
+
+def _signature(key: bytes, event_id: str, digest: str) -> str:
+    return hmac.new(key, f"{event_id}:{digest}".encode(), hashlib.sha256).hexdigest()
+
+
+def make_checkpoint(key: bytes, event: dict) -> dict:
+    return {
+        "event_id": event["event_id"],
+        "hash": event["hash"],
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "signature": _signature(key, event["event_id"], event["hash"]),
+    }
+
+
+def checkpoint_valid(key: bytes, checkpoint: dict) -> bool:
+    expected = _signature(key, checkpoint["event_id"], checkpoint["hash"])
+    return hmac.compare_digest(expected, checkpoint.get("signature", ""))
+
+
+def load_key(configured: str, path: Path | None) -> bytes:
+    """Configured key, else the key file at ``path`` (created once), else a per-process key."""
+    if configured:
+        return configured.encode("utf-8")
+    if path is None:
+        return secrets.token_bytes(32)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return bytes.fromhex(path.read_text().strip())
+    key = secrets.token_bytes(32)
+    with os.fdopen(fd, "w") as fh:
+        fh.write(key.hex())
+    return key
+
+
+def verify(events: list[dict], prev_hash: str, checkpoints: dict[str, dict], key: bytes) -> dict:
+    """Check ``events`` (in ledger order) link on from ``prev_hash``.
+
+    Checkpoints met on the way are checked too; the last one passed is
+    reported so the next audit can start there. Events written before the
+    chain existed (no ``hash``) are skipped while no sealed event has been seen.
+    """
+    checked = 0
+    unsealed = 0
+    verified_checkpoint = None
+
+    def result(event: dict | None = None, reason: str | None = None) -> dict:
+        return {
+            "ok": reason is None,
+            "checked_events": checked,
+            "unsealed_events": unsealed,
+            "last_hash": prev_hash,
+            "verified_checkpoint": verified_checkpoint,
+            "error": None if reason is None else {"event_id": event.get("event_id"), "reason": reason},
+        }
+
+    for event in events:
+        if "hash" not in event:
+            if prev_hash == GENESIS_HASH and checked == 0:
+                unsealed += 1
+                continue
+            return result(event, "missing hash")
+        if event.get("prev_hash") != prev_hash:
+            return result(event, "prev_hash does not match previous event")
+        if event_hash(event) != event["hash"]:
+            return result(event, "hash does not match event contents")
+        checkpoint = checkpoints.get(event["event_id"])
+        if checkpoint is not None:
+            if checkpoint["hash"] != event["hash"] or not checkpoint_valid(key, checkpoint):
+                return result(event, "checkpoint signature or hash mismatch")
+            verified_checkpoint = event["event_id"]
+        prev_hash = event["hash"]
+        checked += 1
+    return result()
@@ -2,47 +2,166 @@
 Catcher service: ingest API and job/source tracking.
 See openspec/specs/edge-backup-system.md for API and data models.
 Demo mode: DEMO_MODE=1 uses retention in seconds for 2-min walkthrough.
+O(1) hot routes (ingest, patch, package lookup) are async and only do in-memory
+work; routes that scan jobs (listing, search, status) stay sync so they run in
+the threadpool instead of blocking the event loop. SQLite writes run on the
+state writer thread and, with LOG_QUEUE=1, logs/EBK lines on background threads.
 """
+import asyncio
 import copy
 import hashlib
 import json
 import logging
 import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 from typing import Literal
 
 from fastapi import FastAPI, HTTPException, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field, model_validator
 
 try:
-    from observability import configure_observability, emit_ai_status, log_error, log_event
+    from compression import CompressionMiddleware
+    from indexes import MERKLE_DEPTH, id_order_key, seen_epoch
+    from ingest_queue import IngestQueue, QueueFull
+    from metrics import REGISTRY, MetricsMiddleware, export_to_otel
+    from observability import (
+        configure_observability,
+        emit_ai_status,
+        flush_observability,
+        log_error,
+        log_event,
+        observability_stats,
+    )
+    from profiler import MemoryTracker, ProfilerMiddleware, ProfileStore, Sampler, token_valid
+    from responses import FastJSONResponse
+    from retention import RetentionExecutor
     from settings import get_settings
     from state import get_state
+    from tracing import TracingMiddleware, tracing_available
 except ImportError:
-    from backend.observability import configure_observability, emit_ai_status, log_error, log_event
+    from backend.compression import CompressionMiddleware
+    from backend.indexes import MERKLE_DEPTH, id_order_key, seen_epoch
+    from backend.ingest_queue import IngestQueue, QueueFull
+    from backend.metrics import REGISTRY, MetricsMiddleware, export_to_otel
+    from backend.observability import (
+        configure_observability,
+        emit_ai_status,
+        flush_observability,
+        log_error,
+        log_event,
+        observability_stats,
+    )
+    from backend.profiler import MemoryTracker, ProfilerMiddleware, ProfileStore, Sampler, token_valid
+    from backend.responses import FastJSONResponse
+    from backend.retention import RetentionExecutor
     from backend.settings import get_settings
     from backend.state import get_state
+    from backend.tracing import TracingMiddleware, tracing_available
 
 SETTINGS = get_settings()
 STATE = get_state()
 DEMO_MODE = SETTINGS.demo_mode
-logger = configure_observability("edge-backup-catcher")
+logger = configure_observability(
+    "edge-backup-catcher",
+    queued=SETTINGS.log_queue,
+    queue_size=SETTINGS.log_queue_size,
+    queue_policy=SETTINGS.log_queue_policy,
+    fast_format=SETTINGS.log_fast_format,
+)
+
 
-app = FastAPI(title=SETTINGS.app_name, version=SETTINGS.app_version)
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    if SETTINGS.metrics_enabled and SETTINGS.otel_endpoint:
+        export_to_otel()
+    if SETTINGS.retention_enabled:
+        RETENTION.start()
+    yield
+    RETENTION.stop()
+    if INGEST_QUEUE is not None:
+        INGEST_QUEUE.stop()
+    STATE.flush()
+    flush_observability()
+
+
+app = FastAPI(title=SETTINGS.app_name, version=SETTINGS.app_version, lifespan=_lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=SETTINGS.cors_origin_list(),
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if SETTINGS.response_compression:
+    app.add_middleware(
+        CompressionMiddleware,
+        paths=(
+            "/api/v1/packages",
+            "/api/v1/jobs",
+            "/api/v1/packages/search",
+            "/api/v1/journal/export",
+            "/api/v1/config/snapshots",
+        ),
+        minimum_size=SETTINGS.compression_min_size,
+        zstd_dictionary=Path(SETTINGS.zstd_dict_path).read_bytes() if SETTINGS.zstd_dict_path else None,
+    )
+
+if STATE.shared:
+
+    @app.middleware("http")
+    async def _refresh_shared_state(request, call_next):
+        """Multi-worker mode: pull other workers' writes before handling the request."""
+        changed = await run_in_threadpool(STATE.refresh)
+        if "rule_sets" in changed:
+            _load_shared_rule_sets()
+        return await call_next(request)
+
+
+if SETTINGS.persistence_enabled and not STATE.shared and not SETTINGS.persist_write_behind:
+
+    @app.middleware("http")
+    async def _await_persistence(request, call_next):
+        """Respond only once the writer thread has stored this request's mutations.
+
+        PERSIST_WRITE_BEHIND=1 skips the wait (a crash may lose the last writes).
+        """
+        response = await call_next(request)
+        pending = STATE.pending_write()
+        if pending is not None:
+            await asyncio.wrap_future(pending)
+        return response
+
+
+# Added last so they wrap the middlewares above: latency, profiles and server
+# spans include the shared-state refresh and the wait for the disk write.
+if SETTINGS.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+PROFILES = ProfileStore()
+MEMORY = MemoryTracker()
+if SETTINGS.admin_token:
+    app.add_middleware(ProfilerMiddleware, token=SETTINGS.admin_token, store=PROFILES)
+if SETTINGS.otel_endpoint and tracing_available():
+    app.add_middleware(TracingMiddleware)
+
+
+async def _run_state(fn, *args):
+    """Run state work inline when it is in-memory; in the threadpool in shared mode,
+    where row writes block on SQLite."""
+    if STATE.shared:
+        return await run_in_threadpool(fn, *args)
+    return fn(*args)
+
 
 JOBS = STATE.jobs
 SOURCES = STATE.sources
 JOURNAL = STATE.journal
 CONFIG_SNAPSHOTS = STATE.config_snapshots
-DELETED_COUNT = STATE.deleted_count
 
 PACKAGE_TYPES = ("user_data", "app_logs", "audit_logs", "business_data", "job_package", "cache")
 BUCKETS_ORDER = ("hot", "warm", "cold", "offsite")
@@ -250,16 +369,15 @@ PRESETS = {PRESET_CLOUD: _preset_cloud_days, PRESET_ONPREM: _preset_onprem_days,
 # Default preset; RULE_SETS_* are mutable at runtime (PATCH /config)
 RULE_SETS_DAYS: dict[str, dict] = {k: dict(v) for k, v in _preset_cloud_days().items()}
 RULE_SETS_SECONDS: dict[str, dict] = {k: dict(v) for k, v in _preset_cloud_seconds().items()}
+if STATE.rule_sets:
+    RULE_SETS_DAYS = copy.deepcopy(STATE.rule_sets.get("days", RULE_SETS_DAYS))
+    RULE_SETS_SECONDS = copy.deepcopy(STATE.rule_sets.get("seconds", RULE_SETS_SECONDS))
 
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _next_journal_id() -> str:
-    return STATE.next_journal_id()
-
-
 def _next_snapshot_id() -> str:
     return STATE.next_snapshot_id()
 
@@ -287,7 +405,6 @@ def _append_journal(
 ) -> dict:
     """Append a yard-ledger event for dispatcher/control-plane auditability."""
     event = {
-        "event_id": _next_journal_id(),
         "timestamp": _now_iso(),
         "actor": actor,
         "event_type": event_type,
@@ -300,7 +417,7 @@ def _append_journal(
         "error": error,
         "details": details or {},
     }
-    STATE.append_journal(event)
+    event = STATE.append_journal(event)
     journal_details = {
         "before_status": before_status,
         "after_status": after_status,
@@ -364,21 +481,34 @@ def _snapshot_hash(payload: dict) -> str:
 
 
 def _create_config_snapshot(reason: str, actor: str = "dispatcher") -> dict:
+    """Record a snapshot; its config body is stored once per distinct hash."""
     payload = _config_payload()
     snapshot = {
         "snapshot_id": _next_snapshot_id(),
         "created_at": _now_iso(),
         "reason": reason,
         "hash": _snapshot_hash(payload),
-        "config": payload,
     }
-    STATE.save_snapshot(snapshot)
+    STATE.save_snapshot(snapshot, payload)
     _append_journal(
         "config_snapshot_created",
         actor=actor,
         details={"snapshot_id": snapshot["snapshot_id"], "reason": reason, "hash": snapshot["hash"]},
     )
-    return snapshot
+    return {**snapshot, "config": payload}
+
+
+def _config_diff(before: object, after: object, path: str = "") -> list[dict]:
+    """Leaf-level changes between two config bodies as {path, before, after} (dotted paths)."""
+    if isinstance(before, dict) and isinstance(after, dict):
+        changes: list[dict] = []
+        for key in sorted(before.keys() | after.keys(), key=str):
+            child = f"{path}.{key}" if path else str(key)
+            changes.extend(_config_diff(before.get(key), after.get(key), child))
+        return changes
+    if before == after:
+        return []
+    return [{"path": path, "before": before, "after": after}]
 
 
 def _ensure_initial_config_snapshot() -> None:
@@ -423,10 +553,33 @@ def _stops_to_boundaries(rule: dict) -> tuple[int, int, int, str]:
     return hot_end, warm_end, cold_end, unit
 
 
+# Compiled rule cache: package_type -> boundaries. Cleared whenever rule sets change
+# (PATCH /config, restore, or another worker's change seen by STATE.refresh).
+_BOUNDARY_CACHE: dict[str | None, tuple[int, int, int, str]] = {}
+
+
 def _get_boundaries(package_type: str | None) -> tuple[int, int, int, str]:
     """Return (hot_end, warm_end, cold_end, unit)."""
-    r = _get_rule_set(package_type)
-    return _stops_to_boundaries(r)
+    cached = _BOUNDARY_CACHE.get(package_type)
+    if cached is None:
+        cached = _BOUNDARY_CACHE[package_type] = _stops_to_boundaries(_get_rule_set(package_type))
+    return cached
+
+
+def _rule_sets_changed() -> None:
+    """Drop compiled rules and share the active rule sets with other workers."""
+    _BOUNDARY_CACHE.clear()
+    STATE.save_rule_sets("seconds" if DEMO_MODE else "days", RULE_SETS_SECONDS if DEMO_MODE else RULE_SETS_DAYS)
+
+
+def _load_shared_rule_sets() -> None:
+    """Adopt rule sets written by another worker (shared mode)."""
+    global RULE_SETS_DAYS, RULE_SETS_SECONDS
+    if "days" in STATE.rule_sets:
+        RULE_SETS_DAYS = copy.deepcopy(STATE.rule_sets["days"])
+    if "seconds" in STATE.rule_sets:
+        RULE_SETS_SECONDS = copy.deepcopy(STATE.rule_sets["seconds"])
+    _BOUNDARY_CACHE.clear()
 
 
 def _validate_stops(stops: dict, demo: bool) -> None:
@@ -486,26 +639,66 @@ def _age_days(created_at: str) -> int:
     return _age_seconds(created_at) // 86400
 
 
-def _enrich_job(job: dict) -> dict:
-    """Add age_days/age_seconds, bucket, package_id, package_type to job for response."""
-    out = dict(job)
-    out.setdefault("package_id", job.get("job_id"))
-    created = job.get("created_at", "")
+def _parse_fields(fields: str | None) -> frozenset[str] | None:
+    """``fields=a,b`` query value -> projection set (None = every field)."""
+    if not fields:
+        return None
+    return frozenset(name.strip() for name in fields.split(",") if name.strip())
+
+
+def _enrich_job(job: dict, fields: frozenset[str] | None = None) -> dict:
+    """Add age_days/age_seconds, bucket, package_id, package_type to job for response.
+
+    With ``fields``, only those attributes are built: age and bucket are not
+    computed unless requested (directly or via tier).
+    """
+    if fields is None:
+        out = dict(job)
+        out.setdefault("package_id", job.get("job_id"))
+        created = job.get("created_at", "")
+        ptype = job.get("package_type") or _tag_to_package_type(job.get("tag")) or "user_data"
+        out["package_type"] = ptype
+        if DEMO_MODE:
+            age = _age_seconds(created)
+            out["age_seconds"] = age
+            out["age_days"] = age
+        else:
+            age = _age_days(created)
+            out["age_days"] = age
+        out["bucket"] = _bucket_for_age(age, ptype)
+        if "tier" not in out:
+            out["tier"] = out["bucket"]
+        return out
+
+    out = {name: job[name] for name in fields if name in job}
+    if "package_id" in fields:
+        out["package_id"] = job.get("package_id", job.get("job_id"))
+    want_bucket = "bucket" in fields or ("tier" in fields and "tier" not in job)
+    want_age = want_bucket or "age_days" in fields or (DEMO_MODE and "age_seconds" in fields)
+    if not (want_age or "package_type" in fields):
+        return out
     ptype = job.get("package_type") or _tag_to_package_type(job.get("tag")) or "user_data"
-    out["package_type"] = ptype
-    if DEMO_MODE:
-        age = _age_seconds(created)
-        out["age_seconds"] = age
+    if "package_type" in fields:
+        out["package_type"] = ptype
+    if not want_age:
+        return out
+    age = _age_seconds(job.get("created_at", "")) if DEMO_MODE else _age_days(job.get("created_at", ""))
+    if "age_days" in fields:
         out["age_days"] = age
-    else:
-        age = _age_days(created)
-        out["age_days"] = age
-    out["bucket"] = _bucket_for_age(age, ptype)
-    if "tier" not in out:
-        out["tier"] = out["bucket"]
+    if DEMO_MODE and "age_seconds" in fields:
+        out["age_seconds"] = age
+    if want_bucket:
+        bucket = _bucket_for_age(age, ptype)
+        if "bucket" in fields:
+            out["bucket"] = bucket
+        if "tier" in fields and "tier" not in job:
+            out["tier"] = bucket
     return out
 
 
+_BUCKET_FIELDS = frozenset(("bucket",))
+
+
 # --- Request/response models (JSON, aligned with OpenSpec) ---
 
 def _tag_to_package_type(tag: str | None) -> str:
@@ -561,20 +754,10 @@ class SourceResponse(BaseModel):
 
 # --- Routes ---
 
-@app.post("/api/v1/ingest", response_model=dict)
-def ingest(
-    body: IngestBody,
-    x_demo_created_secs_ago: int | None = Header(None, alias="X-Demo-Created-Secs-Ago"),
-) -> dict:
-    """Accept a backup payload; return job_id. Demo: X-Demo-Created-Secs-Ago backdates created_at."""
-    job_id = _next_job_id()
-    now = datetime.now(timezone.utc)
-    if DEMO_MODE and x_demo_created_secs_ago is not None:
-        created_dt = now - timedelta(seconds=x_demo_created_secs_ago)
-        created_at = created_dt.isoformat()
-    else:
-        created_at = now.isoformat()
+def _create_job(job_id: str, body: IngestBody, created_at: str, now: datetime) -> dict:
+    """Materialize one ingested manifest: job, source touch and journal entries."""
     ptype = body.package_type or _tag_to_package_type(body.tag)
+    duplicate_of = STATE.checksums.first(body.checksum)
     job = {
         "job_id": job_id,
         "source_id": body.source_id,
@@ -589,15 +772,11 @@ def ingest(
         "package_type": ptype,
     }
     STATE.set_job(job_id, job)
+    MANIFESTS_CREATED.inc(package_type=ptype or "user_data")
     # Touch source
     now_str = now.isoformat()
-    if body.source_id not in SOURCES:
-        STATE.set_source(body.source_id, {"source_id": body.source_id, "label": None, "last_seen_at": now_str})
+    if STATE.touch_source(body.source_id, now_str):
         _append_journal("client_registered", actor=body.source_id, source_id=body.source_id)
-    else:
-        source = SOURCES[body.source_id]
-        source["last_seen_at"] = now_str
-        STATE.set_source(body.source_id, source)
     _append_journal(
         "manifest_created",
         actor=body.source_id,
@@ -610,36 +789,216 @@ def ingest(
             "path": body.path,
             "package_type": ptype,
             "size_bytes": body.size_bytes or 0,
+            **({"duplicate_of": duplicate_of} if duplicate_of else {}),
         },
     )
-    return {"job_id": job_id, "package_id": job_id}
+    return {"job_id": job_id, "package_id": job_id, "duplicate_of": duplicate_of}
 
 
-@app.get("/api/v1/packages", response_model=list)
-@app.get("/api/v1/jobs", response_model=list)
+def _process_ingest_batch(batch: list[tuple[str, IngestBody, str, datetime]]) -> None:
+    """Queue worker: materialize a batch of accepted ingests with one persist."""
+    with STATE.batched():
+        for job_id, body, created_at, now in batch:
+            try:
+                _create_job(job_id, body, created_at, now)
+            except Exception as exc:  # noqa: BLE001
+                _record_failed_ingest(job_id, body, exc)
+            finally:
+                QUEUED_JOB_IDS.discard(job_id)
+
+
+INGEST_QUEUE = (
+    IngestQueue(
+        _process_ingest_batch,
+        maxsize=SETTINGS.ingest_queue_size,
+        workers=SETTINGS.ingest_queue_workers,
+        batch_size=SETTINGS.ingest_queue_batch,
+    )
+    if SETTINGS.ingest_queue_enabled
+    else None
+)
+QUEUED_JOB_IDS: set[str] = set()
+
+MANIFESTS_CREATED = REGISTRY.counter(
+    "catcher_manifests_created_total", "Manifests materialized by ingest, by package type.", ("package_type",)
+)
+REGISTRY.gauge("catcher_jobs", "Packages currently tracked.", callback=lambda: len(JOBS))
+REGISTRY.gauge("catcher_sources", "Registered source engines.", callback=lambda: len(SOURCES))
+REGISTRY.gauge("catcher_journal_events", "Events in the yard ledger.", callback=lambda: len(JOURNAL))
+REGISTRY.gauge("catcher_deleted", "Packages deleted since the state was created.", callback=lambda: STATE.deleted_count)
+if INGEST_QUEUE is not None:
+    REGISTRY.gauge(
+        "catcher_ingest_queue_depth", "Items waiting in the ingest queue.", callback=lambda: INGEST_QUEUE.stats()["depth"]
+    )
+
+
+def _emission_stat(queue_name: str, key: str) -> float:
+    stats = observability_stats()[queue_name]
+    return stats[key] if stats else 0
+
+
+if SETTINGS.log_queue:
+    for _name, _help, _queue, _key in (
+        ("catcher_log_queue_depth", "Log records waiting for the writer thread.", "log_queue", "depth"),
+        ("catcher_log_records_dropped", "Log records dropped because the log queue was full.", "log_queue", "dropped"),
+        ("catcher_status_lines_dropped", "EBK lines dropped because their queue was full.", "status_queue", "dropped"),
+    ):
+        REGISTRY.gauge(_name, _help, callback=lambda q=_queue, k=_key: _emission_stat(q, k))
+# Accepted (202) ids whose materialization failed, newest last; bounded.
+FAILED_INGESTS: OrderedDict[str, dict] = OrderedDict()
+FAILED_INGESTS_MAX = 10_000
+
+
+def _record_failed_ingest(job_id: str, body: IngestBody, exc: Exception) -> None:
+    FAILED_INGESTS[job_id] = {
+        "job_id": job_id,
+        "package_id": job_id,
+        "source_id": body.source_id,
+        "path": body.path,
+        "status": "failed",
+        "last_error": f"ingest failed: {exc}",
+    }
+    while len(FAILED_INGESTS) > FAILED_INGESTS_MAX:
+        FAILED_INGESTS.popitem(last=False)
+    _append_journal(
+        "ingest_failed",
+        actor=body.source_id,
+        source_id=body.source_id,
+        package_id=job_id,
+        station_id=_station_from_path(body.path),
+        error=str(exc),
+        details={"path": body.path},
+    )
+
+
+def _retry_after_headers() -> dict:
+    return {"Retry-After": str(SETTINGS.ingest_queue_retry_after)}
+
+
+def _raise_if_queued(pkg_id: str) -> None:
+    """Explain a missing id that was accepted by the queue: still queued (409) or failed (422)."""
+    if pkg_id in QUEUED_JOB_IDS:
+        raise HTTPException(status_code=409, detail="Package is queued for ingest", headers=_retry_after_headers())
+    failed = FAILED_INGESTS.get(pkg_id)
+    if failed is not None:
+        raise HTTPException(status_code=422, detail=failed)
+
+
+@app.post("/api/v1/ingest", response_model=dict)
+async def ingest(
+    body: IngestBody,
+    x_demo_created_secs_ago: int | None = Header(None, alias="X-Demo-Created-Secs-Ago"),
+) -> dict | JSONResponse:
+    """Accept a backup payload; return job_id. Demo: X-Demo-Created-Secs-Ago backdates created_at.
+
+    With INGEST_QUEUE=1 the manifest is queued and 202 is returned with a provisional
+    job_id; a full queue answers 429 with Retry-After.
+    """
+    now = datetime.now(timezone.utc)
+    if DEMO_MODE and x_demo_created_secs_ago is not None:
+        created_dt = now - timedelta(seconds=x_demo_created_secs_ago)
+        created_at = created_dt.isoformat()
+    else:
+        created_at = now.isoformat()
+    if INGEST_QUEUE is None:
+        return await _run_state(lambda: _create_job(_next_job_id(), body, created_at, now))
+
+    def admit() -> tuple[str, IngestBody, str, datetime]:
+        # In-memory id only: the counter is persisted by the worker's batch write.
+        job_id = STATE.reserve_job_id()
+        QUEUED_JOB_IDS.add(job_id)
+        return job_id, body, created_at, now
+
+    try:
+        job_id, *_ = await _run_state(INGEST_QUEUE.submit, admit)
+    except QueueFull:
+        raise HTTPException(status_code=429, detail="Ingest queue full", headers=_retry_after_headers())
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job_id, "package_id": job_id, "status": "queued", "provisional": True},
+    )
+
+
+@app.get("/api/v1/ingest/queue", response_model=dict)
+def ingest_queue_stats() -> dict:
+    """Ingest queue depth and counters (enabled=false when ingest is synchronous)."""
+    if INGEST_QUEUE is None:
+        return {"enabled": False}
+    return {"enabled": True, **INGEST_QUEUE.stats()}
+
+
+@app.get("/api/v1/packages", response_class=FastJSONResponse)
+@app.get("/api/v1/jobs", response_class=FastJSONResponse)
 def list_jobs(
     status: str | None = None,
     source_id: str | None = None,
     bucket: Literal["hot", "warm", "cold", "offsite"] | None = None,
-) -> list:
-    """List packages (alias: jobs); optional filters."""
-    out = [_enrich_job(j) for j in JOBS.values()]
+    fields: str | None = None,
+) -> FastJSONResponse:
+    """List packages (alias: jobs); optional filters and sparse ``fields`` projection."""
+    jobs = JOBS.values()
     if status:
-        out = [j for j in out if j["status"] == status]
+        jobs = [j for j in jobs if j.get("status") == status]
     if source_id:
-        out = [j for j in out if j["source_id"] == source_id]
+        jobs = [j for j in jobs if j.get("source_id") == source_id]
     if bucket:
-        out = [j for j in out if j["bucket"] == bucket]
-    return out
+        jobs = [j for j in jobs if _enrich_job(j, _BUCKET_FIELDS)["bucket"] == bucket]
+    projection = _parse_fields(fields)
+    return FastJSONResponse([_enrich_job(j, projection) for j in jobs])
+
+
+@app.get("/api/v1/packages/search", response_class=FastJSONResponse)
+def search_packages(
+    prefix: str = "",
+    source_id: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = None,
+    fields: str | None = None,
+) -> FastJSONResponse:
+    """Packages whose path starts with ``prefix`` (optionally for one source), in path order.
+
+    Also returns the count/size totals under the prefix and each matching
+    immediate subdirectory, for directory-level browsing and restore scoping.
+    Pass ``next_cursor`` back as ``cursor`` for the next page.
+    """
+    after = None
+    if cursor:
+        path, sep, job_id = cursor.rpartition("|")
+        if not sep:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        after = (path, job_id)
+    result = STATE.search_paths(prefix, source_id, after, limit + 1)
+    keys = result["keys"][:limit]
+    projection = _parse_fields(fields)
+    packages = []
+    for _path, job_id in keys:
+        job = JOBS.get(job_id)
+        if job is not None:
+            packages.append(_enrich_job(job, projection))
+    count, size_bytes = result["totals"]
+    return FastJSONResponse({
+        "prefix": prefix,
+        "source_id": source_id,
+        "total": {"count": count, "size_bytes": size_bytes},
+        "directories": [
+            {"prefix": directory, "count": dir_count, "size_bytes": dir_bytes}
+            for directory, dir_count, dir_bytes in result["directories"]
+        ],
+        "count": len(packages),
+        "next_cursor": "|".join(keys[-1]) if len(result["keys"]) > limit else None,
+        "packages": packages,
+    })
 
 
 @app.get("/api/v1/packages/{pkg_id}", response_model=dict)
 @app.get("/api/v1/jobs/{pkg_id}", response_model=dict)
-def get_package(pkg_id: str) -> dict:
-    """Get one package by id."""
-    if pkg_id not in JOBS:
+async def get_package(pkg_id: str, fields: str | None = None) -> dict:
+    """Get one package by id (``fields`` as for the listing)."""
+    job = JOBS.get(pkg_id)
+    if job is None:
+        _raise_if_queued(pkg_id)
         raise HTTPException(status_code=404, detail="Package not found")
-    return _enrich_job(JOBS[pkg_id])
+    return _enrich_job(job, _parse_fields(fields))
 
 
 class PackagePatch(BaseModel):
@@ -651,21 +1010,26 @@ class PackagePatch(BaseModel):
 
 def _patch_package(pid: str, body: PackagePatch) -> dict:
     """Internal: update package."""
-    if pid not in JOBS:
+    before: dict = {}
+
+    def apply(job: dict) -> None:
+        before["status"] = job.get("status")
+        if body.progress_percent is not None:
+            job["progress_percent"] = max(0, min(100, body.progress_percent))
+        if body.checksum is not None:
+            job["checksum"] = body.checksum
+        if body.status is not None:
+            job["status"] = body.status
+        if body.last_error is not None:
+            job["last_error"] = body.last_error
+            job["retry_count"] = int(job.get("retry_count", 0)) + 1
+        job["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+    job = STATE.update_job(pid, apply)
+    if job is None:
+        _raise_if_queued(pid)
         raise HTTPException(status_code=404, detail="Package not found")
-    job = JOBS[pid]
-    before_status = job.get("status")
-    if body.progress_percent is not None:
-        job["progress_percent"] = max(0, min(100, body.progress_percent))
-    if body.checksum is not None:
-        job["checksum"] = body.checksum
-    if body.status is not None:
-        job["status"] = body.status
-    if body.last_error is not None:
-        job["last_error"] = body.last_error
-        job["retry_count"] = int(job.get("retry_count", 0)) + 1
-    job["updated_at"] = datetime.now(timezone.utc).isoformat()
-    STATE.set_job(pid, job)
+    before_status = before["status"]
     if body.status is not None or body.checksum is not None or body.progress_percent is not None:
         event_type = "transfer_status_updated"
         if body.status == "completed":
@@ -692,15 +1056,15 @@ def _patch_package(pid: str, body: PackagePatch) -> dict:
 
 
 @app.patch("/api/v1/packages/{package_id}")
-def patch_package(package_id: str, body: PackagePatch = PackagePatch()) -> dict:
+async def patch_package(package_id: str, body: PackagePatch = PackagePatch()) -> dict:
     """Update package progress, checksum, or status."""
-    return _patch_package(package_id, body)
+    return await _run_state(_patch_package, package_id, body)
 
 
 @app.patch("/api/v1/jobs/{job_id}")
-def patch_job(job_id: str, body: PackagePatch = PackagePatch()) -> dict:
+async def patch_job(job_id: str, body: PackagePatch = PackagePatch()) -> dict:
     """Update job (alias for package)."""
-    return _patch_package(job_id, body)
+    return await _run_state(_patch_package, job_id, body)
 
 
 class ConfigPatch(BaseModel):
@@ -753,15 +1117,34 @@ def patch_config(body: ConfigPatch = ConfigPatch()) -> dict:
             except ValueError as e:
                 raise HTTPException(status_code=400, detail=str(e))
     if changed:
+        _rule_sets_changed()
         snapshot = _create_config_snapshot("config_patch")
         _append_journal("config_changed", details={"snapshot_id": snapshot["snapshot_id"], "changed_types": list(body.rule_sets.keys())})
     return get_config()
 
 
 @app.get("/api/v1/sources", response_model=list)
-def list_sources() -> list:
-    """List registered sources."""
-    return list(SOURCES.values())
+def list_sources(
+    active_within: int | None = Query(None, ge=0),
+    stale_for: int | None = Query(None, ge=0),
+) -> list:
+    """List registered sources with ``idle_seconds`` since last seen.
+
+    With ``active_within``/``stale_for`` only sources with a known last-seen
+    time in that window are returned, least recently seen first.
+    """
+    now = time.time()
+    if active_within is None and stale_for is None:
+        sources = SOURCES.values()
+    else:
+        low = now - active_within if active_within is not None else None
+        high = now - stale_for if stale_for is not None else None
+        sources = [SOURCES[sid] for sid in STATE.sources_seen_between(low, high) if sid in SOURCES]
+    out = []
+    for source in sources:
+        epoch = seen_epoch(source.get("last_seen_at"))
+        out.append({**source, "idle_seconds": None if epoch is None else max(0, int(now - epoch))})
+    return out
 
 
 @app.post("/api/v1/sources", response_model=dict)
@@ -815,6 +1198,54 @@ def list_buckets() -> dict:
     return {"buckets": buckets}
 
 
+def _dedup_group() -> dict:
+    return {"count": 0, "logical_bytes": 0, "unique_bytes": 0, "duplicate_bytes": 0}
+
+
+def _dedup_add(group: dict, seen: set[str], job: dict) -> None:
+    size = job.get("size_bytes", 0) or 0
+    checksum = job.get("checksum")
+    group["count"] += 1
+    group["logical_bytes"] += size
+    if checksum and checksum in seen:
+        group["duplicate_bytes"] += size
+        return
+    if checksum:
+        seen.add(checksum)
+    group["unique_bytes"] += size
+
+
+def _dedup_finish(group: dict) -> dict:
+    unique = group["unique_bytes"]
+    group["dedup_ratio"] = round(group["logical_bytes"] / unique, 3) if unique else 1.0
+    return group
+
+
+@app.get("/api/v1/dedup/stats", response_model=dict)
+def dedup_stats() -> dict:
+    """Logical vs unique (checksum-deduplicated) bytes, overall and per tier and source."""
+    total = _dedup_group()
+    tiers = {b: _dedup_group() for b in BUCKETS_ORDER}
+    sources: dict[str, dict] = {}
+    # Seen checksums per group, kept apart from the response dicts.
+    total_seen: set[str] = set()
+    tier_seen: dict[str, set[str]] = {b: set() for b in BUCKETS_ORDER}
+    source_seen: dict[str, set[str]] = {}
+    for job in JOBS.values():
+        enriched = _enrich_job(job)
+        bucket = enriched["bucket"]
+        source_id = enriched.get("source_id") or ""
+        _dedup_add(total, total_seen, enriched)
+        _dedup_add(tiers[bucket], tier_seen[bucket], enriched)
+        _dedup_add(sources.setdefault(source_id, _dedup_group()), source_seen.setdefault(source_id, set()), enriched)
+    return {
+        "total": _dedup_finish(total),
+        "unique_checksums": len(STATE.checksums),
+        "tiers": {name: _dedup_finish(group) for name, group in tiers.items()},
+        "sources": {name: _dedup_finish(group) for name, group in sources.items()},
+    }
+
+
 @app.get("/api/v1/config", response_model=dict)
 def get_config() -> dict:
     """Rule sets per package type. Demo mode returns seconds."""
@@ -823,12 +1254,9 @@ def get_config() -> dict:
 
 @app.get("/api/v1/config/snapshots", response_model=list)
 def list_config_snapshots() -> list:
-    """List timetable/config snapshots without duplicating full config bodies."""
+    """List timetable/config snapshots (metadata only; bodies are stored by hash)."""
     _ensure_initial_config_snapshot()
-    return [
-        {k: v for k, v in snapshot.items() if k != "config"}
-        for snapshot in CONFIG_SNAPSHOTS.values()
-    ]
+    return list(CONFIG_SNAPSHOTS.values())
 
 
 @app.post("/api/v1/config/snapshots", response_model=dict)
@@ -841,9 +1269,39 @@ def create_config_snapshot() -> dict:
 def get_config_snapshot(snapshot_id: str) -> dict:
     """Return one full timetable/config snapshot."""
     _ensure_initial_config_snapshot()
-    if snapshot_id not in CONFIG_SNAPSHOTS:
+    snapshot = STATE.config_snapshot(snapshot_id)
+    if snapshot is None:
         raise HTTPException(status_code=404, detail="Config snapshot not found")
-    return CONFIG_SNAPSHOTS[snapshot_id]
+    return snapshot
+
+
+@app.get("/api/v1/config/snapshots/{snapshot_id}/diff", response_model=dict)
+def diff_config_snapshot(snapshot_id: str, against: str | None = None) -> dict:
+    """Changes from ``against`` (default: the previous snapshot) to ``snapshot_id``."""
+    _ensure_initial_config_snapshot()
+    snapshot = STATE.config_snapshot(snapshot_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Config snapshot not found")
+    if against is None:
+        ids = list(CONFIG_SNAPSHOTS)
+        position = ids.index(snapshot_id)
+        against = ids[position - 1] if position else None
+    base = STATE.config_snapshot(against) if against is not None else None
+    if against is not None and base is None:
+        raise HTTPException(status_code=404, detail="Config snapshot not found")
+    if base is None:
+        changes = _config_diff({}, snapshot["config"])
+    elif base["hash"] == snapshot["hash"]:
+        changes = []
+    else:
+        changes = _config_diff(base["config"], snapshot["config"])
+    return {
+        "snapshot_id": snapshot_id,
+        "against": against,
+        "hash": snapshot["hash"],
+        "against_hash": base["hash"] if base is not None else None,
+        "changes": changes,
+    }
 
 
 @app.get("/api/v1/config/export", response_model=dict)
@@ -864,10 +1322,10 @@ def export_config() -> dict:
 def restore_config_snapshot(snapshot_id: str) -> dict:
     """Restore rule sets from a timetable/config snapshot."""
     global RULE_SETS_DAYS, RULE_SETS_SECONDS
-    if snapshot_id not in CONFIG_SNAPSHOTS:
+    snapshot = STATE.config_snapshot(snapshot_id)
+    if snapshot is None:
         raise HTTPException(status_code=404, detail="Config snapshot not found")
-    snapshot = CONFIG_SNAPSHOTS[snapshot_id]
-    config = snapshot.get("config", {})
+    config = snapshot["config"]
     if bool(config.get("demo_mode", False)) != DEMO_MODE:
         raise HTTPException(status_code=400, detail="Snapshot demo_mode does not match running server")
     restored = copy.deepcopy(config.get("rule_sets", {}))
@@ -875,6 +1333,7 @@ def restore_config_snapshot(snapshot_id: str) -> dict:
         RULE_SETS_SECONDS = restored
     else:
         RULE_SETS_DAYS = restored
+    _rule_sets_changed()
     new_snapshot = _create_config_snapshot(f"restore:{snapshot_id}")
     _append_journal(
         "config_restored",
@@ -889,8 +1348,12 @@ def list_journal(
     source_id: str | None = None,
     package_id: str | None = None,
     limit: int = 100,
+    fields: str | None = None,
 ) -> list:
-    """Append-only yard ledger; newest entries are returned last within the limit."""
+    """Append-only yard ledger; newest entries are returned last within the limit.
+
+    ``fields=event_id,event_type,...`` returns only those attributes per event.
+    """
     limit = max(1, min(1000, int(limit)))
     entries = JOURNAL
     if event_type:
@@ -899,28 +1362,84 @@ def list_journal(
         entries = [e for e in entries if e.get("source_id") == source_id]
     if package_id:
         entries = [e for e in entries if e.get("package_id") == package_id]
-    return entries[-limit:]
+    projection = _parse_fields(fields)
+    if projection is None:
+        return entries[-limit:]
+    return [{name: e[name] for name in projection if name in e} for e in entries[-limit:]]
 
 
-@app.get("/api/v1/journal/export", response_model=dict)
-def export_journal() -> dict:
+@app.get("/api/v1/journal/export", response_class=FastJSONResponse)
+def export_journal() -> FastJSONResponse:
     """Export the full yard ledger for backup/troubleshooting."""
     _append_journal("journal_exported", details={"count": len(JOURNAL)})
-    return {"exported_at": _now_iso(), "count": len(JOURNAL), "events": JOURNAL}
+    return FastJSONResponse({"exported_at": _now_iso(), "count": len(JOURNAL), "events": JOURNAL})
+
 
+@app.get("/api/v1/journal/verify", response_model=dict)
+def verify_journal(from_checkpoint: str | None = None) -> dict:
+    """Check the ledger hash chain and signed checkpoints.
 
-@app.get("/api/v1/sources/{source_id}/resume", response_model=dict)
-def resume_switch_list(source_id: str) -> dict:
-    """Return unfinished railcars/manifests for a source engine to resume."""
+    Starts at ``from_checkpoint`` (an event id with a checkpoint), else at the
+    last checkpoint verified by this process, else at the first event.
+    """
+    result = STATE.verify_journal(from_checkpoint)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Checkpoint not found")
+    if not result["ok"]:
+        log_error(
+            logger,
+            "journal verification failed",
+            event_type="journal_verify_failed",
+            error_source="edge-backup-catcher",
+            operation="journal_verify",
+            error_message=result["error"]["reason"],
+            details=result["error"],
+        )
+    return {**result, "events": len(JOURNAL), "checkpoints": len(STATE.journal_checkpoints)}
+
+
+@app.get("/api/v1/sources/{source_id}/merkle", response_class=FastJSONResponse)
+def source_merkle(
+    source_id: str,
+    prefix: str = "",
+    depth: int = Query(1, ge=0, le=MERKLE_DEPTH),
+) -> FastJSONResponse:
+    """Merkle node of a source's (path, checksum, status) tree for engine reconciliation.
+
+    Returns the digest of node ``prefix`` (hex; "" = root) and the digests of its
+    non-empty descendants ``depth`` levels down. A full-length prefix is a leaf
+    bucket and also returns its entries.
+    """
+    if source_id not in SOURCES:
+        raise HTTPException(status_code=404, detail="Source not found")
+    if len(prefix) > MERKLE_DEPTH or prefix.strip("0123456789abcdef"):
+        raise HTTPException(status_code=400, detail=f"prefix must be up to {MERKLE_DEPTH} lowercase hex digits")
+    view = STATE.merkle_view(source_id, prefix, depth)
+    return FastJSONResponse({"source_id": source_id, "prefix": prefix, "max_depth": MERKLE_DEPTH, **view})
+
+
+@app.get("/api/v1/sources/{source_id}/resume", response_class=FastJSONResponse)
+def resume_switch_list(
+    source_id: str,
+    limit: int | None = Query(None, ge=1),
+    cursor: str | None = None,
+) -> FastJSONResponse:
+    """Return unfinished railcars/manifests for a source engine to resume.
+
+    Reads the per-source backlog index. With ``limit``, pass the returned
+    ``next_cursor`` back as ``cursor`` to fetch the following page.
+    """
     if source_id not in SOURCES:
         raise HTTPException(status_code=404, detail="Source not found")
+    job_ids, total = STATE.unfinished_page(source_id, cursor, None if limit is None else limit + 1)
+    has_more = limit is not None and len(job_ids) > limit
+    job_ids = job_ids[:limit]
     unfinished = []
-    for job in JOBS.values():
-        if job.get("source_id") != source_id:
+    for job_id in job_ids:
+        job = JOBS.get(job_id)
+        if job is None:
             continue
         enriched = _enrich_job(job)
-        if enriched.get("status") == "completed":
-            continue
         unfinished.append({
             "manifest_id": enriched["job_id"],
             "package_id": enriched["job_id"],
@@ -939,13 +1458,20 @@ def resume_switch_list(source_id: str) -> dict:
             "created_at": enriched.get("created_at"),
             "updated_at": enriched.get("updated_at"),
         })
+    next_cursor = job_ids[-1] if has_more else None
     _append_journal(
         "resume_requested",
         actor=source_id,
         source_id=source_id,
-        details={"count": len(unfinished)},
+        details={"count": len(unfinished), "total": total, "cursor": cursor},
     )
-    return {"source_id": source_id, "count": len(unfinished), "switch_list": unfinished}
+    return FastJSONResponse({
+        "source_id": source_id,
+        "count": len(unfinished),
+        "total": total,
+        "next_cursor": next_cursor,
+        "switch_list": unfinished,
+    })
 
 
 @app.get("/api/v1/config/presets", response_model=dict)
@@ -1025,23 +1551,297 @@ def delete_job(job_id: str) -> dict:
     return {"deleted": job_id}
 
 
+def _compact_id_ranges(job_ids: list[str]) -> list[str]:
+    """["job-1", "job-2", "job-3", "job-7"] -> ["job-1..job-3", "job-7"]."""
+    ranges: list[str] = []
+    run: list | None = None  # [prefix, first, last] of consecutive numeric ids
+    for job_id in sorted(job_ids, key=id_order_key):
+        prefix, _, number = job_id.rpartition("-")
+        if run is not None and number.isdigit() and prefix == run[0] and int(number) == run[2] + 1:
+            run[2] += 1
+            continue
+        if run is not None:
+            ranges.append(f"{run[0]}-{run[1]}" if run[1] == run[2] else f"{run[0]}-{run[1]}..{run[0]}-{run[2]}")
+            run = None
+        if number.isdigit():
+            run = [prefix, int(number), int(number)]
+        else:
+            ranges.append(job_id)
+    if run is not None:
+        ranges.append(f"{run[0]}-{run[1]}" if run[1] == run[2] else f"{run[0]}-{run[1]}..{run[0]}-{run[2]}")
+    return ranges
+
+
+def _bulk_delete(job_ids: list[str], details: dict, event_type: str = "manifests_deleted") -> dict:
+    """Delete jobs in one storage write and record one summarized journal event."""
+    removed = STATE.delete_jobs(job_ids)
+    freed_bytes = sum(int(job.get("size_bytes") or 0) for job in removed)
+    by_package_type: dict[str, int] = {}
+    for job in removed:
+        ptype = job.get("package_type") or "user_data"
+        by_package_type[ptype] = by_package_type.get(ptype, 0) + 1
+    id_ranges = _compact_id_ranges([job["job_id"] for job in removed])
+    if removed:
+        _append_journal(
+            event_type,
+            details={
+                "count": len(removed),
+                "freed_bytes": freed_bytes,
+                "job_id_ranges": id_ranges,
+                "by_package_type": by_package_type,
+                **details,
+            },
+        )
+    return {
+        "deleted": len(removed),
+        "freed_bytes": freed_bytes,
+        "by_package_type": by_package_type,
+        "job_id_ranges": id_ranges,
+    }
+
+
+@app.delete("/api/v1/packages")
+def delete_packages(
+    package_type: str | None = None,
+    bucket: Literal["hot", "warm", "cold", "offsite"] | None = None,
+    older_than: int | None = Query(None, ge=0),
+    source_id: str | None = None,
+) -> dict:
+    """Delete every package matching all given filters in one storage transaction.
+
+    ``older_than`` is an age in retention units (days; seconds in demo mode).
+    Candidates come from the creation-time index and are re-checked exactly.
+    """
+    if package_type is None and bucket is None and older_than is None and source_id is None:
+        raise HTTPException(status_code=400, detail="At least one filter is required")
+    unit = 1 if DEMO_MODE else 86400
+    now = time.time()
+    # Age (floored to whole units) >= N  <=>  created at or before now - N units.
+    newest = now - older_than * unit if older_than is not None else None
+    oldest = None
+    if bucket is not None and package_type is not None:
+        hot_end, warm_end, cold_end, _ = _get_boundaries(package_type)
+        ends = {"hot": hot_end, "warm": warm_end, "cold": cold_end}
+        starts = [ends[b] for b in BUCKETS_ORDER[: BUCKETS_ORDER.index(bucket)]]
+        low_age = max(starts, default=0)
+        newest = min(newest, now - low_age * unit) if newest is not None else now - low_age * unit
+        if bucket != "offsite":
+            oldest = now - ends[bucket] * unit
+    # One second of slack absorbs clock movement; matches are re-checked below.
+    job_ids = STATE.jobs_created_between(
+        None if package_type is None else [package_type, None],
+        None if oldest is None else oldest - 1,
+        None if newest is None else newest + 1,
+    )
+    checked = frozenset(("package_type", "bucket", "age_days"))
+    selected = []
+    for job_id in job_ids:
+        job = JOBS.get(job_id)
+        if job is None or (source_id is not None and job.get("source_id") != source_id):
+            continue
+        view = _enrich_job(job, checked)
+        if package_type is not None and view["package_type"] != package_type:
+            continue
+        if bucket is not None and view["bucket"] != bucket:
+            continue
+        if older_than is not None and view["age_days"] < older_than:
+            continue
+        selected.append(job_id)
+    filters = {
+        name: value
+        for name, value in (
+            ("package_type", package_type),
+            ("bucket", bucket),
+            ("older_than", older_than),
+            ("source_id", source_id),
+        )
+        if value is not None
+    }
+    return _bulk_delete(selected, {"filters": filters})
+
+
 @app.delete("/api/v1/jobs")
 def delete_jobs_by_tag(tag: Literal["cache"] | None = None) -> dict:
     """Delete jobs by tag or package_type (demo: cache/temp files)."""
     if not tag:
         raise HTTPException(status_code=400, detail="tag required (e.g. ?tag=cache)")
-    to_delete = [j for j in JOBS.values() if j.get("tag") == tag or j.get("package_type") == tag]
-    for j in to_delete:
-        STATE.delete_job(j["job_id"])
-        _append_journal(
-            "manifest_deleted",
-            source_id=j.get("source_id"),
-            package_id=j.get("job_id"),
-            station_id=_station_from_path(j.get("path")),
-            before_status=j.get("status"),
-            details={"path": j.get("path"), "tag": tag, "demo_delete": True},
-        )
-    return {"deleted": len(to_delete), "job_ids": [j["job_id"] for j in to_delete]}
+    job_ids = [j["job_id"] for j in JOBS.values() if j.get("tag") == tag or j.get("package_type") == tag]
+    result = _bulk_delete(job_ids, {"filters": {"tag": tag, "demo_delete": True}})
+    return {"deleted": result["deleted"], "job_ids": job_ids, "freed_bytes": result["freed_bytes"]}
+
+
+def _expiry_seconds(package_type: str) -> int | None:
+    """Age in seconds at which a package of this type expires; None = kept forever.
+
+    Cache expires after ``cache_seconds``. Other types expire when their offsite
+    stop ends (cold boundary + offsite wait), unless offsite is disabled or
+    ``never_delete`` is set.
+    """
+    rule = _get_rule_set(package_type)
+    if "cache_seconds" in rule:
+        return max(1, int(rule["cache_seconds"]))
+    offsite = rule.get("stops", {}).get("offsite", {})
+    if not offsite.get("enabled", True) or offsite.get("never_delete"):
+        return None
+    wait = offsite.get("wait_seconds" if DEMO_MODE else "wait_days")
+    if wait is None:
+        wait = DEFAULT_WAIT_SECONDS if DEMO_MODE else DEFAULT_WAIT_DAYS
+    _, _, cold_end, _ = _get_boundaries(package_type)
+    return (cold_end + max(1, int(wait))) * (1 if DEMO_MODE else 86400)
+
+
+def _retention_sweep(limit: int) -> int:
+    """Delete up to ``limit`` expired packages as one batch; return how many were deleted.
+
+    Candidates come oldest first from the creation-time index, per package type.
+    Jobs stored without a package_type are checked against their derived type.
+    """
+    now = time.time()
+    sets = RULE_SETS_SECONDS if DEMO_MODE else RULE_SETS_DAYS
+    expiries = {ptype: _expiry_seconds(ptype) for ptype in sets}
+    expiries = {ptype: expiry for ptype, expiry in expiries.items() if expiry is not None}
+    selected: list[str] = []
+    for ptype, expiry in expiries.items():
+        if len(selected) >= limit:
+            break
+        selected.extend(STATE.jobs_created_between([ptype], None, now - expiry, limit - len(selected)))
+    if len(selected) < limit and expiries:
+        untyped = STATE.jobs_created_between([None], None, now - min(expiries.values()))
+        for job_id in untyped:
+            job = JOBS.get(job_id)
+            if job is None:
+                continue
+            ptype = _enrich_job(job, frozenset(("package_type",)))["package_type"]
+            if ptype in expiries and _age_seconds(job.get("created_at", "")) >= expiries[ptype]:
+                selected.append(job_id)
+                if len(selected) >= limit:
+                    break
+    if not selected:
+        return 0
+    result = _bulk_delete(selected, {"expiry_seconds": expiries}, event_type="retention_expired")
+    return result["deleted"]
+
+
+RETENTION = RetentionExecutor(
+    _retention_sweep,
+    interval=SETTINGS.retention_interval,
+    batch_size=SETTINGS.retention_batch,
+    max_per_run=SETTINGS.retention_max_per_run,
+    max_per_second=SETTINGS.retention_max_per_second,
+)
+
+
+@app.get("/api/v1/retention")
+def get_retention() -> dict:
+    """Retention executor settings and counters."""
+    return {"enabled": SETTINGS.retention_enabled, **RETENTION.status()}
+
+
+@app.post("/api/v1/retention/run")
+def run_retention() -> dict:
+    """Run one retention pass now (same batching and rate limit as the schedule).
+
+    ``last_run_deleted`` is this pass; ``deleted`` is the running total.
+    """
+    RETENTION.run_once()
+    return {"enabled": SETTINGS.retention_enabled, **RETENTION.status()}
+
+
+def _require_admin(token: str | None) -> None:
+    """Admin routes exist only with ADMIN_TOKEN set; 404 otherwise, 403 on a wrong token."""
+    if not SETTINGS.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token_valid(SETTINGS.admin_token, token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+def _profile_response(profile, fmt: str) -> PlainTextResponse:
+    body, media_type = profile.render(fmt)
+    suffix = "speedscope.json" if fmt == "speedscope" else "collapsed.txt"
+    return PlainTextResponse(
+        body,
+        media_type=media_type,
+        headers={
+            "X-Profile-Id": profile.profile_id,
+            "Content-Disposition": f'attachment; filename="{profile.profile_id}.{suffix}"',
+        },
+    )
+
+
+@app.post("/api/v1/admin/profile")
+async def profile_window(
+    seconds: float = Query(5.0, gt=0, le=60),
+    interval: float = Query(0.005, ge=0.001, le=1),
+    format: Literal["collapsed", "speedscope"] = "collapsed",
+    x_admin_token: str | None = Header(None, alias="X-Admin-Token"),
+) -> PlainTextResponse:
+    """Sample every thread for ``seconds`` while other requests are served; returns the profile file."""
+    _require_admin(x_admin_token)
+    profile_id = PROFILES.next_id()
+    sampler = Sampler(interval).start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profile = sampler.stop(profile_id, f"window {seconds:g}s")
+        PROFILES.add(profile)
+    return _profile_response(profile, format)
+
+
+@app.get("/api/v1/admin/profiles")
+def list_profiles(x_admin_token: str | None = Header(None, alias="X-Admin-Token")) -> list[dict]:
+    """Recent profiles (per-request and window), newest first."""
+    _require_admin(x_admin_token)
+    return PROFILES.list()
+
+
+@app.get("/api/v1/admin/profiles/{profile_id}")
+def get_profile(
+    profile_id: str,
+    format: Literal["collapsed", "speedscope"] = "collapsed",
+    x_admin_token: str | None = Header(None, alias="X-Admin-Token"),
+) -> PlainTextResponse:
+    _require_admin(x_admin_token)
+    profile = PROFILES.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return _profile_response(profile, format)
+
+
+@app.get("/api/v1/admin/tracemalloc")
+def tracemalloc_status(x_admin_token: str | None = Header(None, alias="X-Admin-Token")) -> dict:
+    _require_admin(x_admin_token)
+    return MEMORY.status()
+
+
+@app.post("/api/v1/admin/tracemalloc/start")
+def tracemalloc_start(
+    frames: int = Query(1, ge=1, le=64), x_admin_token: str | None = Header(None, alias="X-Admin-Token")
+) -> dict:
+    """Start tracing allocations (slows the process down until stopped)."""
+    _require_admin(x_admin_token)
+    return MEMORY.start(frames)
+
+
+@app.post("/api/v1/admin/tracemalloc/snapshot")
+def tracemalloc_snapshot(
+    against: str | None = None,
+    key_type: Literal["lineno", "filename", "traceback"] = "lineno",
+    limit: int = Query(20, ge=1, le=500),
+    x_admin_token: str | None = Header(None, alias="X-Admin-Token"),
+) -> dict:
+    """Top allocations now, and growth since ``against`` (default: the previous snapshot)."""
+    _require_admin(x_admin_token)
+    if not MEMORY.status()["tracing"]:
+        raise HTTPException(status_code=409, detail="tracemalloc is not tracing; POST /api/v1/admin/tracemalloc/start")
+    if against is not None and not MEMORY.has(against):
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return MEMORY.snapshot(against, key_type, limit)
+
+
+@app.post("/api/v1/admin/tracemalloc/stop")
+def tracemalloc_stop(x_admin_token: str | None = Header(None, alias="X-Admin-Token")) -> dict:
+    _require_admin(x_admin_token)
+    return MEMORY.stop()
 
 
 @app.post("/api/v1/demo/reset")
@@ -1110,12 +1910,7 @@ def _ingest_one(source_id: str, path: str, checksum: str, size_bytes: int, tier_
         checksum=checksum or None,
         details={"path": path, "package_type": ptype, "size_bytes": size_bytes or 0, "seed": True},
     )
-    if source_id not in SOURCES:
-        STATE.set_source(source_id, {"source_id": source_id, "label": "Demo seed", "last_seen_at": created_at})
-    else:
-        source = SOURCES[source_id]
-        source["last_seen_at"] = created_at
-        STATE.set_source(source_id, source)
+    STATE.touch_source(source_id, created_at, label="Demo seed")
     return job
 
 
@@ -1125,30 +1920,28 @@ def get_status() -> dict:
     enriched = [_enrich_job(j) for j in JOBS.values()]
     bucket_counts = {b: sum(1 for j in enriched if j["bucket"] == b) for b in BUCKETS_ORDER}
     # Client "active" if any source seen in last 60s (or 30s in demo)
-    now = datetime.now(timezone.utc)
-    client_active = False
-    for s in SOURCES.values():
-        ls = s.get("last_seen_at")
-        if ls:
-            try:
-                dt = datetime.fromisoformat(ls.replace("Z", "+00:00"))
-                threshold = 30 if DEMO_MODE else 60
-                if (now - dt).total_seconds() < threshold:
-                    client_active = True
-                    break
-            except (ValueError, TypeError):
-                pass
+    threshold = 30 if DEMO_MODE else 60
+    last_seen = STATE.last_seen_epoch()
+    client_active = last_seen is not None and time.time() - last_seen < threshold
     return {
         "demo_mode": DEMO_MODE,
         "components": {
             "client": {"status": "active" if client_active else "idle"},
             "catcher": {"status": "ok", "jobs_count": len(JOBS)},
             "buckets": bucket_counts,
-            "deleted_count": DELETED_COUNT,
+            "deleted_count": STATE.deleted_count,
         },
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Prometheus text exposition of the in-process metrics registry."""
+    if not SETTINGS.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/health")
 def health() -> dict:
     return {
@@ -0,0 +1,283 @@
+"""In-process metrics: counters, gauges and fixed-bucket histograms.
+
+``REGISTRY.render()`` produces the Prometheus text format served at
+``/metrics``. Metrics are created where they are recorded (routes, state
+persistence, journal appends) and are cheap enough for the hot path: one
+lock and a few additions per observation. Gauges may take a callback that is
+read at scrape time (job counts, queue depth), so nothing is tracked for them
+between scrapes.
+
+With ``OTEL_EXPORTER_OTLP_ENDPOINT`` set and the OpenTelemetry metrics SDK
+installed, ``export_to_otel`` mirrors the registry as observable instruments
+on the meter provider set up by ``edge_observability``; histograms are
+exported as their ``_count`` and ``_sum``.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from collections.abc import Callable, Iterable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        """(suffix, label string, value) rows for rendering."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{self.name}{suffix}{labels} {_number(value)}" for suffix, labels, value in self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def values(self) -> dict[tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        return [("", _labels(self.labelnames, key), value) for key, value in sorted(self.values().items())]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Iterable[str] = (), callback: Callable[[], float] | None = None
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._callback = callback
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def values(self) -> dict[tuple[str, ...], float]:
+        if self._callback is not None:
+            return {(): float(self._callback())}
+        with self._lock:
+            return dict(self._values)
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        return [("", _labels(self.labelnames, key), value) for key, value in sorted(self.values().items())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket (non-cumulative, last = +Inf), sum]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def time(self, **labels: str) -> _Timer:
+        return _Timer(self, labels)
+
+    def totals(self) -> dict[tuple[str, ...], tuple[int, float]]:
+        """(count, sum) per label set."""
+        with self._lock:
+            return {key: (sum(counts), total) for key, (counts, total) in self._series.items()}
+
+    def samples(self) -> list[tuple[str, str, float]]:
+        with self._lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+        rows = []
+        for key, (counts, total) in sorted(series.items()):
+            running = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                running += count
+                rows.append(("_bucket", _labels(self.labelnames, key, f'le="{_number(bound)}"'), running))
+            rows.append(("_sum", _labels(self.labelnames, key), total))
+            rows.append(("_count", _labels(self.labelnames, key), running))
+        return rows
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: dict[str, str]) -> None:
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self) -> _Timer:
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._histogram.observe(time.perf_counter() - self._started, **self._labels)
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"metric {metric.name} already registered as {existing.kind}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(
+        self, name: str, help: str, labelnames: Iterable[str] = (), callback: Callable[[], float] | None = None
+    ) -> Gauge:
+        return self._register(Gauge(name, help, labelnames, callback))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def metrics(self) -> list[_Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self.metrics()) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "catcher_http_requests_total", "HTTP requests by method, route template and status.", ("method", "route", "status")
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "catcher_http_request_duration_seconds", "HTTP request latency by method and route template.", ("method", "route")
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request count and latency per route template.
+
+    Unmatched paths share the ``unmatched`` route label so scanners cannot
+    create unbounded label sets.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            label = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_LATENCY.observe(time.perf_counter() - started, method=method, route=label)
+            HTTP_REQUESTS.inc(method=method, route=label, status=str(status))
+
+
+def export_to_otel(registry: Registry = REGISTRY, meter_name: str = "edge-backup-catcher") -> bool:
+    """Mirror ``registry`` as OTel observable instruments; False when OTel metrics are unavailable."""
+    try:
+        from opentelemetry import metrics as otel_metrics
+    except ImportError:
+        return False
+    meter = otel_metrics.get_meter(meter_name)
+
+    def observe(read: Callable[[], dict[tuple[str, ...], float]], labelnames: tuple[str, ...]):
+        def callback(_options):
+            return [
+                otel_metrics.Observation(value, dict(zip(labelnames, key))) for key, value in read().items()
+            ]
+
+        return callback
+
+    for metric in registry.metrics():
+        if isinstance(metric, Counter):
+            meter.create_observable_counter(
+                metric.name, [observe(metric.values, metric.labelnames)], description=metric.help
+            )
+        elif isinstance(metric, Gauge):
+            meter.create_observable_gauge(
+                metric.name, [observe(metric.values, metric.labelnames)], description=metric.help
+            )
+        elif isinstance(metric, Histogram):
+            totals = metric.totals
+            meter.create_observable_counter(
+                f"{metric.name}_count",
+                [observe(lambda t=totals: {k: c for k, (c, _) in t().items()}, metric.labelnames)],
+                description=metric.help,
+            )
+            meter.create_observable_counter(
+                f"{metric.name}_sum",
+                [observe(lambda t=totals: {k: s for k, (_, s) in t().items()}, metric.labelnames)],
+                description=metric.help,
+            )
+    return True
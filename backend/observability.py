@@ -11,11 +11,23 @@ if str(_COMMON) not in sys.path:
 from edge_observability import (  # noqa: E402
     configure_observability,
     emit_ai_status,
+    flush_observability,
     log_error,
     log_event,
+    observability_stats,
+    span,
 )
 
-__all__ = ["configure_observability", "emit_ai_status", "log_error", "log_event", "get_logger"]
+__all__ = [
+    "configure_observability",
+    "emit_ai_status",
+    "flush_observability",
+    "log_error",
+    "log_event",
+    "get_logger",
+    "observability_stats",
+    "span",
+]
 
 
 def get_logger():
@@ -0,0 +1,301 @@
+"""On-demand sampling profiler and tracemalloc snapshots for the admin API.
+
+Only wired up when ``ADMIN_TOKEN`` is set; otherwise neither the middleware
+nor the sampler thread exists and requests pay nothing.
+
+``Sampler`` polls ``sys._current_frames()`` from a daemon thread every
+``interval`` seconds and counts whole stacks per thread, so the cost while
+profiling is one frame walk per thread per tick and nothing in the profiled
+code. A finished ``Profile`` renders as collapsed stacks (one
+``thread;outer;...;inner count`` line per stack, for flamegraph.pl and
+speedscope) or as a speedscope JSON document with one sampled profile per
+thread.
+
+``ProfilerMiddleware`` profiles single requests that carry ``X-Profile`` and
+a valid ``X-Admin-Token``; the response gets ``X-Profile-Id`` and the profile
+is fetched from ``/api/v1/admin/profiles/{id}``.
+"""
+
+from __future__ import annotations
+
+import hmac
+import itertools
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_INTERVAL = 0.005
+MIN_INTERVAL = 0.001
+KEEP_PROFILES = 20
+KEEP_SNAPSHOTS = 8
+
+Frame = tuple[str, str, int]  # (function, file, first line)
+
+
+def token_valid(configured: str, supplied: str | None) -> bool:
+    return bool(configured) and supplied is not None and hmac.compare_digest(configured, supplied)
+
+
+class Profile:
+    def __init__(
+        self, profile_id: str, name: str, interval: float, started: float, duration: float, stacks: Counter
+    ) -> None:
+        self.profile_id = profile_id
+        self.name = name
+        self.interval = interval
+        self.started = started
+        self.duration = duration
+        self.stacks = stacks  # (thread name, (root frame, ..., leaf frame)) -> samples
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "profile_id": self.profile_id,
+            "name": self.name,
+            "started_at": self.started,
+            "duration_seconds": round(self.duration, 6),
+            "interval_seconds": self.interval,
+            "samples": sum(self.stacks.values()),
+        }
+
+    def collapsed(self) -> str:
+        lines = []
+        for (thread, frames), count in sorted(self.stacks.items()):
+            names = [thread] + [f"{func} ({path}:{line})" for func, path, line in frames]
+            lines.append(";".join(name.replace(";", ":") for name in names) + f" {count}")
+        return "".join(line + "\n" for line in lines)
+
+    def speedscope(self) -> dict[str, Any]:
+        frame_index: dict[Frame, int] = {}
+        frames: list[dict[str, Any]] = []
+        by_thread: dict[str, list[tuple[list[int], float]]] = {}
+        for (thread, stack), count in sorted(self.stacks.items()):
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indices.append(frame_index[frame])
+            by_thread.setdefault(thread, []).append((indices, count * self.interval))
+        profiles = []
+        for thread, rows in by_thread.items():
+            weights = [weight for _, weight in rows]
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": [indices for indices, _ in rows],
+                    "weights": weights,
+                }
+            )
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.name,
+            "exporter": "edge-backup-catcher",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def render(self, fmt: str) -> tuple[str, str]:
+        """(body, media type) for ``collapsed`` or ``speedscope``."""
+        if fmt == "speedscope":
+            return json.dumps(self.speedscope()), "application/json"
+        return self.collapsed(), "text/plain; charset=utf-8"
+
+
+class Sampler:
+    def __init__(self, interval: float = DEFAULT_INTERVAL) -> None:
+        self.interval = max(MIN_INTERVAL, interval)
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="catcher-profiler", daemon=True)
+
+    def start(self) -> Sampler:
+        self._started_wall = time.time()
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self, profile_id: str, name: str) -> Profile:
+        self._stop.set()
+        self._thread.join()
+        duration = time.perf_counter() - self._started
+        return Profile(profile_id, name, self.interval, self._started_wall, duration, self._stacks)
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                stack.reverse()
+                self._stacks[(names.get(ident, str(ident)), tuple(stack))] += 1
+
+
+class ProfileStore:
+    """The most recent finished profiles, by id."""
+
+    def __init__(self, keep: int = KEEP_PROFILES) -> None:
+        self._keep = keep
+        self._ids = itertools.count(1)
+        self._profiles: OrderedDict[str, Profile] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def next_id(self) -> str:
+        return f"prof-{next(self._ids)}"
+
+    def add(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles[profile.profile_id] = profile
+            while len(self._profiles) > self._keep:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Profile | None:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [profile.summary() for profile in reversed(self._profiles.values())]
+
+
+class ProfilerMiddleware:
+    """Profile one request when it sends ``X-Profile`` with a valid ``X-Admin-Token``.
+
+    ``X-Profile`` may carry the sampling interval in seconds (``1`` or an
+    empty value uses the default).
+    """
+
+    def __init__(self, app: ASGIApp, token: str, store: ProfileStore) -> None:
+        self.app = app
+        self._token = token
+        self._store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        requested = headers.get(b"x-profile")
+        if requested is None:
+            await self.app(scope, receive, send)
+            return
+        if not token_valid(self._token, (headers.get(b"x-admin-token") or b"").decode("latin-1") or None):
+            body = b'{"detail":"Invalid admin token"}'
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 403,
+                    "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+        try:
+            interval = float(requested) if requested not in (b"", b"1") else DEFAULT_INTERVAL
+        except ValueError:
+            interval = DEFAULT_INTERVAL
+        profile_id = self._store.next_id()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        sampler = Sampler(interval).start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._store.add(sampler.stop(profile_id, f"{scope['method']} {scope['path']}"))
+
+
+class MemoryTracker:
+    """tracemalloc start/stop and numbered snapshots diffed against each other."""
+
+    def __init__(self, keep: int = KEEP_SNAPSHOTS) -> None:
+        self._keep = keep
+        self._ids = itertools.count(1)
+        self._snapshots: OrderedDict[str, tracemalloc.Snapshot] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def status(self) -> dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshots = list(self._snapshots)
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else 0,
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "snapshots": snapshots,
+        }
+
+    def start(self, frames: int = 1) -> dict[str, Any]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(max(1, frames))
+        return self.status()
+
+    def stop(self) -> dict[str, Any]:
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+        return self.status()
+
+    def has(self, snapshot_id: str) -> bool:
+        with self._lock:
+            return snapshot_id in self._snapshots
+
+    def snapshot(self, against: str | None = None, key_type: str = "lineno", limit: int = 20) -> dict[str, Any]:
+        """Take a snapshot; report its top allocations and the diff from ``against`` (default: previous)."""
+        snap = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            )
+        )
+        with self._lock:
+            base_id = against or next(reversed(self._snapshots), None)
+            base = self._snapshots.get(base_id) if base_id else None
+            snapshot_id = f"snap-{next(self._ids)}"
+            self._snapshots[snapshot_id] = snap
+            while len(self._snapshots) > self._keep:
+                self._snapshots.popitem(last=False)
+        result: dict[str, Any] = {
+            "snapshot_id": snapshot_id,
+            "traced_bytes": sum(stat.size for stat in snap.statistics("filename")),
+            "top": [_stat_row(stat) for stat in snap.statistics(key_type)[:limit]],
+            "against": base_id if base is not None else None,
+            "diff": None,
+        }
+        if base is not None:
+            result["diff"] = [_stat_row(stat) for stat in snap.compare_to(base, key_type)[:limit]]
+        return result
+
+
+def _stat_row(stat: tracemalloc.Statistic | tracemalloc.StatisticDiff) -> dict[str, Any]:
+    row = {
+        "where": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+        "size_bytes": stat.size,
+        "count": stat.count,
+    }
+    if isinstance(stat, tracemalloc.StatisticDiff):
+        row["size_diff_bytes"] = stat.size_diff
+        row["count_diff"] = stat.count_diff
+    return row
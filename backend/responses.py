@@ -0,0 +1,34 @@
+"""Fast JSON responses for the catcher's bulk endpoints.
+
+``FastJSONResponse`` serializes with orjson when it is installed (optional,
+``requirements-fast-json.txt``) and falls back to compact stdlib ``json``
+otherwise. Routes that return it directly skip FastAPI's ``jsonable_encoder``
+pass and response-model validation, which dominate serialization time for
+large package and journal lists.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize plain JSON data (dicts, lists, str, numbers) to UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, default=str)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
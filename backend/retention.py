@@ -0,0 +1,101 @@
+"""Background retention executor.
+
+Runs a sweep callback on a schedule (``RETENTION_ENABLED=1``). Each run
+deletes expired manifests in bounded batches and stops early once the per-run
+budget is spent; batches are spaced to respect the deletes-per-second limit,
+so a large backlog drains over several runs instead of stalling the API.
+The sweep itself (what counts as expired) lives with the rule sets in
+``main``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionExecutor:
+    def __init__(
+        self,
+        sweep: Callable[[int], int],
+        *,
+        interval: float = 60.0,
+        batch_size: int = 1000,
+        max_per_run: int = 100_000,
+        max_per_second: float = 5000.0,
+    ) -> None:
+        self._sweep = sweep
+        self.interval = max(0.1, interval)
+        self.batch_size = max(1, batch_size)
+        self.max_per_run = max(1, max_per_run)
+        self.max_per_second = max_per_second
+        self._stop = threading.Event()
+        self._run_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.runs = 0
+        self.deleted = 0
+        self.last_run_at: str | None = None
+        self.last_run_deleted = 0
+        self.last_error: str | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="retention-executor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        thread, self._thread = self._thread, None
+        self._stop.set()
+        if thread is not None:
+            thread.join(timeout)
+
+    def run_once(self) -> int:
+        """One rate-limited run; returns the number of manifests deleted."""
+        with self._run_lock:
+            deleted = 0
+            try:
+                while deleted < self.max_per_run and not self._stop.is_set():
+                    started = time.monotonic()
+                    batch = self._sweep(min(self.batch_size, self.max_per_run - deleted))
+                    deleted += batch
+                    if batch < self.batch_size:
+                        break
+                    if self.max_per_second > 0:
+                        pause = batch / self.max_per_second - (time.monotonic() - started)
+                        if pause > 0:
+                            self._stop.wait(pause)
+                self.last_error = None
+            except Exception as exc:  # noqa: BLE001
+                self.last_error = str(exc)
+                logger.exception("retention run failed", extra={"event_type": "retention_failed"})
+            finally:
+                self.runs += 1
+                self.deleted += deleted
+                self.last_run_deleted = deleted
+                self.last_run_at = datetime.now(timezone.utc).isoformat()
+            return deleted
+
+    def status(self) -> dict:
+        return {
+            "running": self._thread is not None,
+            "interval_seconds": self.interval,
+            "batch_size": self.batch_size,
+            "max_per_run": self.max_per_run,
+            "max_per_second": self.max_per_second,
+            "runs": self.runs,
+            "deleted": self.deleted,
+            "last_run_at": self.last_run_at,
+            "last_run_deleted": self.last_run_deleted,
+            "last_error": self.last_error,
+        }
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.run_once()
@@ -0,0 +1,209 @@
+"""Row-level SQLite store shared by several catcher worker processes.
+
+Enabled with ``SHARED_STATE=1`` (plus a sqlite ``DATABASE_URL``). Each process
+keeps its in-memory ``DispatcherState`` as a cache and writes through to this
+store; other processes pick the writes up by polling a change version:
+
+- every write transaction bumps ``meta.version`` and stamps touched rows with it;
+- deletions leave a tombstone stamped the same way;
+- ids come from the ``sequences`` table inside ``BEGIN IMMEDIATE`` transactions,
+  so they are unique across processes;
+- journal events get their id, hash-chain link and row in the same
+  transaction, so ledger order (and the chain) is global.
+
+The database runs in WAL mode so readers never block the single writer.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from ledger import seal
+
+ROW_TABLES = ("jobs", "sources", "config_snapshots", "config_blobs", "journal_checkpoints", "rule_sets")
+SEQUENCES = ("job_id", "journal_id", "snapshot_id", "deleted_count")
+
+
+class RowStore:
+    def __init__(self, path: Path, busy_timeout_ms: int = 10_000) -> None:
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_schema()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+            self._local.depth = 0
+        return conn
+
+    def _init_schema(self) -> None:
+        conn = self._conn()
+        for table in ROW_TABLES:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, payload TEXT NOT NULL, version INTEGER NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_version ON {table} (version)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS tombstones ("
+            "tbl TEXT NOT NULL, key TEXT NOT NULL, version INTEGER NOT NULL, PRIMARY KEY (tbl, key))"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS journal (seq INTEGER PRIMARY KEY, payload TEXT NOT NULL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS sequences (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        conn.executemany(
+            "INSERT OR IGNORE INTO sequences (name, value) VALUES (?, 0)", [(name,) for name in SEQUENCES]
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO meta (key, value) VALUES (?, 0)", [("version",), ("reset_version",)]
+        )
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction; nested calls on one thread join the outermost one."""
+        conn = self._conn()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+            self._local.version = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+        finally:
+            self._local.depth = 0
+
+    def put(self, table: str, key: str, value: Any) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {table} (key, payload, version) VALUES (?, ?, ?)",
+                (key, json.dumps(value), self._local.version),
+            )
+            conn.execute("DELETE FROM tombstones WHERE tbl = ? AND key = ?", (table, key))
+
+    def delete(self, table: str, keys: list[str]) -> None:
+        with self.transaction() as conn:
+            version = self._local.version
+            conn.executemany(f"DELETE FROM {table} WHERE key = ?", [(key,) for key in keys])
+            conn.executemany(
+                "INSERT OR REPLACE INTO tombstones (tbl, key, version) VALUES (?, ?, ?)",
+                [(table, key, version) for key in keys],
+            )
+
+    def clear(self, *tables: str) -> None:
+        """Drop every row of ``tables``; readers see ``reset_version`` and reload them."""
+        with self.transaction() as conn:
+            for table in tables:
+                conn.execute(f"DELETE FROM {table}")
+                conn.execute("DELETE FROM tombstones WHERE tbl = ?", (table,))
+            conn.execute("UPDATE meta SET value = ? WHERE key = 'reset_version'", (self._local.version,))
+
+    def next_value(self, name: str, step: int = 1) -> int:
+        with self.transaction() as conn:
+            conn.execute("UPDATE sequences SET value = value + ? WHERE name = ?", (step, name))
+            return conn.execute("SELECT value FROM sequences WHERE name = ?", (name,)).fetchone()[0]
+
+    def set_value(self, name: str, value: int) -> None:
+        with self.transaction() as conn:
+            conn.execute("UPDATE sequences SET value = ? WHERE name = ?", (value, name))
+
+    def append_journal(self, event: dict) -> dict:
+        """Assign the next event id, link it after the last event and insert it in one transaction."""
+        with self.transaction() as conn:
+            conn.execute("UPDATE sequences SET value = value + 1 WHERE name = 'journal_id'")
+            number = conn.execute("SELECT value FROM sequences WHERE name = 'journal_id'").fetchone()[0]
+            last = conn.execute("SELECT payload FROM journal ORDER BY seq DESC LIMIT 1").fetchone()
+            event = seal({"event_id": f"evt-{number}", **event}, json.loads(last[0]).get("hash") if last else None)
+            conn.execute("INSERT INTO journal (seq, payload) VALUES (?, ?)", (number, json.dumps(event)))
+        return event
+
+    def journal_since(self, seq: int) -> list[tuple[int, dict]]:
+        rows = self._conn().execute("SELECT seq, payload FROM journal WHERE seq > ? ORDER BY seq", (seq,))
+        return [(row[0], json.loads(row[1])) for row in rows]
+
+    def version(self) -> int:
+        return self._conn().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    def changes_since(self, version: int) -> dict | None:
+        """Rows, tombstones and sequences changed after ``version`` (None when unchanged)."""
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            current = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+            if current <= version:
+                return None
+            reset = conn.execute("SELECT value FROM meta WHERE key = 'reset_version'").fetchone()[0]
+            since = 0 if reset > version else version
+            changes: dict[str, Any] = {"version": current, "reset": reset > version, "rows": {}, "deleted": {}}
+            for table in ROW_TABLES:
+                rows = conn.execute(
+                    f"SELECT key, payload FROM {table} WHERE version > ? ORDER BY version, rowid", (since,)
+                ).fetchall()
+                changes["rows"][table] = [(key, json.loads(payload)) for key, payload in rows]
+                changes["deleted"][table] = [
+                    row[0]
+                    for row in conn.execute("SELECT key FROM tombstones WHERE tbl = ? AND version > ?", (table, since))
+                ]
+            changes["sequences"] = dict(conn.execute("SELECT name, value FROM sequences").fetchall())
+            return changes
+        finally:
+            conn.execute("COMMIT")
+
+    def is_empty(self) -> bool:
+        conn = self._conn()
+        return all(conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is None for table in ("jobs", "journal"))
+
+    def import_payload(self, payload: dict[str, Any]) -> None:
+        """One-time migration from the single-row ``dispatcher_state`` blob."""
+        with self.transaction() as conn:
+            version = self._local.version
+            for table, key in (
+                ("jobs", "jobs"),
+                ("sources", "sources"),
+                ("config_snapshots", "config_snapshots"),
+                ("config_blobs", "config_blobs"),
+                ("journal_checkpoints", "journal_checkpoints"),
+            ):
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} (key, payload, version) VALUES (?, ?, ?)",
+                    [(k, json.dumps(v), version) for k, v in payload.get(key, {}).items()],
+                )
+            conn.executemany(
+                "INSERT OR REPLACE INTO journal (seq, payload) VALUES (?, ?)",
+                [(int(e["event_id"].removeprefix("evt-")), json.dumps(e)) for e in payload.get("journal", [])],
+            )
+            for name in SEQUENCES:
+                conn.execute("UPDATE sequences SET value = ? WHERE name = ?", (int(payload.get(name, 0)), name))
+
+    def read_blob(self) -> dict[str, Any] | None:
+        conn = self._conn()
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'dispatcher_state'"
+        ).fetchone()
+        if not exists:
+            return None
+        row = conn.execute("SELECT payload FROM dispatcher_state WHERE id = 1").fetchone()
+        return json.loads(row[0]) if row else None
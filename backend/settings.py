@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -21,6 +22,32 @@ class Settings(BaseSettings):
     otel_endpoint: str = Field(default="", validation_alias="OTEL_EXPORTER_OTLP_ENDPOINT")
     ebk_ai_status: bool = Field(default=False, validation_alias="EBK_AI_STATUS")
     data_dir: Path = Field(default=Path("/var/lib/edge-backup"), validation_alias="DATA_DIR")
+    shared_state: bool = Field(default=False, validation_alias="SHARED_STATE")
+    state_shards: int = Field(default=16, validation_alias="STATE_SHARDS")
+    dedup_bloom: bool = Field(default=False, validation_alias="DEDUP_BLOOM")
+    dedup_bloom_capacity: int = Field(default=1_000_000, validation_alias="DEDUP_BLOOM_CAPACITY")
+    ingest_queue_enabled: bool = Field(default=False, validation_alias="INGEST_QUEUE")
+    ingest_queue_size: int = Field(default=10_000, validation_alias="INGEST_QUEUE_SIZE")
+    ingest_queue_workers: int = Field(default=1, validation_alias="INGEST_QUEUE_WORKERS")
+    ingest_queue_batch: int = Field(default=100, validation_alias="INGEST_QUEUE_BATCH")
+    ingest_queue_retry_after: int = Field(default=1, validation_alias="INGEST_QUEUE_RETRY_AFTER")
+    persist_write_behind: bool = Field(default=False, validation_alias="PERSIST_WRITE_BEHIND")
+    log_queue: bool = Field(default=False, validation_alias="LOG_QUEUE")
+    log_queue_size: int = Field(default=10_000, validation_alias="LOG_QUEUE_SIZE")
+    log_queue_policy: Literal["drop", "block"] = Field(default="drop", validation_alias="LOG_QUEUE_POLICY")
+    log_fast_format: bool = Field(default=False, validation_alias="LOG_FAST_FORMAT")
+    response_compression: bool = Field(default=True, validation_alias="RESPONSE_COMPRESSION")
+    compression_min_size: int = Field(default=1024, validation_alias="COMPRESSION_MIN_SIZE")
+    zstd_dict_path: str = Field(default="", validation_alias="ZSTD_DICT")
+    journal_hmac_key: str = Field(default="", validation_alias="JOURNAL_HMAC_KEY")
+    journal_checkpoint_every: int = Field(default=1000, validation_alias="JOURNAL_CHECKPOINT_EVERY")
+    metrics_enabled: bool = Field(default=True, validation_alias="METRICS_ENABLED")
+    admin_token: str = Field(default="", validation_alias="ADMIN_TOKEN")
+    retention_enabled: bool = Field(default=False, validation_alias="RETENTION_ENABLED")
+    retention_interval: float = Field(default=60.0, validation_alias="RETENTION_INTERVAL")
+    retention_batch: int = Field(default=1000, validation_alias="RETENTION_BATCH")
+    retention_max_per_run: int = Field(default=100_000, validation_alias="RETENTION_MAX_PER_RUN")
+    retention_max_per_second: float = Field(default=5000.0, validation_alias="RETENTION_MAX_PER_SECOND")
 
     @field_validator("demo_mode", mode="before")
     @classmethod
@@ -31,7 +58,19 @@ class Settings(BaseSettings):
             return False
         return str(value).lower() in ("1", "true", "yes", "on")
 
-    @field_validator("ebk_ai_status", mode="before")
+    @field_validator(
+        "ebk_ai_status",
+        "dedup_bloom",
+        "ingest_queue_enabled",
+        "shared_state",
+        "persist_write_behind",
+        "log_queue",
+        "log_fast_format",
+        "response_compression",
+        "retention_enabled",
+        "metrics_enabled",
+        mode="before",
+    )
     @classmethod
     def _parse_bool(cls, value: object) -> bool:
         if isinstance(value, bool):
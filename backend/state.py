@@ -1,110 +1,605 @@
-"""Dispatcher state with optional SQLite persistence."""
+"""Dispatcher state with optional SQLite persistence.
+
+Request handlers run on a thread pool, so shared state is guarded:
+jobs and sources live in lock-sharded maps, ids come from a locked allocator,
+journal appends (id assignment + append) are serialized, and persistence
+writes a consistent snapshot under its own lock. ``_persist`` takes every
+shard lock while snapshotting, so it must never run while a shard lock is held:
+read-modify-write goes through ``update_job`` / ``touch_source``, which release
+the shard lock before persisting.
+
+With ``SHARED_STATE=1`` several worker processes share one SQLite database:
+writes go row by row to ``RowStore`` (WAL) and ``refresh`` pulls other
+processes' changes into this process's in-memory copy.
+
+In single-blob mode, disk writes run on one writer thread so request handlers
+(including the async hot routes) only do in-memory work; a queued write
+snapshots state when it runs, so one pending write covers every earlier
+mutation. ``pending_write`` returns the future a caller can await for
+durability. Shared-mode row writes stay synchronous (see ``_write_row``).
+"""
 
 from __future__ import annotations
 
+import bisect
+import contextvars
+import copy
 import json
 import sqlite3
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from concurrency import ShardedDict
+from indexes import (
+    MERKLE_DEPTH,
+    BacklogIndex,
+    ChecksumIndex,
+    CreationIndex,
+    LivenessIndex,
+    MerkleIndex,
+    PathIndex,
+)
+from ledger import GENESIS_HASH, event_number, load_key, make_checkpoint, seal, verify
+from metrics import REGISTRY
+from observability import span
+from row_store import RowStore
 from settings import Settings, get_settings
 
+PERSIST_SECONDS = REGISTRY.histogram(
+    "catcher_state_persist_seconds", "Time to write dispatcher state to SQLite (whole blob or one row).", ("mode",)
+)
+PERSIST_REQUESTS = REGISTRY.counter(
+    "catcher_state_persist_requests_total",
+    "Persistence requests: written inline, queued, coalesced into a queued write, or deferred by batched().",
+    ("outcome",),
+)
+JOURNAL_APPENDS = REGISTRY.counter("catcher_journal_appends_total", "Journal events appended.", ("event_type",))
+JOURNAL_APPEND_SECONDS = REGISTRY.histogram(
+    "catcher_journal_append_seconds", "Time to assign, chain and store one journal event."
+)
+
 
 @dataclass
 class DispatcherState:
-    jobs: dict[str, dict] = field(default_factory=dict)
-    sources: dict[str, dict] = field(default_factory=dict)
+    jobs: ShardedDict = field(default_factory=ShardedDict)
+    sources: ShardedDict = field(default_factory=ShardedDict)
     journal: list[dict] = field(default_factory=list)
     config_snapshots: dict[str, dict] = field(default_factory=dict)
+    config_blobs: dict[str, dict] = field(default_factory=dict)
+    journal_checkpoints: dict[str, dict] = field(default_factory=dict)
     deleted_count: int = 0
     job_id: int = 0
     journal_id: int = 0
     snapshot_id: int = 0
     _db_path: Path | None = None
+    checksums: ChecksumIndex = field(default_factory=ChecksumIndex)
+    backlog: BacklogIndex = field(default_factory=BacklogIndex)
+    paths: PathIndex = field(default_factory=PathIndex)
+    liveness: LivenessIndex = field(default_factory=LivenessIndex)
+    created: CreationIndex = field(default_factory=CreationIndex)
+    merkle: MerkleIndex = field(default_factory=MerkleIndex)
+    _id_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    _journal_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    _index_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    _persist_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    _local: threading.local = field(default_factory=threading.local, repr=False, compare=False)
+    _dirty: bool = False
+    rule_sets: dict[str, dict] = field(default_factory=dict)
+    _store: RowStore | None = None
+    _seen_version: int = 0
+    _journal_seq: int = 0
+    _refresh_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    _writer: ThreadPoolExecutor | None = None
+    _write_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    _queued_write: Future | None = None
+    _last_write: Future | None = None
+    _ledger_key: bytes = field(default=b"", repr=False, compare=False)
+    _checkpoint_every: int = 1000
+    _verified_checkpoint: str | None = None
 
-    def next_job_id(self) -> str:
-        self.job_id += 1
+    @property
+    def shared(self) -> bool:
+        return self._store is not None
+
+    @contextmanager
+    def batched(self) -> Iterator[DispatcherState]:
+        """Coalesce persistence for a group of mutations (on this thread) into a single write.
+
+        In shared mode every row write is already its own short transaction, so
+        this only affects the single-blob persistence.
+        """
+        self._local.depth = getattr(self._local, "depth", 0) + 1
+        try:
+            yield self
+        finally:
+            self._local.depth -= 1
+            if self._local.depth == 0 and self._dirty:
+                self._persist()
+
+    def _allocate(self, counter: str, step: int = 1) -> int:
+        if self._store is not None:
+            value = self._store.next_value(counter, step)
+            with self._id_lock:
+                setattr(self, counter, max(value, getattr(self, counter)))
+            return value
+        with self._id_lock:
+            value = getattr(self, counter) + step
+            setattr(self, counter, value)
         self._persist()
-        return f"job-{self.job_id}"
+        return value
+
+    def next_job_id(self) -> str:
+        return f"job-{self._allocate('job_id')}"
+
+    def reserve_job_id(self) -> str:
+        """Allocate a job id in memory only; the counter is persisted with the job."""
+        if self._store is not None:
+            return f"job-{self._allocate('job_id')}"
+        with self._id_lock:
+            self.job_id += 1
+            return f"job-{self.job_id}"
 
     def next_journal_id(self) -> str:
-        self.journal_id += 1
-        self._persist()
-        return f"evt-{self.journal_id}"
+        return f"evt-{self._allocate('journal_id')}"
 
     def next_snapshot_id(self) -> str:
-        self.snapshot_id += 1
-        self._persist()
-        return f"cfg-{self.snapshot_id}"
+        return f"cfg-{self._allocate('snapshot_id')}"
 
-    def append_journal(self, event: dict) -> None:
-        self.journal.append(event)
-        self._persist()
+    def append_journal(self, event: dict) -> dict:
+        """Assign the next event id, link it into the hash chain and append, atomically,
+        so ids and links follow ledger order."""
+        event_type = event.get("event_type", "")
+        JOURNAL_APPENDS.inc(event_type=event_type)
+        with JOURNAL_APPEND_SECONDS.time(), span("journal.append", event_type=event_type):
+            if self._store is not None:
+                with self._journal_lock:
+                    event = self._store.append_journal(event)
+                    self._pull_journal()
+                    self._maybe_checkpoint(event)
+                return event
+            with self._journal_lock:
+                with self._id_lock:
+                    self.journal_id += 1
+                    event = {"event_id": f"evt-{self.journal_id}", **event}
+                event = seal(event, self.journal[-1].get("hash") if self.journal else None)
+                self.journal.append(event)
+                self._maybe_checkpoint(event)
+            self._persist()
+            return event
 
-    def save_snapshot(self, snapshot: dict) -> None:
-        self.config_snapshots[snapshot["snapshot_id"]] = snapshot
+    def _maybe_checkpoint(self, event: dict) -> None:
+        # Caller holds _journal_lock.
+        if self._checkpoint_every > 0 and event_number(event["event_id"]) % self._checkpoint_every == 0:
+            checkpoint = make_checkpoint(self._ledger_key, event)
+            self.journal_checkpoints[event["event_id"]] = checkpoint
+            self._write_row("journal_checkpoints", event["event_id"], checkpoint)
+
+    def verify_journal(self, from_checkpoint: str | None = None) -> dict | None:
+        """Verify the hash chain from a checkpoint onwards; None if the checkpoint is unknown.
+
+        Without ``from_checkpoint`` it starts at the last checkpoint this process
+        verified (the whole ledger on the first run), so repeated audits only
+        rehash new events.
+        """
+        with self._journal_lock:
+            start = from_checkpoint or self._verified_checkpoint
+            checkpoints = dict(self.journal_checkpoints)
+            if start is None:
+                events, prev_hash = list(self.journal), GENESIS_HASH
+            else:
+                if start not in checkpoints:
+                    return None
+                index = bisect.bisect_left(
+                    self.journal, event_number(start), key=lambda e: event_number(e["event_id"])
+                )
+                events = self.journal[index:]
+                if not events or events[0]["event_id"] != start:
+                    return {
+                        "from_checkpoint": start,
+                        "ok": False,
+                        "checked_events": 0,
+                        "unsealed_events": 0,
+                        "last_hash": None,
+                        "verified_checkpoint": None,
+                        "error": {"event_id": start, "reason": "checkpoint event missing from ledger"},
+                    }
+                prev_hash = events[0].get("prev_hash") or GENESIS_HASH
+        result = verify(events, prev_hash, checkpoints, self._ledger_key)
+        if result["verified_checkpoint"] is not None:
+            with self._journal_lock:
+                current = self._verified_checkpoint
+                if current is None or event_number(result["verified_checkpoint"]) > event_number(current):
+                    self._verified_checkpoint = result["verified_checkpoint"]
+        return {"from_checkpoint": start, **result}
+
+    def save_snapshot(self, snapshot: dict, config: dict) -> None:
+        """Record snapshot metadata; the config body is stored once per distinct hash."""
+        with self._journal_lock:
+            if snapshot["hash"] not in self.config_blobs:
+                self.config_blobs[snapshot["hash"]] = config
+                self._write_row("config_blobs", snapshot["hash"], config)
+            self.config_snapshots[snapshot["snapshot_id"]] = snapshot
+            self._write_row("config_snapshots", snapshot["snapshot_id"], snapshot)
         self._persist()
 
+    def config_snapshot(self, snapshot_id: str) -> dict | None:
+        """Snapshot metadata joined with its config body."""
+        with self._journal_lock:
+            snapshot = self.config_snapshots.get(snapshot_id)
+            if snapshot is None:
+                return None
+            return {**snapshot, "config": self.config_blobs.get(snapshot["hash"], {})}
+
+    def _adopt_snapshot(self, snapshot_id: str, snapshot: dict) -> None:
+        """Store a snapshot row, moving an inline ``config`` (older layout) into the blobs."""
+        if "config" in snapshot:
+            snapshot = dict(snapshot)
+            self.config_blobs.setdefault(snapshot["hash"], snapshot.pop("config"))
+        self.config_snapshots[snapshot_id] = snapshot
+
+    def save_rule_sets(self, unit: str, rule_sets: dict) -> None:
+        """Share runtime rule sets ("days"/"seconds") with other workers (shared mode only)."""
+        self.rule_sets[unit] = copy.deepcopy(rule_sets)
+        self._write_row("rule_sets", unit, rule_sets)
+
     def set_job(self, job_id: str, job: dict) -> None:
-        self.jobs[job_id] = job
+        with self.jobs.lock_for(job_id):
+            self.jobs[job_id] = job
+            self._index_job(job_id, job)
+            self._write_row("jobs", job_id, job)
         self._persist()
 
+    def update_job(self, job_id: str, mutate: Callable[[dict], None]) -> dict | None:
+        """Apply ``mutate`` to a job under its shard lock, then persist after releasing it."""
+        with self.jobs.lock_for(job_id):
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            mutate(job)
+            self.jobs[job_id] = job
+            self._index_job(job_id, job)
+            self._write_row("jobs", job_id, job)
+        self._persist()
+        return job
+
     def delete_job(self, job_id: str) -> dict | None:
-        job = self.jobs.pop(job_id, None)
+        with self.jobs.lock_for(job_id):
+            job = self.jobs.pop(job_id, None)
+            if job is not None:
+                self._unindex_job(job_id)
+                self._delete_rows("jobs", [job_id])
         if job is not None:
-            self.deleted_count += 1
+            if self._store is not None:
+                self._allocate("deleted_count")
+                return job
+            with self._id_lock:
+                self.deleted_count += 1
             self._persist()
         return job
 
+    def delete_jobs(self, job_ids: list[str]) -> list[dict]:
+        """Remove many jobs with one storage write; return the removed jobs."""
+        removed, removed_ids = [], []
+        for job_id in job_ids:
+            with self.jobs.lock_for(job_id):
+                job = self.jobs.pop(job_id, None)
+                if job is not None:
+                    self._unindex_job(job_id)
+                    removed.append(job)
+                    removed_ids.append(job_id)
+        if not removed:
+            return removed
+        if self._store is not None:
+            with self._store.transaction():
+                self._store.delete("jobs", removed_ids)
+                self._allocate("deleted_count", len(removed))
+        else:
+            self._allocate("deleted_count", len(removed))
+        return removed
+
     def clear_jobs(self) -> None:
+        if self._store is not None:
+            with self._store.transaction():
+                self._store.clear("jobs", "sources")
+                self._store.set_value("deleted_count", 0)
+                self._store.set_value("job_id", 0)
         self.jobs.clear()
         self.sources.clear()
-        self.deleted_count = 0
-        self.job_id = 0
+        self._clear_indexes()
+        with self._id_lock:
+            self.deleted_count = 0
+            self.job_id = 0
         self._persist()
 
     def set_source(self, source_id: str, source: dict) -> None:
-        self.sources[source_id] = source
+        with self.sources.lock_for(source_id):
+            self.sources[source_id] = source
+            self._index_source(source_id, source)
+            self._write_row("sources", source_id, source)
         self._persist()
 
+    def touch_source(self, source_id: str, seen_at: str, label: str | None = None) -> bool:
+        """Create or refresh ``last_seen_at`` for a source; return True when it is new."""
+        with self.sources.lock_for(source_id):
+            source = self.sources.get(source_id)
+            is_new = source is None
+            if is_new:
+                source = {"source_id": source_id, "label": label, "last_seen_at": seen_at}
+            else:
+                source["last_seen_at"] = seen_at
+            self.sources[source_id] = source
+            self._index_source(source_id, source)
+            self._write_row("sources", source_id, source)
+        self._persist()
+        return is_new
+
+    def _write_row(self, table: str, key: str, value: dict) -> None:
+        # Called under the row's shard lock, so the row is serialized consistently
+        # and concurrent updates of one row reach SQLite in order. Row writes stay
+        # synchronous: ``refresh`` must never see a store row older than memory.
+        if self._store is not None:
+            with PERSIST_SECONDS.time(mode="row"), span("state.persist", mode="row", table=table):
+                self._store.put(table, key, value)
+
+    def _delete_rows(self, table: str, keys: list[str]) -> None:
+        if self._store is not None:
+            self._store.delete(table, keys)
+
+    def pending_write(self) -> Future | None:
+        """Future of the most recently scheduled disk write (None if nothing is outstanding)."""
+        with self._write_lock:
+            future = self._last_write
+        return None if future is None or future.done() else future
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Block until every scheduled disk write has completed."""
+        if self._dirty and not getattr(self._local, "depth", 0):
+            self._persist()
+        future = self.pending_write()
+        if future is not None:
+            future.result(timeout)
+
+    def _pull_journal(self) -> None:
+        for seq, event in self._store.journal_since(self._journal_seq):
+            self.journal.append(event)
+            self._journal_seq = seq
+
+    def refresh(self) -> set[str]:
+        """Pull rows written by other worker processes; return the changed tables.
+
+        A no-op outside shared mode. When nothing changed this costs one
+        single-row SELECT, so it is cheap enough to run before every request.
+        """
+        if self._store is None:
+            return set()
+        with self._refresh_lock:
+            changes = self._store.changes_since(self._seen_version)
+            with self._journal_lock:
+                before = self._journal_seq
+                self._pull_journal()
+            changed = {"journal"} if self._journal_seq != before else set()
+            if changes is None:
+                return changed
+            if changes["reset"]:
+                self.jobs.clear()
+                self.sources.clear()
+                self._clear_indexes()
+                changed |= {"jobs", "sources"}
+            for job_id in changes["deleted"]["jobs"]:
+                with self.jobs.lock_for(job_id):
+                    if self.jobs.pop(job_id, None) is not None:
+                        self._unindex_job(job_id)
+            for job_id, job in changes["rows"]["jobs"]:
+                with self.jobs.lock_for(job_id):
+                    self.jobs[job_id] = job
+                    self._index_job(job_id, job)
+            for source_id in changes["deleted"]["sources"]:
+                self.sources.pop(source_id, None)
+                with self._index_lock:
+                    self.liveness.discard(source_id)
+            for source_id, source in changes["rows"]["sources"]:
+                self.sources[source_id] = source
+                self._index_source(source_id, source)
+            with self._journal_lock:
+                for config_hash, config in changes["rows"]["config_blobs"]:
+                    self.config_blobs[config_hash] = config
+                for snapshot_id, snapshot in changes["rows"]["config_snapshots"]:
+                    self._adopt_snapshot(snapshot_id, snapshot)
+                for event_id, checkpoint in changes["rows"]["journal_checkpoints"]:
+                    self.journal_checkpoints[event_id] = checkpoint
+            for unit, rule_sets in changes["rows"]["rule_sets"]:
+                self.rule_sets[unit] = rule_sets
+            with self._id_lock:
+                for name, value in changes["sequences"].items():
+                    setattr(self, name, int(value))
+            changed |= {table for table, rows in changes["rows"].items() if rows}
+            changed |= {table for table, keys in changes["deleted"].items() if keys}
+            self._seen_version = changes["version"]
+            return changed
+
+    def _index_job(self, job_id: str, job: dict) -> None:
+        with self._index_lock:
+            self.checksums.add(job_id, job.get("checksum"))
+            self.backlog.update(job_id, job)
+            self.paths.update(job_id, job)
+            self.created.update(job_id, job)
+            self.merkle.update(job_id, job)
+
+    def _unindex_job(self, job_id: str) -> None:
+        with self._index_lock:
+            self.checksums.discard(job_id)
+            self.backlog.discard(job_id)
+            self.paths.discard(job_id)
+            self.created.discard(job_id)
+            self.merkle.discard(job_id)
+
+    def _index_source(self, source_id: str, source: dict) -> None:
+        with self._index_lock:
+            self.liveness.update(source_id, source)
+
+    def _clear_indexes(self) -> None:
+        with self._index_lock:
+            self.checksums.clear()
+            self.backlog.clear()
+            self.paths.clear()
+            self.liveness.clear()
+            self.created.clear()
+            self.merkle.clear()
+
+    def unfinished_page(self, source_id: str, after: str | None, limit: int | None) -> tuple[list[str], int]:
+        """One page of a source's unfinished package ids, plus the backlog size."""
+        with self._index_lock:
+            return self.backlog.page(source_id, after, limit), self.backlog.count(source_id)
+
+    def search_paths(
+        self, prefix: str, source_id: str | None, after: tuple[str, str] | None, limit: int
+    ) -> dict[str, Any]:
+        """Prefix page of (path, job_id) keys with totals and immediate subdirectories."""
+        with self._index_lock:
+            return {
+                "keys": self.paths.page(prefix, source_id, after, limit),
+                "totals": self.paths.totals(prefix, source_id),
+                "directories": self.paths.directories(prefix, source_id),
+            }
+
+    def last_seen_epoch(self) -> float | None:
+        """Most recent ``last_seen_at`` across all sources (epoch seconds)."""
+        with self._index_lock:
+            return self.liveness.latest()
+
+    def sources_seen_between(self, low: float | None, high: float | None) -> list[str]:
+        with self._index_lock:
+            return self.liveness.seen_between(low, high)
+
+    def jobs_created_between(
+        self, package_types: list[str | None] | None, low: float | None, high: float | None, limit: int | None = None
+    ) -> list[str]:
+        with self._index_lock:
+            return self.created.created_between(package_types, low, high, limit)
+
+    def merkle_view(self, source_id: str, prefix: str, depth: int) -> dict[str, Any]:
+        """Digest, entry count and child digests ``depth`` levels below ``prefix``
+        (plus the entries when ``prefix`` is a leaf bucket)."""
+        with self._index_lock:
+            tree = self.merkle.tree(source_id)
+            view: dict[str, Any] = {
+                "digest": tree.digest(prefix),
+                "count": tree.count(prefix),
+                "nodes": tree.level(prefix, depth),
+            }
+            if len(prefix) == MERKLE_DEPTH:
+                view["entries"] = tree.entries(prefix)
+            return view
+
+    def _rebuild_indexes(self) -> None:
+        self._clear_indexes()
+        for job_id, job in self.jobs.items():
+            self._index_job(job_id, job)
+        for source_id, source in self.sources.items():
+            self._index_source(source_id, source)
+
+    def _payload(self) -> dict[str, Any]:
+        with self._journal_lock:
+            journal = list(self.journal)
+            config_snapshots = dict(self.config_snapshots)
+            config_blobs = dict(self.config_blobs)
+            journal_checkpoints = dict(self.journal_checkpoints)
+        with self._id_lock:
+            counters = {
+                "deleted_count": self.deleted_count,
+                "job_id": self.job_id,
+                "journal_id": self.journal_id,
+                "snapshot_id": self.snapshot_id,
+            }
+        return {
+            "jobs": self.jobs.snapshot(),
+            "sources": self.sources.snapshot(),
+            "journal": journal,
+            "config_snapshots": config_snapshots,
+            "config_blobs": config_blobs,
+            "journal_checkpoints": journal_checkpoints,
+            **counters,
+        }
+
     def _persist(self) -> None:
-        if self._db_path is None:
+        if self._db_path is None or self._store is not None:
             return
-        self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        payload = {
-            "jobs": self.jobs,
-            "sources": self.sources,
-            "journal": self.journal,
-            "config_snapshots": self.config_snapshots,
-            "deleted_count": self.deleted_count,
-            "job_id": self.job_id,
-            "journal_id": self.journal_id,
-            "snapshot_id": self.snapshot_id,
-        }
-        with sqlite3.connect(self._db_path) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS dispatcher_state (
-                    id INTEGER PRIMARY KEY CHECK (id = 1),
-                    payload TEXT NOT NULL
+        if getattr(self._local, "depth", 0):
+            self._dirty = True
+            PERSIST_REQUESTS.inc(outcome="deferred")
+            return
+        if self._writer is None:
+            PERSIST_REQUESTS.inc(outcome="inline")
+            self._write_blob()
+            return
+        with self._write_lock:
+            # A queued (not yet started) write snapshots state when it runs, so it
+            # already covers this mutation.
+            if self._queued_write is None:
+                # Run in this request's context so the write's span joins its trace.
+                write = contextvars.copy_context().run
+                self._queued_write = self._last_write = self._writer.submit(write, self._run_queued_write)
+                PERSIST_REQUESTS.inc(outcome="queued")
+            else:
+                PERSIST_REQUESTS.inc(outcome="coalesced")
+
+    def _run_queued_write(self) -> None:
+        with self._write_lock:
+            self._queued_write = None
+        self._write_blob()
+
+    def _write_blob(self) -> None:
+        with self._persist_lock, PERSIST_SECONDS.time(mode="blob"), span("state.persist", mode="blob"):
+            self._dirty = False
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            payload = self._payload()
+            with sqlite3.connect(self._db_path) as conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS dispatcher_state (
+                        id INTEGER PRIMARY KEY CHECK (id = 1),
+                        payload TEXT NOT NULL
+                    )
+                    """
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO dispatcher_state (id, payload) VALUES (1, ?)",
+                    (json.dumps(payload),),
                 )
-                """
-            )
-            conn.execute(
-                "INSERT OR REPLACE INTO dispatcher_state (id, payload) VALUES (1, ?)",
-                (json.dumps(payload),),
-            )
 
     @classmethod
     def load(cls, settings: Settings | None = None) -> DispatcherState:
         settings = settings or get_settings()
+        checksums = ChecksumIndex(settings.dedup_bloom_capacity if settings.dedup_bloom else None)
+        shards = settings.state_shards
+        base = {
+            "checksums": checksums,
+            "jobs": ShardedDict(shards),
+            "sources": ShardedDict(shards),
+            "_checkpoint_every": settings.journal_checkpoint_every,
+        }
         if not settings.persistence_enabled:
-            return cls()
+            return cls(_ledger_key=load_key(settings.journal_hmac_key, None), **base)
 
         db_path = settings.sqlite_path
         db_path.parent.mkdir(parents=True, exist_ok=True)
-        state = cls(_db_path=db_path)
+        base["_ledger_key"] = load_key(settings.journal_hmac_key, db_path.with_name(db_path.name + ".journal-key"))
+        if settings.shared_state:
+            store = RowStore(db_path)
+            if store.is_empty():
+                blob = store.read_blob()
+                if blob:
+                    store.import_payload(blob)
+            state = cls(_db_path=db_path, _store=store, **base)
+            state.refresh()
+            return state
+        writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-writer")
+        state = cls(_db_path=db_path, _writer=writer, **base)
         if not db_path.exists():
             state._persist()
             return state
@@ -116,14 +611,18 @@ class DispatcherState:
             return state
 
         payload: dict[str, Any] = json.loads(row[0])
-        state.jobs = payload.get("jobs", {})
-        state.sources = payload.get("sources", {})
+        state.jobs.update(payload.get("jobs", {}))
+        state.sources.update(payload.get("sources", {}))
         state.journal = payload.get("journal", [])
-        state.config_snapshots = payload.get("config_snapshots", {})
+        state.journal_checkpoints = payload.get("journal_checkpoints", {})
+        state.config_blobs = payload.get("config_blobs", {})
+        for snapshot_id, snapshot in payload.get("config_snapshots", {}).items():
+            state._adopt_snapshot(snapshot_id, snapshot)
         state.deleted_count = int(payload.get("deleted_count", 0))
         state.job_id = int(payload.get("job_id", 0))
         state.journal_id = int(payload.get("journal_id", 0))
         state.snapshot_id = int(payload.get("snapshot_id", 0))
+        state._rebuild_indexes()
         return state
 
 
@@ -0,0 +1,67 @@
+"""Server spans for catcher requests (OpenTelemetry, optional).
+
+``TracingMiddleware`` continues the caller's trace from the W3C
+``traceparent`` header and names each span after the matched route template
+(``POST /api/v1/ingest``), so engine stages, catcher routes and the state
+persistence/journal spans beneath them form one trace. ``main`` installs it
+only when ``OTEL_EXPORTER_OTLP_ENDPOINT`` is set and the OpenTelemetry API is
+importable.
+"""
+
+from __future__ import annotations
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def tracing_available() -> bool:
+    try:
+        import opentelemetry.propagate  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class TracingMiddleware:
+    def __init__(self, app: ASGIApp, tracer_name: str = "edge-backup-catcher") -> None:
+        from opentelemetry import trace
+        from opentelemetry.propagate import extract
+        from opentelemetry.trace import SpanKind, Status, StatusCode
+
+        self.app = app
+        self._trace = trace
+        self._tracer_name = tracer_name
+        self._extract = extract
+        self._server = SpanKind.SERVER
+        self._error = Status(StatusCode.ERROR)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        method = scope["method"]
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        tracer = self._trace.get_tracer(self._tracer_name)
+        with tracer.start_as_current_span(
+            f"{method} {scope['path']}",
+            context=self._extract(carrier),
+            kind=self._server,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        ) as span:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    span.update_name(f"{method} {route}")
+                    span.set_attribute("http.route", route)
+                span.set_attribute("http.response.status_code", status)
+                if status >= 500:
+                    span.set_status(self._error)
@@ -1,30 +1,49 @@
-"""Shared client and service utilities for edge backup engines."""
-
-from client_interface import (
-    ClientConfig,
-    EdgeClientProtocol,
-    PackageRecord,
-    PackageStatus,
-    StatusUpdate,
-    TransferRecord,
-    TransferStatus,
-    client_interface_checks,
-)
-from edge_observability import (
-    configure_observability,
-    emit_ai_status,
-    format_ai_line,
-    get_logger,
-    log_error,
-    log_event,
-    register_status_listener,
-    unregister_status_listener,
-)
-from transfer_log import TransferLog, performance_fields, sha256_file
-from agent_context import export_agent_context, format_agent_context_json
+"""Shared client and service utilities for edge backup engines.
+
+Names are resolved on first attribute access (PEP 562), so importing the
+package costs nothing until a submodule is actually used.
+"""
+
+from importlib import import_module
+from typing import Any
+
+_EXPORTS = {
+    "ClientConfig": "client_interface",
+    "EdgeClientProtocol": "client_interface",
+    "PackageRecord": "client_interface",
+    "PackageStatus": "client_interface",
+    "StatusUpdate": "client_interface",
+    "TransferRecord": "client_interface",
+    "TransferStatus": "client_interface",
+    "client_interface_checks": "client_interface",
+    "request_with_backoff": "catcher_http",
+    "retry_delay": "catcher_http",
+    "configure_observability": "edge_observability",
+    "configure_status_emission": "edge_observability",
+    "emit_ai_status": "edge_observability",
+    "flush_observability": "edge_observability",
+    "format_ai_line": "edge_observability",
+    "get_logger": "edge_observability",
+    "log_error": "edge_observability",
+    "log_event": "edge_observability",
+    "observability_stats": "edge_observability",
+    "register_status_listener": "edge_observability",
+    "span": "edge_observability",
+    "trace_headers": "edge_observability",
+    "unregister_status_listener": "edge_observability",
+    "MerkleTree": "merkle",
+    "catcher_fetchers": "merkle",
+    "reconcile": "merkle",
+    "TransferLog": "transfer_log",
+    "performance_fields": "transfer_log",
+    "sha256_file": "transfer_log",
+    "export_agent_context": "agent_context",
+    "format_agent_context_json": "agent_context",
+}
 
 __all__ = [
     "ClientConfig",
+    "MerkleTree",
     "EdgeClientProtocol",
     "PackageRecord",
     "PackageStatus",
@@ -32,17 +51,39 @@ __all__ = [
     "TransferRecord",
     "TransferStatus",
     "TransferLog",
+    "catcher_fetchers",
     "client_interface_checks",
     "configure_observability",
+    "configure_status_emission",
     "export_agent_context",
     "format_agent_context_json",
     "emit_ai_status",
+    "flush_observability",
     "format_ai_line",
     "get_logger",
     "log_error",
     "log_event",
+    "observability_stats",
     "performance_fields",
+    "reconcile",
     "register_status_listener",
+    "request_with_backoff",
+    "retry_delay",
     "sha256_file",
+    "span",
+    "trace_headers",
     "unregister_status_listener",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
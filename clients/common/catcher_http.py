@@ -0,0 +1,43 @@
+"""
+HTTP helpers shared by engines that talk to the catcher.
+
+The catcher may run with a bounded ingest queue (INGEST_QUEUE=1); it then
+answers 429 when full and 409 for ids that are still queued. Clients wait out
+both using Retry-After plus jitter so a fleet restart does not retry in lockstep.
+Each call runs in a client span and carries the W3C ``traceparent`` header, so
+catcher-side spans join the engine's trace.
+"""
+from __future__ import annotations
+
+import random
+import time
+from typing import Any
+
+from edge_observability import span, trace_headers
+
+RETRY_STATUSES = (409, 429)
+
+
+def retry_delay(headers: Any, attempt: int) -> float:
+    """Seconds to wait before the next attempt (Retry-After, else exponential)."""
+    try:
+        return float(headers.get("Retry-After", 2 ** attempt))
+    except (TypeError, ValueError):
+        return float(2 ** attempt)
+
+
+def request_with_backoff(method: str, url: str, attempts: int = 5, **kwargs: Any):
+    """Send a request with ``requests``, waiting out 429 (queue full) / 409 (still queued)."""
+    import requests
+
+    with span(f"HTTP {method}", kind="client", **{"http.request.method": method, "url.full": url}) as current:
+        for attempt in range(attempts):
+            kwargs["headers"] = trace_headers(kwargs.get("headers"))
+            r = requests.request(method, url, **kwargs)
+            if current is not None:
+                current.set_attribute("http.response.status_code", r.status_code)
+                current.set_attribute("http.request.resend_count", attempt)
+            if r.status_code not in RETRY_STATUSES or attempt == attempts - 1:
+                return r
+            time.sleep(retry_delay(r.headers, attempt) + random.uniform(0, 1))
+    return r
@@ -6,13 +6,34 @@ Best practices applied:
 - Optional OTLP export when OTEL_EXPORTER_OTLP_ENDPOINT is set
 - Machine-readable EBK status lines for AI terminals (Chaterm / OpenClaw agents)
 - No print() for operational events; use get_logger() instead
+- Optional EBK volume control (EBK_AI_STATUS_RATE / EBK_AI_STATUS_SAMPLE or
+  configure_status_emission()): per-command lines/sec limits and sampling,
+  with suppressed counts reported in periodic ``suppressed`` summary lines;
+  errors and failed statuses always pass. Status listeners can be dispatched
+  from a bounded queue instead of the caller's thread.
+- Optional tracing: span() / trace_headers() create spans and W3C traceparent
+  headers when the OpenTelemetry API is installed, and are no-ops otherwise
+- Optional background emission (EBK_LOG_QUEUE=1 or configure_observability(queued=True)):
+  callers only enqueue; JSON formatting, stream writes and EBK lines happen on
+  worker threads, which write each drained batch with one write and one flush.
+  Queues are bounded (EBK_LOG_QUEUE_SIZE); when full, EBK_LOG_QUEUE_POLICY=drop
+  (default) discards and counts the item, =block makes the caller wait.
+  observability_stats() reports depth and drop counts. Call
+  flush_observability() before relying on output.
 """
 from __future__ import annotations
 
+import atexit
+import contextlib
+import copy
 import json
 import logging
 import os
+import queue
+import random
 import sys
+import threading
+import time
 from datetime import datetime, timezone
 from collections.abc import Callable
 from typing import Any
@@ -23,10 +44,41 @@ DEPLOYMENT_ENV = os.environ.get("DEPLOYMENT_ENV", os.environ.get("EBK_ENV", "dev
 LOG_FORMAT = os.environ.get("EBK_LOG_FORMAT", "json").lower()
 AI_STATUS_ENABLED = os.environ.get("EBK_AI_STATUS", "1").lower() in ("1", "true", "yes", "on")
 AI_STATUS_STREAM = os.environ.get("EBK_AI_STATUS_STREAM", "stdout").lower()
+LOG_FAST_FORMAT = os.environ.get("EBK_LOG_FAST_FORMAT", "0").lower() in ("1", "true", "yes", "on")
+LOG_QUEUE = os.environ.get("EBK_LOG_QUEUE", "0").lower() in ("1", "true", "yes", "on")
+LOG_QUEUE_SIZE = int(os.environ.get("EBK_LOG_QUEUE_SIZE", "10000"))
+LOG_QUEUE_POLICY = os.environ.get("EBK_LOG_QUEUE_POLICY", "drop").lower()
+LOG_BATCH_SIZE = int(os.environ.get("EBK_LOG_BATCH", "256"))
+STATUS_RATE = os.environ.get("EBK_AI_STATUS_RATE", "")
+STATUS_SAMPLE = os.environ.get("EBK_AI_STATUS_SAMPLE", "")
+STATUS_SUMMARY_INTERVAL = float(os.environ.get("EBK_AI_STATUS_SUMMARY_INTERVAL", "10"))
+STATUS_LISTENER_QUEUE = os.environ.get("EBK_STATUS_LISTENER_QUEUE", "0").lower() in ("1", "true", "yes", "on")
+ALWAYS_EMIT_STATUSES = ("failed", "error")
 
 _OTEL_READY = False
 _CONFIGURED: set[str] = set()
 _STATUS_LISTENERS: list[Callable[[str, dict[str, Any]], None]] = []
+_LOG_WRITERS: list[_BatchWriter] = []
+_STATUS_WRITER: _StatusLineWriter | None = None
+_STATUS_LIMITER: StatusLimiter | None = None
+_LISTENER_WRITER: _BatchWriter | None = None
+_SUMMARY_TIMER: _SummaryTimer | None = None
+_EXIT_FLUSH_REGISTERED = False
+_TRACER: Any = None  # resolved on first use; False when OpenTelemetry is not installed
+_ORJSON: Any = None  # resolved on first use; False when orjson is not installed
+_NO_SPAN = contextlib.nullcontext()
+
+
+def _load_orjson() -> Any:
+    """The orjson module, or None; imported on first use to keep startup cheap."""
+    global _ORJSON
+    if _ORJSON is None:
+        try:
+            import orjson
+        except ImportError:  # optional: FastStructuredFormatter falls back to json
+            orjson = False
+        _ORJSON = orjson
+    return _ORJSON or None
 
 
 def _now_iso() -> str:
@@ -39,12 +91,31 @@ def _ai_stream() -> Any:
     return sys.stdout
 
 
+# Record attributes copied into structured log lines when set.
+RECORD_FIELDS = (
+    "event_type",
+    "command",
+    "source_id",
+    "package_id",
+    "job_id",
+    "station_id",
+    "status",
+    "path",
+    "package_type",
+    "actor",
+    "error_source",
+    "operation",
+    "error_message",
+    "error_type",
+)
+
+
 class StructuredFormatter(logging.Formatter):
     """SigNoz-friendly JSON log lines (one object per line)."""
 
     def format(self, record: logging.LogRecord) -> str:
         payload: dict[str, Any] = {
-            "timestamp": _now_iso(),
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "severity": record.levelname,
             "severity_text": record.levelname,
             "body": record.getMessage(),
@@ -54,23 +125,8 @@ class StructuredFormatter(logging.Formatter):
             "service.version": SERVICE_VERSION,
             "deployment.environment": DEPLOYMENT_ENV,
         }
-        for key, attr in (
-            ("event_type", "event_type"),
-            ("command", "command"),
-            ("source_id", "source_id"),
-            ("package_id", "package_id"),
-            ("job_id", "job_id"),
-            ("station_id", "station_id"),
-            ("status", "status"),
-            ("path", "path"),
-            ("package_type", "package_type"),
-            ("actor", "actor"),
-            ("error_source", "error_source"),
-            ("operation", "operation"),
-            ("error_message", "error_message"),
-            ("error_type", "error_type"),
-        ):
-            value = getattr(record, attr, None)
+        for key in RECORD_FIELDS:
+            value = getattr(record, key, None)
             if value is not None:
                 payload[key] = value
         details = getattr(record, "details", None)
@@ -84,8 +140,275 @@ class StructuredFormatter(logging.Formatter):
             payload["span_id"] = span_id
         if record.exc_info:
             payload["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, default=str, separators=(",", ":"))
+
+
+class FastStructuredFormatter(logging.Formatter):
+    """Same JSON object as ``StructuredFormatter``, built for throughput.
+
+    The static service fields are encoded once at construction and spliced in
+    front of each line; the timestamp comes from ``record.created`` with the
+    date/time part cached per second; record attributes are read straight
+    from ``record.__dict__``; the message is resolved once; and the payload is
+    encoded in a single call, with orjson when it is installed (``use_orjson``:
+    None = auto, resolved at the first record; False = stdlib json). Key order differs from
+    ``StructuredFormatter`` (static fields first) and orjson writes non-ASCII
+    characters unescaped; parsed lines are identical.
+    """
+
+    def __init__(self, use_orjson: bool | None = None) -> None:
+        super().__init__()
+        self._orjson = _load_orjson() if use_orjson else None
+        if use_orjson and self._orjson is None:
+            raise ImportError("orjson is not installed")
+        self._resolve_orjson = use_orjson is None
+        static = {"service.version": SERVICE_VERSION, "deployment.environment": DEPLOYMENT_ENV}
+        self._prefix = "{" + json.dumps(static, separators=(",", ":"))[1:-1] + ","
+        self._second = -1
+        self._second_text = ""
+
+    def _timestamp(self, created: float) -> str:
+        # Matches datetime.fromtimestamp(created, timezone.utc).isoformat().
+        second = int(created)
+        micro = round((created - second) * 1e6)
+        if micro >= 1_000_000:
+            second += 1
+            micro -= 1_000_000
+        if second != self._second:
+            self._second_text = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._second = second
+        if micro:
+            return f"{self._second_text}.{micro:06d}+00:00"
+        return f"{self._second_text}+00:00"
+
+    def _encode(self, payload: dict[str, Any]) -> str:
+        if self._resolve_orjson:
+            self._orjson = _load_orjson()
+            self._resolve_orjson = False
+        if self._orjson is not None:
+            return self._orjson.dumps(payload, default=str, option=self._orjson.OPT_NON_STR_KEYS).decode()
         return json.dumps(payload, default=str, separators=(",", ":"))
 
+    def format(self, record: logging.LogRecord) -> str:
+        attrs = record.__dict__
+        message = record.getMessage()
+        level = record.levelname
+        payload: dict[str, Any] = {
+            "timestamp": self._timestamp(record.created),
+            "severity": level,
+            "severity_text": level,
+            "body": message,
+            "message": message,
+            "logger": record.name,
+            "service.name": attrs.get("service_name", SERVICE_NAME),
+        }
+        for key in RECORD_FIELDS:
+            value = attrs.get(key)
+            if value is not None:
+                payload[key] = value
+        details = attrs.get("details")
+        if isinstance(details, dict) and details:
+            payload["details"] = details
+        trace_id = attrs.get("trace_id")
+        if trace_id:
+            payload["trace_id"] = trace_id
+        span_id = attrs.get("span_id")
+        if span_id:
+            payload["span_id"] = span_id
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exception"] = record.exc_text
+        return self._prefix + self._encode(payload)[1:]
+
+
+class _BatchWriter:
+    """Bounded queue drained by one daemon thread, up to ``batch_size`` items per write.
+
+    ``policy`` decides what a full queue does to the caller: ``drop`` discards
+    the item and counts it, ``block`` waits for room. Items submitted with
+    ``keep=True`` (ERROR records, failure status lines) always wait for room.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        write_batch: Callable[[list], None],
+        maxsize: int = LOG_QUEUE_SIZE,
+        policy: str = LOG_QUEUE_POLICY,
+        batch_size: int = LOG_BATCH_SIZE,
+    ) -> None:
+        if policy not in ("drop", "block"):
+            raise ValueError(f"queue policy must be 'drop' or 'block', not {policy!r}")
+        self.name = name
+        self.policy = policy
+        self.batch_size = max(1, batch_size)
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self._write_batch = write_batch
+        self._queue: queue.Queue = queue.Queue(maxsize=max(0, maxsize))
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, item: Any, keep: bool = False) -> bool:
+        """Queue ``item``; False if it was dropped because the queue is full."""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self._thread.start()
+        if keep or self.policy == "block":
+            self._queue.put(item)
+            return True
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def flush(self) -> None:
+        if self._thread is not None:
+            self._queue.join()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "depth": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "policy": self.policy,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+        }
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            except Exception:  # noqa: BLE001 - a broken stream must not kill the writer
+                pass
+            finally:
+                self.written += len(batch)
+                self.batches += 1
+                for _ in batch:
+                    self._queue.task_done()
+
+
+class _DeferredQueueHandler(logging.Handler):
+    """Enqueue records with only message and traceback resolved in the caller.
+
+    Like ``logging.handlers.QueueHandler`` (not imported, it pulls in socket
+    and pickle), except that the stock ``prepare`` formats the whole record up
+    front; here the (JSON) formatting is left to the writer thread.
+    """
+
+    def __init__(self, writer: _BatchWriter) -> None:
+        super().__init__()
+        self.writer = writer
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.writer.submit(record, keep=record.levelno >= logging.ERROR)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.enqueue(self.prepare(record))
+        except Exception:  # noqa: BLE001 - same contract as Handler.emit
+            self.handleError(record)
+
+
+def _handle_batch(handler: logging.Handler, records: list[logging.LogRecord]) -> None:
+    """Format a batch and, for stream handlers, write it with one write and one flush."""
+    records = [record for record in records if record.levelno >= handler.level]
+    stream = getattr(handler, "stream", None)
+    if not isinstance(handler, logging.StreamHandler) or stream is None:
+        for record in records:
+            handler.handle(record)
+        return
+    lines = []
+    for record in records:
+        if not handler.filter(record):
+            continue
+        try:
+            lines.append(handler.format(record) + handler.terminator)
+        except Exception:  # noqa: BLE001 - same contract as Handler.emit
+            handler.handleError(record)
+    if not lines:
+        return
+    with handler.lock:
+        stream.write("".join(lines))
+        handler.flush()
+
+
+def _write_status_lines(batch: list[tuple[str, dict[str, Any]]]) -> None:
+    stream = _ai_stream()
+    stream.write("".join(format_ai_line(command, fields) + "\n" for command, fields in batch))
+    stream.flush()
+
+
+class _StatusLineWriter(_BatchWriter):
+    """Background writer for EBK status lines."""
+
+    def __init__(self, maxsize: int = LOG_QUEUE_SIZE, policy: str = LOG_QUEUE_POLICY) -> None:
+        super().__init__("ebk-status-writer", _write_status_lines, maxsize, policy)
+
+
+def queued_handler(
+    handler: logging.Handler, maxsize: int = LOG_QUEUE_SIZE, policy: str = LOG_QUEUE_POLICY
+) -> logging.Handler:
+    """Wrap ``handler`` so records are formatted and written in batches on a writer thread."""
+    writer = _BatchWriter("ebk-log-writer", lambda batch: _handle_batch(handler, batch), maxsize, policy)
+    if not _LOG_WRITERS:
+        atexit.register(flush_observability)
+    _LOG_WRITERS.append(writer)
+    return _DeferredQueueHandler(writer)
+
+
+def flush_observability() -> None:
+    """Emit pending ``suppressed`` summaries and drain queued log records, EBK lines
+    and listener events (no-op when emission is synchronous and unlimited)."""
+    _flush_status_summaries()
+    for writer in list(_LOG_WRITERS):
+        writer.flush()
+    if _STATUS_WRITER is not None:
+        _STATUS_WRITER.flush()
+    if _LISTENER_WRITER is not None:
+        _LISTENER_WRITER.flush()
+
+
+def observability_stats() -> dict[str, Any]:
+    """Queue depth, write and drop counters for background log records and EBK lines."""
+    logs = [writer.stats() for writer in _LOG_WRITERS]
+    return {
+        "log_queue": {
+            "depth": sum(item["depth"] for item in logs),
+            "written": sum(item["written"] for item in logs),
+            "dropped": sum(item["dropped"] for item in logs),
+        }
+        if logs
+        else None,
+        "status_queue": _STATUS_WRITER.stats() if _STATUS_WRITER is not None else None,
+        "listener_queue": _LISTENER_WRITER.stats() if _LISTENER_WRITER is not None else None,
+    }
+
 
 def _try_init_otel(service_name: str) -> None:
     global _OTEL_READY
@@ -123,11 +446,105 @@ def _try_init_otel(service_name: str) -> None:
     if not any(isinstance(h, LoggingHandler) for h in root.handlers):
         root.addHandler(LoggingHandler(level=logging.NOTSET, logger_provider=log_provider))
 
+    try:
+        from opentelemetry import metrics
+        from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+        from opentelemetry.sdk.metrics import MeterProvider
+        from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+    except ImportError:
+        pass
+    else:
+        reader = PeriodicExportingMetricReader(OTLPMetricExporter(endpoint=endpoint))
+        metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=[reader]))
+
     _OTEL_READY = True
 
 
-def configure_observability(service_name: str | None = None, level: int | None = None) -> logging.Logger:
-    """Configure JSON logging (and optional OTLP) once per service name."""
+def _get_tracer() -> Any:
+    global _TRACER
+    if _TRACER is None:
+        # A span can only be recorded once something has imported OpenTelemetry
+        # (our OTLP setup, auto-instrumentation, the host app); until then stay
+        # a no-op without importing it, so one-shot CLIs skip the cost.
+        if "opentelemetry.trace" not in sys.modules:
+            return False
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            _TRACER = False
+        else:
+            _TRACER = trace.get_tracer("edge-backup", SERVICE_VERSION)
+    return _TRACER
+
+
+def span(name: str, kind: str = "internal", **attributes: Any) -> contextlib.AbstractContextManager:
+    """Context manager for an OpenTelemetry span named ``name`` (a shared no-op without OTel).
+
+    ``kind`` is ``internal``, ``client``, ``server``, ``producer`` or ``consumer``;
+    ``None`` attributes are dropped. Spans nest through the current context, so
+    stages of one backup share a trace.
+    """
+    tracer = _TRACER if _TRACER is not None else _get_tracer()
+    if not tracer:
+        return _NO_SPAN
+    from opentelemetry.trace import SpanKind
+
+    return tracer.start_as_current_span(
+        name,
+        kind=SpanKind[kind.upper()],
+        attributes={key: value for key, value in attributes.items() if value is not None},
+    )
+
+
+def trace_headers(headers: dict[str, str] | None = None) -> dict[str, str]:
+    """``headers`` plus W3C ``traceparent``/``tracestate`` for the current span, if any."""
+    headers = dict(headers or {})
+    if not _get_tracer():
+        return headers
+    from opentelemetry.propagate import inject
+
+    inject(headers)
+    return headers
+
+
+def current_trace_ids() -> tuple[str | None, str | None]:
+    """(trace_id, span_id) of the current span as hex, for log correlation."""
+    if not _get_tracer():
+        return None, None
+    from opentelemetry import trace
+
+    context = trace.get_current_span().get_span_context()
+    if not context.is_valid:
+        return None, None
+    return format(context.trace_id, "032x"), format(context.span_id, "016x")
+
+
+def configure_observability(
+    service_name: str | None = None,
+    level: int | None = None,
+    queued: bool | None = None,
+    queue_size: int | None = None,
+    queue_policy: str | None = None,
+    fast_format: bool | None = None,
+) -> logging.Logger:
+    """Configure JSON logging (and optional OTLP) once per service name.
+
+    JSON lines come from ``StructuredFormatter``; ``fast_format`` (default:
+    EBK_LOG_FAST_FORMAT) opts in to ``FastStructuredFormatter`` instead.
+
+    ``queued`` (default: EBK_LOG_QUEUE) moves log formatting/writes and EBK
+    status lines to background threads with bounded queues of ``queue_size``
+    items (EBK_LOG_QUEUE_SIZE) and a ``drop`` or ``block`` full-queue policy
+    (EBK_LOG_QUEUE_POLICY).
+    """
+    global _STATUS_WRITER
+    if queued is None:
+        queued = LOG_QUEUE
+    queue_size = LOG_QUEUE_SIZE if queue_size is None else queue_size
+    queue_policy = queue_policy or LOG_QUEUE_POLICY
+    if queued and _STATUS_WRITER is None:
+        _STATUS_WRITER = _StatusLineWriter(queue_size, queue_policy)
+        atexit.register(_STATUS_WRITER.flush)
     name = service_name or SERVICE_NAME
     if name in _CONFIGURED:
         return logging.getLogger(name)
@@ -140,12 +557,13 @@ def configure_observability(service_name: str | None = None, level: int | None =
     if not root.handlers:
         handler = logging.StreamHandler(sys.stderr)
         if LOG_FORMAT == "json":
-            handler.setFormatter(StructuredFormatter())
+            fast = LOG_FAST_FORMAT if fast_format is None else fast_format
+            handler.setFormatter(FastStructuredFormatter() if fast else StructuredFormatter())
         else:
             handler.setFormatter(
                 logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
             )
-        root.addHandler(handler)
+        root.addHandler(queued_handler(handler, queue_size, queue_policy) if queued else handler)
     root.setLevel(log_level)
 
     _try_init_otel(name)
@@ -190,6 +608,7 @@ def log_event(
         "details": details or {},
         "service_name": SERVICE_NAME,
     }
+    extra["trace_id"], extra["span_id"] = current_trace_ids()
     logger.log(level, message, extra=extra)
 
 
@@ -236,6 +655,7 @@ def log_error(
         "details": merged_details,
         "service_name": SERVICE_NAME,
     }
+    extra["trace_id"], extra["span_id"] = current_trace_ids()
     if exc:
         logger.error(message, exc_info=exc, extra=extra)
     else:
@@ -280,19 +700,213 @@ def unregister_status_listener(listener: Callable[[str, dict[str, Any]], None])
     _STATUS_LISTENERS[:] = [item for item in _STATUS_LISTENERS if item is not listener]
 
 
-def emit_ai_status(command: str, **fields: Any) -> None:
-    """Write a machine-readable status line agents can grep or parse."""
+def _parse_limits(text: str) -> dict[str, float]:
+    """``"upload=20,progress=5,*=100"`` -> {command: value}; ``*`` applies to other commands."""
+    limits = {}
+    for part in text.split(","):
+        command, sep, value = part.partition("=")
+        if sep and command.strip():
+            limits[command.strip()] = float(value)
+    return limits
+
+
+class StatusLimiter:
+    """Per-command token buckets (lines/sec, one second of burst) and sampling.
+
+    Commands named in ``always`` and events whose ``status`` is failed/error
+    always pass. Suppressed events are counted per command and handed out by
+    ``due_summaries`` once every ``summary_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        rates: dict[str, float] | None = None,
+        sample: dict[str, float] | None = None,
+        summary_interval: float = STATUS_SUMMARY_INTERVAL,
+        always: tuple[str, ...] = ("error",),
+    ) -> None:
+        self.rates = dict(rates or {})
+        self.sample = dict(sample or {})
+        self.summary_interval = summary_interval
+        self.always = always
+        self._buckets: dict[str, list[float]] = {}  # command -> [tokens, last refill]
+        self._suppressed: dict[str, dict[str, int]] = {}
+        self._window_start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self, command: str, fields: dict[str, Any]) -> bool:
+        if command in self.always or fields.get("status") in ALWAYS_EMIT_STATUSES:
+            return True
+        fraction = self.sample.get(command, self.sample.get("*"))
+        rate = self.rates.get(command, self.rates.get("*"))
+        with self._lock:
+            if fraction is not None and random.random() >= fraction:
+                self._count(command, "sampled_out")
+                return False
+            if rate is None:
+                return True
+            now = time.monotonic()
+            bucket = self._buckets.get(command)
+            if bucket is None:
+                bucket = self._buckets[command] = [max(1.0, rate), now]
+            bucket[0] = min(max(1.0, rate), bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if bucket[0] < 1.0:
+                self._count(command, "rate_limited")
+                return False
+            bucket[0] -= 1.0
+            return True
+
+    def _count(self, command: str, reason: str) -> None:
+        counts = self._suppressed.setdefault(command, {"rate_limited": 0, "sampled_out": 0})
+        counts[reason] += 1
+
+    def due_summaries(self, force: bool = False) -> list[dict[str, Any]]:
+        """One summary per command with suppressed events, once per interval (or now with ``force``)."""
+        now = time.monotonic()
+        with self._lock:
+            if not self._suppressed or (not force and now - self._window_start < self.summary_interval):
+                return []
+            elapsed = now - self._window_start
+            suppressed, self._suppressed = self._suppressed, {}
+            self._window_start = now
+        return [
+            {
+                "suppressed_command": command,
+                "count": counts["rate_limited"] + counts["sampled_out"],
+                "rate_limited": counts["rate_limited"],
+                "sampled_out": counts["sampled_out"],
+                "interval_seconds": round(elapsed, 3),
+            }
+            for command, counts in sorted(suppressed.items())
+        ]
+
+
+def _dispatch_listeners(batch: list[tuple[str, dict[str, Any]]]) -> None:
+    for command, fields in batch:
+        for listener in list(_STATUS_LISTENERS):
+            try:
+                listener(command, fields)
+            except Exception:  # noqa: BLE001 - one listener must not starve the others
+                # No caller to raise to on the writer thread (the synchronous path raises).
+                logging.getLogger(__name__).exception(
+                    "status listener %r failed on %s", listener, command, extra={"event_type": "listener_error"}
+                )
+
+
+class _SummaryTimer:
+    """Daemon thread that emits due ``suppressed`` summaries when the limited commands go quiet."""
+
+    def __init__(self, limiter: StatusLimiter) -> None:
+        self._limiter = limiter
+        self._interval = max(0.1, limiter.summary_interval)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ebk-status-summaries", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                for summary in self._limiter.due_summaries():
+                    _emit("suppressed", summary)
+            except Exception:  # noqa: BLE001 - keep reporting after a failing listener
+                logging.getLogger(__name__).exception("suppressed summary failed")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def configure_status_emission(
+    rates: dict[str, float] | str | None = None,
+    sample: dict[str, float] | str | None = None,
+    summary_interval: float | None = None,
+    async_listeners: bool | None = None,
+    listener_queue_size: int = LOG_QUEUE_SIZE,
+) -> None:
+    """Set EBK rate limits/sampling and listener dispatch (defaults: EBK_AI_STATUS_* env).
+
+    ``rates`` maps command -> max lines/sec and ``sample`` command -> fraction
+    kept (``*`` for any other command; strings use ``upload=20,*=100``). With
+    neither, every event passes. Suppressed counts go out as ``suppressed``
+    lines every ``summary_interval`` seconds (from a timer thread, so a burst
+    that goes quiet is still reported) and at exit. ``async_listeners`` calls
+    status listeners from a bounded drop-policy queue instead of the emitting
+    thread; listener exceptions are then logged instead of raised.
+    """
+    global _STATUS_LIMITER, _LISTENER_WRITER, _SUMMARY_TIMER, _EXIT_FLUSH_REGISTERED
+    rates = STATUS_RATE if rates is None else rates
+    sample = STATUS_SAMPLE if sample is None else sample
+    if isinstance(rates, str):
+        rates = _parse_limits(rates)
+    if isinstance(sample, str):
+        sample = _parse_limits(sample)
+    interval = STATUS_SUMMARY_INTERVAL if summary_interval is None else summary_interval
+    if _SUMMARY_TIMER is not None:
+        _SUMMARY_TIMER.stop()
+        _SUMMARY_TIMER = None
+    if _STATUS_LIMITER is not None:
+        _flush_status_summaries()
+    _STATUS_LIMITER = StatusLimiter(rates, sample, interval) if rates or sample else None
+    if _STATUS_LIMITER is not None:
+        _SUMMARY_TIMER = _SummaryTimer(_STATUS_LIMITER)
+    if async_listeners is None:
+        async_listeners = STATUS_LISTENER_QUEUE
+    if async_listeners and _LISTENER_WRITER is None:
+        _LISTENER_WRITER = _BatchWriter("ebk-status-listeners", _dispatch_listeners, listener_queue_size, "drop")
+    elif not async_listeners and _LISTENER_WRITER is not None:
+        _LISTENER_WRITER.flush()
+        _LISTENER_WRITER = None
+    if (_STATUS_LIMITER is not None or _LISTENER_WRITER is not None) and not _EXIT_FLUSH_REGISTERED:
+        atexit.register(flush_observability)
+        _EXIT_FLUSH_REGISTERED = True
+
+
+def _flush_status_summaries() -> None:
+    if _STATUS_LIMITER is not None:
+        for summary in _STATUS_LIMITER.due_summaries(force=True):
+            _emit("suppressed", summary)
+
+
+def _emit(command: str, fields: dict[str, Any]) -> None:
     fields.setdefault("timestamp", _now_iso())
     fields.setdefault("service", SERVICE_NAME)
-    for listener in _STATUS_LISTENERS:
-        listener(command, dict(fields))
+    if _STATUS_LISTENERS:
+        if _LISTENER_WRITER is not None:
+            _LISTENER_WRITER.submit((command, dict(fields)))
+        else:
+            for listener in _STATUS_LISTENERS:
+                listener(command, dict(fields))
     if not AI_STATUS_ENABLED:
         return
+    if _STATUS_WRITER is not None:
+        keep = command == "error" or fields.get("status") in ALWAYS_EMIT_STATUSES
+        _STATUS_WRITER.submit((command, fields), keep=keep)
+        return
     line = format_ai_line(command, fields)
     print(line, file=_ai_stream(), flush=True)
 
 
+def emit_ai_status(command: str, **fields: Any) -> None:
+    """Write a machine-readable status line agents can grep or parse.
+
+    With limits configured (``configure_status_emission``) the event may be
+    suppressed; suppressed counts go out as ``suppressed`` lines.
+    """
+    limiter = _STATUS_LIMITER
+    if limiter is not None:
+        allowed = limiter.allow(command, fields)
+        for summary in limiter.due_summaries():
+            _emit("suppressed", summary)
+        if not allowed:
+            return
+    _emit(command, fields)
+
+
 def emit_ai_json(command: str, **fields: Any) -> None:
     """JSONL status event for agents that prefer JSON."""
     payload = {"type": "ebk_status", "command": command, "timestamp": _now_iso(), **fields}
     print(json.dumps(payload, default=str, separators=(",", ":")), file=_ai_stream(), flush=True)
+
+
+if STATUS_RATE or STATUS_SAMPLE or STATUS_LISTENER_QUEUE:
+    configure_status_emission()
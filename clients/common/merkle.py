@@ -0,0 +1,196 @@
+"""
+Merkle tree over (path, checksum, status) entries for engine/dispatcher reconciliation.
+
+Both sides build the same fixed-shape tree: an entry lives in the leaf bucket
+named by the first ``MAX_DEPTH`` hex digits of sha256(path), and every node
+below the root is named by its hex prefix (16 children per node). A bucket's
+digest covers its entries regardless of insertion order; an inner node's
+digest covers its 16 children. Empty subtrees hash to ``EMPTY_DIGEST``.
+
+The dispatcher keeps one tree per source (``GET /api/v1/sources/{id}/merkle``).
+``reconcile`` compares a local tree with it top-down and only descends into
+subtrees whose digests differ, so a restart check on a large source costs a
+few requests when little has changed.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Callable, Iterator
+from typing import Any
+
+MAX_DEPTH = 4
+HEX_DIGITS = "0123456789abcdef"
+EMPTY_DIGEST = hashlib.sha256(b"").hexdigest()
+
+Entry = tuple[str, str | None, str | None]
+
+
+def bucket_of(path: str) -> str:
+    return hashlib.sha256(path.encode("utf-8")).hexdigest()[:MAX_DEPTH]
+
+
+def entry_digest(entry: Entry) -> bytes:
+    return hashlib.sha256(json.dumps(list(entry), separators=(",", ":")).encode("utf-8")).digest()
+
+
+class MerkleTree:
+    """Incrementally maintained tree; digests are computed lazily and cached per node."""
+
+    def __init__(self, entries: dict[str, Entry] | None = None) -> None:
+        self._buckets: dict[str, dict[str, Entry]] = {}
+        self._bucket_of: dict[str, str] = {}
+        self._counts: dict[str, int] = {}  # entries under each non-empty prefix
+        self._digests: dict[str, str] = {}
+        for key, entry in (entries or {}).items():
+            self.update(key, *entry)
+
+    @classmethod
+    def from_entries(cls, entries: list[Entry]) -> MerkleTree:
+        """Tree keyed by path (one entry per local file)."""
+        return cls({entry[0]: entry for entry in entries})
+
+    def __len__(self) -> int:
+        return len(self._bucket_of)
+
+    def update(self, key: str, path: str, checksum: str | None, status: str | None) -> None:
+        entry = (path, checksum, status)
+        bucket = bucket_of(path)
+        if self._bucket_of.get(key) == bucket and self._buckets[bucket][key] == entry:
+            return
+        self.discard(key)
+        self._buckets.setdefault(bucket, {})[key] = entry
+        self._bucket_of[key] = bucket
+        for i in range(MAX_DEPTH + 1):
+            self._counts[bucket[:i]] = self._counts.get(bucket[:i], 0) + 1
+            self._digests.pop(bucket[:i], None)
+
+    def discard(self, key: str) -> None:
+        bucket = self._bucket_of.pop(key, None)
+        if bucket is None:
+            return
+        entries = self._buckets[bucket]
+        del entries[key]
+        if not entries:
+            del self._buckets[bucket]
+        for i in range(MAX_DEPTH + 1):
+            prefix = bucket[:i]
+            self._digests.pop(prefix, None)
+            if self._counts[prefix] == 1:
+                del self._counts[prefix]
+            else:
+                self._counts[prefix] -= 1
+
+    def count(self, prefix: str = "") -> int:
+        return self._counts.get(prefix, 0)
+
+    def digest(self, prefix: str = "") -> str:
+        if prefix not in self._counts:
+            return EMPTY_DIGEST
+        cached = self._digests.get(prefix)
+        if cached is not None:
+            return cached
+        h = hashlib.sha256()
+        if len(prefix) == MAX_DEPTH:
+            for part in sorted(entry_digest(entry) for entry in self._buckets[prefix].values()):
+                h.update(part)
+        else:
+            for digit in HEX_DIGITS:
+                h.update(self.digest(prefix + digit).encode("ascii"))
+        value = self._digests[prefix] = h.hexdigest()
+        return value
+
+    def level(self, prefix: str = "", depth: int = 1) -> dict[str, str]:
+        """Digests of the non-empty nodes ``depth`` levels below ``prefix``."""
+        depth = max(0, min(depth, MAX_DEPTH - len(prefix)))
+        return {node: self.digest(node) for node in self._nonempty(prefix, len(prefix) + depth)}
+
+    def _nonempty(self, prefix: str, length: int) -> Iterator[str]:
+        if prefix not in self._counts:
+            return
+        if len(prefix) == length:
+            yield prefix
+            return
+        for digit in HEX_DIGITS:
+            yield from self._nonempty(prefix + digit, length)
+
+    def entries(self, bucket: str) -> list[Entry]:
+        return sorted(self._buckets.get(bucket, {}).values(), key=lambda e: (e[0], str(e[1]), str(e[2])))
+
+
+def divergent_buckets(
+    local: MerkleTree, fetch_level: Callable[[str, int], dict[str, Any]], depth: int = 2
+) -> tuple[list[str], int]:
+    """Leaf buckets whose digests differ from the remote tree, plus the number of requests made.
+
+    ``fetch_level(prefix, depth)`` returns ``{"digest": ..., "nodes": {prefix: digest}}``
+    as served by the dispatcher's merkle endpoint.
+    """
+    buckets: list[str] = []
+    requests = 0
+    pending = [""]
+    while pending:
+        prefix = pending.pop()
+        step = min(depth, MAX_DEPTH - len(prefix))
+        remote = fetch_level(prefix, step)
+        requests += 1
+        if remote["digest"] == local.digest(prefix):
+            continue
+        remote_nodes = remote["nodes"]
+        local_nodes = local.level(prefix, step)
+        for node in sorted(remote_nodes.keys() | local_nodes.keys()):
+            if remote_nodes.get(node, EMPTY_DIGEST) == local_nodes.get(node, EMPTY_DIGEST):
+                continue
+            if len(node) == MAX_DEPTH:
+                buckets.append(node)
+            else:
+                pending.append(node)
+    return sorted(buckets), requests
+
+
+def reconcile(
+    local: MerkleTree,
+    fetch_level: Callable[[str, int], dict[str, Any]],
+    fetch_entries: Callable[[str], list[Entry]],
+    depth: int = 2,
+) -> dict[str, Any]:
+    """Entries only the engine has (``only_local``) and only the dispatcher has (``only_remote``).
+
+    A file whose checksum or status differs appears on both sides.
+    """
+    buckets, requests = divergent_buckets(local, fetch_level, depth)
+    only_local: list[Entry] = []
+    only_remote: list[Entry] = []
+    for bucket in buckets:
+        remote = {tuple(entry) for entry in fetch_entries(bucket)}
+        mine = set(local.entries(bucket))
+        only_local.extend(mine - remote)
+        only_remote.extend(remote - mine)
+        requests += 1
+    return {
+        "only_local": sorted(only_local, key=lambda e: e[0]),
+        "only_remote": sorted(only_remote, key=lambda e: e[0]),
+        "divergent_buckets": buckets,
+        "requests": requests,
+    }
+
+
+def catcher_fetchers(
+    base_url: str, source_id: str, timeout: float = 30.0
+) -> tuple[Callable[[str, int], dict[str, Any]], Callable[[str], list[Entry]]]:
+    """``fetch_level`` / ``fetch_entries`` callables backed by the catcher HTTP API."""
+    from catcher_http import request_with_backoff
+
+    url = f"{base_url.rstrip('/')}/api/v1/sources/{source_id}/merkle"
+
+    def fetch_level(prefix: str, depth: int) -> dict[str, Any]:
+        r = request_with_backoff("GET", url, params={"prefix": prefix, "depth": depth}, timeout=timeout)
+        r.raise_for_status()
+        return r.json()
+
+    def fetch_entries(bucket: str) -> list[Entry]:
+        r = request_with_backoff("GET", url, params={"prefix": bucket, "depth": 0}, timeout=timeout)
+        r.raise_for_status()
+        return [tuple(entry) for entry in r.json()["entries"]]
+
+    return fetch_level, fetch_entries
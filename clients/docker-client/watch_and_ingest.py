@@ -15,14 +15,13 @@ import shutil
 from dataclasses import dataclass
 from pathlib import Path
 
-import requests
-
 _HERE = Path(__file__).resolve().parent
 for _common in (_HERE / "common", _HERE.parent / "common"):
     if _common.is_dir() and str(_common) not in sys.path:
         sys.path.insert(0, str(_common))
         break
-from edge_observability import configure_observability, emit_ai_status, log_event  # noqa: E402
+from catcher_http import request_with_backoff  # noqa: E402
+from edge_observability import configure_observability, emit_ai_status, log_event, span  # noqa: E402
 
 logger = configure_observability(os.environ.get("OTEL_SERVICE_NAME", "edge-backup-client"))
 
@@ -180,7 +179,7 @@ def patch_package(job_id: str, progress_percent: int | None = None, status: str
         body["checksum"] = checksum
     if not body:
         return
-    r = requests.patch(f"{CATCHER_URL.rstrip('/')}/api/v1/packages/{job_id}", json=body, timeout=10)
+    r = request_with_backoff("PATCH", f"{CATCHER_URL.rstrip('/')}/api/v1/packages/{job_id}", json=body, timeout=10)
     r.raise_for_status()
 
 
@@ -217,15 +216,18 @@ def register_with_catcher(record: UploadRecord, logical_path: str, checksum: str
     }
     if checksum:
         payload["checksum"] = checksum
-    set_record(record, "registering", 75)
-    r = requests.post(f"{CATCHER_URL.rstrip('/')}/api/v1/ingest", json=payload, timeout=10)
-    r.raise_for_status()
-    data = r.json()
-    record.job_id = data.get("job_id") or ""
-    set_record(record, "in_progress", 90, "registered with catcher")
-    if record.job_id:
-        patch_package(record.job_id, progress_percent=100, status="completed", checksum=checksum)
-    set_record(record, "completed", 100, "metadata uploaded")
+    with span("register", path=logical_path, station_id=record.target) as current:
+        set_record(record, "registering", 75)
+        r = request_with_backoff("POST", f"{CATCHER_URL.rstrip('/')}/api/v1/ingest", json=payload, timeout=10)
+        r.raise_for_status()
+        data = r.json()
+        record.job_id = data.get("job_id") or ""
+        if current is not None and record.job_id:
+            current.set_attribute("package_id", record.job_id)
+        set_record(record, "in_progress", 90, "registered with catcher")
+        if record.job_id:
+            patch_package(record.job_id, progress_percent=100, status="completed", checksum=checksum)
+        set_record(record, "completed", 100, "metadata uploaded")
 
 
 def scan_and_ingest() -> None:
@@ -233,53 +235,64 @@ def scan_and_ingest() -> None:
     if not os.path.isdir(base):
         print(f"WATCH_DIR not a directory: {base}", file=sys.stderr)
         return
-    for path in iter_files(base):
-        if not os.path.isfile(path):
-            continue
-        mtime = os.path.getmtime(path)
-        key = file_id(path, mtime)
-        if key in SEEN:
-            continue
-        SEEN.add(key)
-        rel = os.path.relpath(path, base)
-        size = os.path.getsize(path)
-        package_type = classify_package_type(rel)
-        targets = repository_targets(rel)
-        if not targets:
-            targets = [("catcher", Path(rel), "catcher")]
-        records = [
-            UploadRecord(path=rel, target=target, package_type=package_type, size_bytes=size)
-            for target, _, _ in targets
-        ]
-        UPLOADS.extend(records)
+    with span("scan", source_id=SOURCE_ID, path=base):
+        for path in iter_files(base):
+            ingest_file(base, path)
+
+
+def ingest_file(base: str, path: str) -> None:
+    """Hash, copy to each repository target and register one file under its own ``backup`` span."""
+    if not os.path.isfile(path):
+        return
+    mtime = os.path.getmtime(path)
+    key = file_id(path, mtime)
+    if key in SEEN:
+        return
+    SEEN.add(key)
+    rel = os.path.relpath(path, base)
+    size = os.path.getsize(path)
+    package_type = classify_package_type(rel)
+    targets = repository_targets(rel)
+    if not targets:
+        targets = [("catcher", Path(rel), "catcher")]
+    records = [
+        UploadRecord(path=rel, target=target, package_type=package_type, size_bytes=size)
+        for target, _, _ in targets
+    ]
+    UPLOADS.extend(records)
+    with span("backup", source_id=SOURCE_ID, path=rel, package_type=package_type, size_bytes=size):
         for record in records:
             set_record(record, "hashing", 10)
         checksum = None
-        try:
-            with open(path, "rb") as f:
-                checksum = hashlib.sha256(f.read()).hexdigest()
-            for record in records:
-                record.checksum = checksum
-        except OSError:
-            pass
+        with span("hash", size_bytes=size):
+            try:
+                with open(path, "rb") as f:
+                    checksum = hashlib.sha256(f.read()).hexdigest()
+                for record in records:
+                    record.checksum = checksum
+            except OSError:
+                pass
         # OpenSpec §7: checksum required when size_bytes > 0; skip files we cannot checksum
         if size > 0 and not checksum:
             for record in records:
                 set_record(record, "skipped", 0, "cannot compute checksum")
             print(f"Skipped {rel}: cannot compute checksum", file=sys.stderr)
             SEEN.discard(key)
-            continue
+            return
+        from requests import RequestException  # deferred: startup does not need requests
+
         had_failure = False
         for record, (target, destination, label) in zip(records, targets):
             logical_path = rel if target == "catcher" else f"{target}/{rel}"
             try:
                 if target != "catcher":
                     set_record(record, "uploading", 35, f"copying to {label}")
-                    copy_and_verify(path, destination, checksum or "")
+                    with span("copy", station_id=target, destination=str(destination), size_bytes=size):
+                        copy_and_verify(path, destination, checksum or "")
                     set_record(record, "verified", 65, f"verified {label}")
                 register_with_catcher(record, logical_path, checksum)
                 print(f"Ingested {logical_path} ({package_type}) -> job_id={record.job_id}")
-            except (OSError, requests.RequestException) as e:
+            except (OSError, RequestException) as e:
                 had_failure = True
                 set_record(record, "failed", record.progress_percent, str(e))
                 print(f"Failed to upload {logical_path}: {e}", file=sys.stderr)
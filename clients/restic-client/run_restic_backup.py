@@ -19,6 +19,7 @@ import os
 import subprocess
 import sys
 import time
+from pathlib import Path
 
 try:
     import requests
@@ -26,6 +27,16 @@ except ImportError:
     print("pip install requests", file=sys.stderr)
     sys.exit(1)
 
+_HERE = Path(__file__).resolve().parent
+for _common in (_HERE / "common", _HERE.parent / "common"):
+    if _common.is_dir() and str(_common) not in sys.path:
+        sys.path.insert(0, str(_common))
+        break
+from catcher_http import request_with_backoff  # noqa: E402
+from edge_observability import configure_observability, span, trace_headers  # noqa: E402
+
+configure_observability(os.environ.get("OTEL_SERVICE_NAME", "edge-backup-restic-client"))
+
 CATCHER_URL = os.environ.get("CATCHER_URL", "http://catcher:8000").rstrip("/")
 API = f"{CATCHER_URL}/api/v1"
 SOURCE_ID = os.environ.get("SOURCE_ID", "restic-client")
@@ -70,7 +81,7 @@ def post_ingest(path: str, package_type: str = "business_data") -> str | None:
     """Register backup with catcher; return job_id."""
     payload = {"source_id": SOURCE_ID, "path": path, "package_type": package_type}
     try:
-        r = requests.post(f"{API}/ingest", json=payload, timeout=5)
+        r = request_with_backoff("POST", f"{API}/ingest", json=payload, timeout=5)
         r.raise_for_status()
         return r.json().get("job_id")
     except requests.RequestException as e:
@@ -88,7 +99,7 @@ def patch_package(job_id: str, progress_percent: int | None = None, status: str
     if not body:
         return True
     try:
-        r = requests.patch(f"{API}/packages/{job_id}", json=body, timeout=5)
+        r = request_with_backoff("PATCH", f"{API}/packages/{job_id}", json=body, timeout=5)
         r.raise_for_status()
         return True
     except requests.RequestException as e:
@@ -102,6 +113,7 @@ def register_source() -> None:
         requests.post(
             f"{API}/sources",
             json={"source_id": SOURCE_ID, "label": "Restic backup client (MinIO)"},
+            headers=trace_headers(),
             timeout=5,
         )
     except requests.RequestException:
@@ -116,42 +128,47 @@ def run_backup() -> bool:
         return False
 
     path = WATCH_DIR
-    job_id = post_ingest(path, package_type="business_data")
-    if not job_id:
-        return False
-    patch_package(job_id, status="in_progress")
+    with span("backup", tool="restic", source_id=SOURCE_ID, path=path):
+        with span("register"):
+            job_id = post_ingest(path, package_type="business_data")
+            if not job_id:
+                return False
+            patch_package(job_id, status="in_progress")
 
-    try:
-        proc = subprocess.Popen(
-            ["restic", "backup", path, "--json"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-        )
-        last_pct = 0
-        for line in proc.stdout or []:
-            try:
-                msg = json.loads(line)
-                if msg.get("message_type") == "status":
-                    pct = int(msg.get("percent_done", 0) * 100)
-                    if pct > last_pct and pct <= 100:
-                        patch_package(job_id, progress_percent=pct)
-                        last_pct = pct
-                        print(f"  [{path}] {pct}%")
-                elif msg.get("message_type") == "summary":
-                    patch_package(job_id, progress_percent=100, status="completed")
-                    print(f"  [{path}] completed -> {job_id}")
-            except json.JSONDecodeError:
-                pass
-        proc.wait()
-        if proc.returncode != 0:
-            patch_package(job_id, status="failed")
+        try:
+            with span("restic.backup", package_id=job_id) as current:
+                proc = subprocess.Popen(
+                    ["restic", "backup", path, "--json"],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    bufsize=1,
+                )
+                last_pct = 0
+                for line in proc.stdout or []:
+                    try:
+                        msg = json.loads(line)
+                        if msg.get("message_type") == "status":
+                            pct = int(msg.get("percent_done", 0) * 100)
+                            if pct > last_pct and pct <= 100:
+                                patch_package(job_id, progress_percent=pct)
+                                last_pct = pct
+                                print(f"  [{path}] {pct}%")
+                        elif msg.get("message_type") == "summary":
+                            patch_package(job_id, progress_percent=100, status="completed")
+                            print(f"  [{path}] completed -> {job_id}")
+                    except json.JSONDecodeError:
+                        pass
+                proc.wait()
+                if current is not None:
+                    current.set_attribute("process.exit.code", proc.returncode)
+            if proc.returncode != 0:
+                patch_package(job_id, status="failed")
+                return False
+            return True
+        except FileNotFoundError:
+            print("restic not found. Install: https://restic.net/", file=sys.stderr)
             return False
-        return True
-    except FileNotFoundError:
-        print("restic not found. Install: https://restic.net/", file=sys.stderr)
-        return False
 
 
 def main() -> int:
@@ -38,31 +38,35 @@ from edge_observability import (  # noqa: E402
     log_event,
 )
 
-try:
-    import requests
-except ImportError:
-    print("pip install requests", file=sys.stderr)
-    sys.exit(1)
-
 BASE = os.environ.get("CATCHER_URL", "http://127.0.0.1:8000").rstrip("/")
 API = f"{BASE}/api/v1"
 logger = configure_observability(os.environ.get("OTEL_SERVICE_NAME", "edge-backup-agent"))
 
 
+def _requests():
+    """Import ``requests`` on the first API call; ``commands`` and ``--help`` never pay for it."""
+    try:
+        import requests
+    except ImportError:
+        print("pip install requests", file=sys.stderr)
+        sys.exit(1)
+    return requests
+
+
 def _get(path: str, params: dict | None = None) -> dict | list:
-    r = requests.get(f"{API}{path}", params=params or {}, timeout=15)
+    r = _requests().get(f"{API}{path}", params=params or {}, timeout=15)
     r.raise_for_status()
     return r.json()
 
 
 def _post(path: str, body: dict) -> dict:
-    r = requests.post(f"{API}{path}", json=body, timeout=15)
+    r = _requests().post(f"{API}{path}", json=body, timeout=15)
     r.raise_for_status()
     return r.json()
 
 
 def _patch(path: str, body: dict) -> dict:
-    r = requests.patch(f"{API}{path}", json=body, timeout=15)
+    r = _requests().patch(f"{API}{path}", json=body, timeout=15)
     r.raise_for_status()
     return r.json()
 
@@ -126,8 +130,14 @@ def cmd_status(args: argparse.Namespace) -> int:
     return 0
 
 
+AI_PACKAGE_FIELDS = "package_id,source_id,path,status,bucket,progress_percent"
+AI_JOURNAL_FIELDS = "event_id,event_type,source_id,package_id,after_status,error"
+
+
 def cmd_packages(args: argparse.Namespace) -> int:
     params: dict = {}
+    if output_format(args) == "ai":
+        params["fields"] = AI_PACKAGE_FIELDS
     if args.status:
         params["status"] = args.status
     if args.source_id:
@@ -207,8 +217,10 @@ def cmd_journal(args: argparse.Namespace) -> int:
         params["event_type"] = args.event_type
     if args.source_id:
         params["source_id"] = args.source_id
-    events = _get("/journal", params)
     fmt = output_format(args)
+    if fmt == "ai":
+        params["fields"] = AI_JOURNAL_FIELDS
+    events = _get("/journal", params)
     if fmt == "ai":
         for event in events if isinstance(events, list) else []:
             emit(
@@ -371,7 +383,10 @@ def main() -> int:
     args = parser.parse_args()
     try:
         return args.func(args)
-    except requests.RequestException as exc:
+    except Exception as exc:
+        requests = sys.modules.get("requests")
+        if requests is None or not isinstance(exc, requests.RequestException):
+            raise
         err = {"error": str(exc), "catcher_url": BASE}
         log_error(
             logger,
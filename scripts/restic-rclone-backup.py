@@ -33,6 +33,7 @@ import re
 import subprocess
 import sys
 import time
+from pathlib import Path
 
 try:
     import requests
@@ -40,6 +41,14 @@ except ImportError:
     print("pip install requests", file=sys.stderr)
     sys.exit(1)
 
+_COMMON = Path(__file__).resolve().parent.parent / "clients" / "common"
+if str(_COMMON) not in sys.path:
+    sys.path.insert(0, str(_COMMON))
+
+from edge_observability import configure_observability, span, trace_headers  # noqa: E402
+
+configure_observability(os.environ.get("OTEL_SERVICE_NAME", "edge-backup-restic-rclone"))
+
 BASE = os.environ.get("CATCHER_URL", "http://127.0.0.1:8000").rstrip("/")
 API = f"{BASE}/api/v1"
 DEFAULT_SOURCE = "restic-rclone-client"
@@ -52,7 +61,8 @@ def post_ingest(path: str, source_id: str, size_bytes: int = 0, checksum: str |
         payload["size_bytes"] = size_bytes
         payload["checksum"] = checksum
     try:
-        r = requests.post(f"{API}/ingest", json=payload, timeout=5)
+        with span("HTTP POST", kind="client", **{"url.full": f"{API}/ingest"}):
+            r = requests.post(f"{API}/ingest", json=payload, headers=trace_headers(), timeout=5)
         r.raise_for_status()
         return r.json().get("job_id")
     except requests.RequestException as e:
@@ -72,7 +82,8 @@ def patch_package(job_id: str, progress_percent: int | None = None, checksum: st
     if not body:
         return True
     try:
-        r = requests.patch(f"{API}/packages/{job_id}", json=body, timeout=5)
+        with span("HTTP PATCH", kind="client", **{"url.full": f"{API}/packages/{job_id}"}):
+            r = requests.patch(f"{API}/packages/{job_id}", json=body, headers=trace_headers(), timeout=5)
         r.raise_for_status()
         return True
     except requests.RequestException as e:
@@ -86,6 +97,7 @@ def register_source(source_id: str) -> None:
         requests.post(
             f"{API}/sources",
             json={"source_id": source_id, "label": "Restic/Rclone backup client"},
+            headers=trace_headers(),
             timeout=5,
         )
     except requests.RequestException:
@@ -118,35 +130,38 @@ def run_restic(path: str, source_id: str) -> bool:
     if not repo:
         print("Set RESTIC_REPOSITORY (e.g. s3:s3.amazonaws.com/bucket)", file=sys.stderr)
         return False
-    job_id = post_ingest(path, source_id, package_type="business_data")
+    with span("register"):
+        job_id = post_ingest(path, source_id, package_type="business_data")
+        if job_id:
+            patch_package(job_id, status="in_progress")
     if not job_id:
         return False
-    patch_package(job_id, status="in_progress")
     # restic backup --json outputs JSON lines; status has percent_done
     try:
-        proc = subprocess.Popen(
-            ["restic", "backup", path, "--json"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-        )
-        last_pct = 0
-        for line in proc.stdout or []:
-            try:
-                msg = json.loads(line)
-                if msg.get("message_type") == "status":
-                    pct = int(msg.get("percent_done", 0) * 100)
-                    if pct > last_pct and pct <= 100:
-                        patch_package(job_id, progress_percent=pct)
-                        last_pct = pct
-                        print(f"  [{path}] {pct}%")
-                elif msg.get("message_type") == "summary":
-                    patch_package(job_id, progress_percent=100, status="completed")
-                    print(f"  [{path}] completed -> {job_id}")
-            except json.JSONDecodeError:
-                pass
-        proc.wait()
+        with span("restic.backup", package_id=job_id):
+            proc = subprocess.Popen(
+                ["restic", "backup", path, "--json"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+            )
+            last_pct = 0
+            for line in proc.stdout or []:
+                try:
+                    msg = json.loads(line)
+                    if msg.get("message_type") == "status":
+                        pct = int(msg.get("percent_done", 0) * 100)
+                        if pct > last_pct and pct <= 100:
+                            patch_package(job_id, progress_percent=pct)
+                            last_pct = pct
+                            print(f"  [{path}] {pct}%")
+                    elif msg.get("message_type") == "summary":
+                        patch_package(job_id, progress_percent=100, status="completed")
+                        print(f"  [{path}] completed -> {job_id}")
+                except json.JSONDecodeError:
+                    pass
+            proc.wait()
         if proc.returncode != 0:
             patch_package(job_id, status="failed")
             return False
@@ -160,30 +175,33 @@ def run_restic(path: str, source_id: str) -> bool:
 def run_rclone(from_path: str, to_path: str, source_id: str) -> bool:
     """Run rclone copy and report progress. Parses --progress output."""
     path_label = f"{from_path} → {to_path}"
-    job_id = post_ingest(path_label, source_id, package_type="user_data")
+    with span("register"):
+        job_id = post_ingest(path_label, source_id, package_type="user_data")
+        if job_id:
+            patch_package(job_id, status="in_progress")
     if not job_id:
         return False
-    patch_package(job_id, status="in_progress")
     # rclone copy --progress outputs "Transferred: 1.2 GiB / 5.0 GiB, 24%"
     progress_re = re.compile(r"(\d+)%")
     try:
-        proc = subprocess.Popen(
-            ["rclone", "copy", from_path, to_path, "--progress", "--stats-one-line"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-        )
-        last_pct = 0
-        for line in proc.stdout or []:
-            m = progress_re.search(line)
-            if m:
-                pct = int(m.group(1))
-                if pct > last_pct and pct <= 100:
-                    patch_package(job_id, progress_percent=pct)
-                    last_pct = pct
-                    print(f"  [{path_label}] {pct}%")
-        proc.wait()
+        with span("rclone.copy", package_id=job_id):
+            proc = subprocess.Popen(
+                ["rclone", "copy", from_path, to_path, "--progress", "--stats-one-line"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+            )
+            last_pct = 0
+            for line in proc.stdout or []:
+                m = progress_re.search(line)
+                if m:
+                    pct = int(m.group(1))
+                    if pct > last_pct and pct <= 100:
+                        patch_package(job_id, progress_percent=pct)
+                        last_pct = pct
+                        print(f"  [{path_label}] {pct}%")
+            proc.wait()
         if proc.returncode != 0:
             patch_package(job_id, status="failed")
             return False
@@ -213,19 +231,22 @@ def main() -> int:
     if tool == "mock":
         path = args.path or "backup/mock-demo"
         print(f"Mock backup: {path} (duration={args.duration}s)")
-        return 0 if run_mock(path, source_id, args.duration) else 1
+        with span("backup", tool="mock", source_id=source_id, path=path):
+            return 0 if run_mock(path, source_id, args.duration) else 1
 
     if tool == "restic":
         path = args.path or "."
         print(f"Restic backup: {path} -> {os.environ.get('RESTIC_REPOSITORY', '?')}")
-        return 0 if run_restic(path, source_id) else 1
+        with span("backup", tool="restic", source_id=source_id, path=path):
+            return 0 if run_restic(path, source_id) else 1
 
     if tool == "rclone":
         if not args.from_path or not args.to_path:
             print("rclone requires --from and --to", file=sys.stderr)
             return 1
         print(f"Rclone copy: {args.from_path} -> {args.to_path}")
-        return 0 if run_rclone(args.from_path, args.to_path, source_id) else 1
+        with span("backup", tool="rclone", source_id=source_id, path=args.from_path, destination=args.to_path):
+            return 0 if run_rclone(args.from_path, args.to_path, source_id) else 1
 
     return 1
 
@@ -24,7 +24,8 @@ Usage:
   python3 scripts/silver-fiesta.py --require rclone,restic  # fail if tools missing
   SILVER_FIESTA_REPO=~/repo/silver-fiesta python3 scripts/silver-fiesta.py --nfs-smoke
 
-Requires: rich (pip install -r scripts/requirements-text-ui.txt)
+Requires: rich for --format human (pip install -r scripts/requirements-text-ui.txt);
+it is imported on first use, so --format ai/json runs without it.
 """
 from __future__ import annotations
 
@@ -48,17 +49,8 @@ if str(_COMMON) not in sys.path:
 from edge_observability import configure_observability, emit_ai_status, log_error, log_event  # noqa: E402
 from transfer_log import TransferLog, performance_fields, sha256_file  # noqa: E402
 
-try:
-    from rich.console import Console
-    from rich.panel import Panel
-    from rich.table import Table
-    from rich import box
-except ImportError:
-    print("pip install rich (see scripts/requirements-text-ui.txt)", file=sys.stderr)
-    sys.exit(1)
-
 logger = configure_observability("silver-fiesta")
-console = Console()
+_CONSOLE = None
 
 ERROR_SOURCE = "silver-fiesta"
 SOURCE_ID = "silver-fiesta-probe"
@@ -843,7 +835,29 @@ def resolve_protocols(args: argparse.Namespace) -> list[str]:
     return names
 
 
+def _rich():
+    """The rich module, imported when human output is first rendered."""
+    try:
+        import rich.box
+        import rich.console
+        import rich.panel
+        import rich.table
+    except ImportError:
+        print("pip install rich (see scripts/requirements-text-ui.txt)", file=sys.stderr)
+        sys.exit(1)
+    return rich
+
+
+def _console():
+    global _CONSOLE
+    if _CONSOLE is None:
+        _CONSOLE = _rich().console.Console()
+    return _CONSOLE
+
+
 def render_human_table(results: list[ProtocolResult], log_path: Path, root: Path) -> None:
+    rich = _rich()
+    Table, Panel, box = rich.table.Table, rich.panel.Panel, rich.box
     table = Table(title="Silver Fiesta — transfer protocol validation", box=box.ROUNDED)
     table.add_column("Protocol", style="cyan")
     table.add_column("Setup", justify="center")
@@ -873,7 +887,7 @@ def render_human_table(results: list[ProtocolResult], log_path: Path, root: Path
         f"Transfer log: {log_path}\n"
         f"Troubleshoot: grep transfer_failed {log_path} ; grep '^EBK' (with EBK_AI_STATUS=1)"
     )
-    console.print(Panel(table, subtitle=summary))
+    _console().print(Panel(table, subtitle=summary))
 
 
 def emit_json_summary(results: list[ProtocolResult], log_path: Path, root: Path, run_id: str) -> None:
@@ -1043,13 +1057,13 @@ def main() -> int:
     protocols = resolve_protocols(args)
     unknown = [p for p in protocols if p not in ALL_PROBES]
     if unknown:
-        console.print(f"[red]Unknown protocol(s): {', '.join(unknown)}[/]")
+        _console().print(f"[red]Unknown protocol(s): {', '.join(unknown)}[/]")
         return 2
 
     results: list[ProtocolResult] = []
     for name in protocols:
         if args.format == "human":
-            console.print(f"\n[bold]Probe {name}[/]")
+            _console().print(f"\n[bold]Probe {name}[/]")
         probe = ALL_PROBES[name]
         if args.fail_protocol == name:
             result = ProtocolResult(
@@ -1065,14 +1079,14 @@ def main() -> int:
         results.append(result)
         if args.format == "human":
             if result.skipped:
-                console.print(f"  [yellow]skipped[/]: {result.skip_reason}")
+                _console().print(f"  [yellow]skipped[/]: {result.skip_reason}")
             elif result.ok:
-                console.print(
+                _console().print(
                     f"  [green]ok[/]  {result.duration_ms}ms"
                     + (f"  {result.throughput_mib_s:.2f} MiB/s" if result.throughput_mib_s else "")
                 )
             else:
-                console.print(f"  [red]fail[/]: {result.error_message}")
+                _console().print(f"  [red]fail[/]: {result.error_message}")
 
     transfer_log.append(
         "protocol_validation_completed",
@@ -1097,7 +1111,7 @@ def main() -> int:
     if args.report_dir:
         report_path = write_doctor_report(args.report_dir, results, log_path, root, run_id)
         if args.format == "human":
-            console.print(f"Doctor report: {report_path.parent}/")
+            _console().print(f"Doctor report: {report_path.parent}/")
 
     if args.format == "json":
         emit_json_summary(results, log_path, root, run_id)
@@ -1105,12 +1119,12 @@ def main() -> int:
         emit_ai_summary(results, log_path, root, run_id)
     else:
         render_human_table(results, log_path, root)
-        console.print(f"Manifest: {manifest_path}")
+        _console().print(f"Manifest: {manifest_path}")
 
     if missing_required:
         msg = "Required protocols not satisfied: " + "; ".join(missing_required)
         if args.format == "human":
-            console.print(f"[red]{msg}[/]")
+            _console().print(f"[red]{msg}[/]")
         else:
             print(msg, file=sys.stderr)
         return 2
@@ -1118,7 +1132,7 @@ def main() -> int:
     required_failures = [r for r in results if not r.skipped and not r.ok]
     if required_failures:
         if args.format == "human":
-            console.print(
+            _console().print(
                 "\n[red]Protocol validation failed.[/] "
                 "Use the transfer log and EBK lines to debug backup transfers:\n"
                 f"  EBK_LOG_FORMAT=json EBK_AI_STATUS=1 python3 scripts/silver-fiesta.py --format ai\n"
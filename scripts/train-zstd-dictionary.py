@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Train a zstd dictionary for catcher response compression from live manifests.
+
+Fetches package listings (and the journal export) from a running Catcher and
+trains on one JSON sample per package/event. Point the catcher at the output
+with ZSTD_DICT=<path>; clients opt in by sending its id in X-Zstd-Dictionary.
+
+Usage:
+  python scripts/train-zstd-dictionary.py --out /var/lib/edge-backup/manifests.zdict
+  python scripts/train-zstd-dictionary.py --size 65536 --catcher-url http://catcher:8000
+
+Requires: pip install requests zstandard
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+try:
+    import requests
+except ImportError:
+    print("pip install requests", file=sys.stderr)
+    sys.exit(1)
+
+from compression import train_zstd_dictionary, zstandard  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--catcher-url", default=os.environ.get("CATCHER_URL", "http://127.0.0.1:8000"))
+    parser.add_argument("--out", type=Path, default=Path("manifests.zdict"))
+    parser.add_argument("--size", type=int, default=110 * 1024, help="dictionary size in bytes")
+    args = parser.parse_args()
+    if zstandard is None:
+        print("pip install zstandard", file=sys.stderr)
+        return 1
+
+    base = args.catcher_url.rstrip("/")
+    packages = requests.get(f"{base}/api/v1/packages", timeout=60).json()
+    events = requests.get(f"{base}/api/v1/journal/export", timeout=60).json().get("events", [])
+    samples = [json.dumps(item, separators=(",", ":")).encode() for item in [*packages, *events]]
+    if len(samples) < 100:
+        print(f"only {len(samples)} samples; ingest more packages before training", file=sys.stderr)
+        return 1
+    args.out.write_bytes(train_zstd_dictionary(samples, size=args.size))
+    print(f"wrote {args.out} ({args.size} bytes max) from {len(samples)} samples")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
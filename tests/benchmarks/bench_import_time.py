@@ -0,0 +1,131 @@
+"""Cold-start guard: import cost of the client entry points, from ``-X importtime``.
+
+Run from the repo root:
+
+    python tests/benchmarks/bench_import_time.py [--repeat 5] [--budget-ms 60] [--top 8] [--json out.json]
+
+Dependency-free. Each entry point (``backup-agent.py commands``,
+``silver-fiesta.py --help``, ``import watch_and_ingest``, ``import common``)
+runs ``--repeat`` times in a fresh interpreter with ``-X importtime`` after
+one warm-up run (so bytecode caches are hot). Per entry point it reports the
+best wall time, the import time above a bare ``python -c pass`` (top-level
+imports that the bare interpreter does not also load), the heaviest of those
+imports (and their direct children), and whether any optional heavy dependency (requests, rich,
+OpenTelemetry, orjson) was loaded. Exits 1 when an entry point's import time
+exceeds ``--budget-ms``, so it can gate CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+HEAVY = ("requests", "rich", "opentelemetry", "orjson")
+ENTRY_POINTS = {
+    "backup-agent commands": [str(ROOT / "scripts" / "backup-agent.py"), "commands", "--format", "ai"],
+    "silver-fiesta --help": [str(ROOT / "scripts" / "silver-fiesta.py"), "--help"],
+    "import watch_and_ingest": [
+        "-c",
+        f"import sys; sys.path.insert(0, {str(ROOT / 'clients' / 'docker-client')!r}); import watch_and_ingest",
+    ],
+    "import common": [
+        "-c",
+        f"import sys; sys.path[:0] = {[str(ROOT / 'clients'), str(ROOT / 'clients' / 'common')]!r}; import common",
+    ],
+}
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """(self µs, cumulative µs, indented module name) rows, in import order."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(own), int(cumulative), name[1:].rstrip()))
+    return rows
+
+
+def run_once(args: list[str]) -> tuple[float, list[tuple[int, int, str]]]:
+    env = {**os.environ, "EBK_AI_STATUS": "0"}
+    env.pop("OTEL_EXPORTER_OTLP_ENDPOINT", None)
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], capture_output=True, text=True, cwd=str(ROOT), env=env, check=False
+    )
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise SystemExit(f"{' '.join(args)} exited {proc.returncode}:\n{proc.stderr[-2000:]}")
+    return elapsed, parse_importtime(proc.stderr)
+
+
+def _depth(name: str) -> int:
+    return (len(name) - len(name.lstrip(" "))) // 2
+
+
+def measure(args: list[str], baseline: set[str], repeat: int) -> dict:
+    run_once(args)
+    best_wall, best_import, best_rows = float("inf"), float("inf"), []
+    for _ in range(repeat):
+        wall, rows = run_once(args)
+        best_wall = min(best_wall, wall)
+        total = sum(cumulative for _, cumulative, name in rows if _depth(name) == 0 and name not in baseline)
+        if total < best_import:
+            best_import, best_rows = total, rows
+    loaded = {name.strip() for _, _, name in best_rows}
+    # top-level imports and their direct children, so ``-c "import x"`` shows what x pulls in
+    heaviest = sorted(
+        (
+            (cumulative, name.rstrip())
+            for _, cumulative, name in best_rows
+            if _depth(name) <= 1 and name.strip() not in baseline
+        ),
+        reverse=True,
+    )
+    return {
+        "wall_ms": round(best_wall * 1000, 1),
+        "import_ms": round(best_import / 1000, 1),
+        "heaviest": [(name, round(cumulative / 1000, 1)) for cumulative, name in heaviest],
+        "heavy_loaded": sorted(h for h in HEAVY if any(n == h or n.startswith(h + ".") for n in loaded)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=60.0, help="max import time per entry point")
+    parser.add_argument("--top", type=int, default=8, help="heaviest imports to list per entry point")
+    parser.add_argument("--json", type=Path, help="also write results as JSON")
+    args = parser.parse_args()
+
+    _, bare = run_once(["-c", "pass"])
+    baseline = {name.strip() for _, _, name in bare}
+    results = {label: measure(argv, baseline, args.repeat) for label, argv in ENTRY_POINTS.items()}
+
+    over = []
+    print(f"best of {args.repeat}, budget {args.budget_ms:.0f} ms of imports per entry point")
+    print(f"{'entry point':<26}{'wall ms':>10}{'import ms':>11}  heavy deps loaded")
+    for label, result in results.items():
+        heavy = ", ".join(result["heavy_loaded"]) or "-"
+        print(f"{label:<26}{result['wall_ms']:>10.1f}{result['import_ms']:>11.1f}  {heavy}")
+        if result["import_ms"] > args.budget_ms:
+            over.append(label)
+    for label, result in results.items():
+        print(f"\n{label}:")
+        for name, ms in result["heaviest"][: args.top]:
+            print(f"  {ms:>8.1f} ms  {name}")
+    if args.json:
+        args.json.write_text(json.dumps({"repeat": args.repeat, "budget_ms": args.budget_ms, **results}, indent=2) + "\n")
+    if over:
+        print(f"\nover budget: {', '.join(over)}", file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
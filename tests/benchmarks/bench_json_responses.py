@@ -0,0 +1,94 @@
+"""Benchmark: default FastAPI JSON pipeline vs FastJSONResponse for bulk listings.
+
+Run from the repo root:
+
+    python tests/benchmarks/bench_json_responses.py [--count 100000] [--repeat 3]
+
+"default" mirrors what FastAPI does for ``response_model=list`` routes
+(response-model validation, ``jsonable_encoder``, ``json.dumps``); "fast" is
+``FastJSONResponse`` (orjson when installed, stdlib fallback otherwise).
+Reports best-of-N wall time and tracemalloc peak per path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+import responses  # noqa: E402
+
+
+def make_packages(count: int) -> list[dict]:
+    return [
+        {
+            "job_id": f"job-{i}",
+            "package_id": f"job-{i}",
+            "source_id": f"engine-{i % 50}",
+            "path": f"local/station-{i % 200}/2026/10/{i:08d}.tar.zst",
+            "checksum": f"{i:064x}",
+            "size_bytes": 1024 * (i % 4096),
+            "status": ("pending", "in_progress", "completed")[i % 3],
+            "progress_percent": i % 101,
+            "package_type": "user_data",
+            "created_at": "2026-10-19T00:00:00+00:00",
+            "updated_at": "2026-10-19T00:05:00+00:00",
+            "age_days": i % 30,
+            "bucket": ("hot", "warm", "cold", "offsite")[i % 4],
+            "tier": ("hot", "warm", "cold", "offsite")[i % 4],
+            "retry_count": 0,
+        }
+        for i in range(count)
+    ]
+
+
+def render_default(packages: list[dict]) -> bytes:
+    validated = TypeAdapter(list).validate_python(packages)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def render_fast(packages: list[dict]) -> bytes:
+    return responses.FastJSONResponse(packages).body
+
+
+def measure(fn, packages: list[dict], repeat: int) -> tuple[float, int, int]:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(fn(packages))
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn(packages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    packages = make_packages(args.count)
+    backend = "orjson" if responses.orjson is not None else "stdlib json"
+    print(f"{args.count} packages, FastJSONResponse backend: {backend}")
+    results = {}
+    for name, fn in (("default", render_default), ("fast", render_fast)):
+        seconds, peak, size = measure(fn, packages, args.repeat)
+        results[name] = seconds
+        print(f"{name:>8}: {seconds * 1000:9.1f} ms  peak {peak / 2**20:8.1f} MiB  body {size / 2**20:6.1f} MiB")
+    print(f" speedup: {results['default'] / results['fast']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
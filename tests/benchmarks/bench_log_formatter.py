@@ -0,0 +1,124 @@
+"""Microbenchmark: structured log formatting throughput (lines per second).
+
+Run from the repo root:
+
+    python tests/benchmarks/bench_log_formatter.py [--records 20000] [--repeat 5] [--json out.json]
+
+Builds a mix of typical records through ``log_event`` (upload progress with
+details) and ``log_error`` (a failed hop with a traceback), then formats each
+one with ``StructuredFormatter`` and ``FastStructuredFormatter`` (stdlib json,
+and orjson when installed). Before timing, every formatter's output is checked
+to parse to the reference payload. Reports best-of-N lines/sec per record kind
+and overall.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "clients" / "common"))
+
+import edge_observability  # noqa: E402
+from edge_observability import FastStructuredFormatter, StructuredFormatter, log_error, log_event  # noqa: E402
+
+
+class _Capture(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def build_records(count: int) -> dict[str, list[logging.LogRecord]]:
+    capture = _Capture()
+    logger = logging.getLogger("bench-log-formatter")
+    logger.handlers = [capture]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    for i in range(count):
+        log_event(
+            logger,
+            logging.INFO,
+            "upload in_progress",
+            event_type="client_upload",
+            command="upload",
+            source_id=f"engine-{i % 50}",
+            path=f"local/Documents/{i}.pdf",
+            package_type="user_data",
+            status="in_progress",
+            job_id=f"job-{i}",
+            station_id="nas",
+            details={"progress_percent": i % 100, "message": "copying to nas"},
+        )
+    events = capture.records
+    capture.records = []
+    edge_observability.AI_STATUS_ENABLED = False  # log_error also emits an EBK line
+    for i in range(count):
+        try:
+            raise OSError(f"checksum mismatch for hop {i}")
+        except OSError as exc:
+            log_error(
+                logger,
+                "hop failed",
+                event_type="transfer_failed",
+                error_source="home-backup-chain",
+                operation="copy_hop:nas",
+                exc=exc,
+                source_id=f"engine-{i % 50}",
+                path=f"local/Documents/{i}.pdf",
+            )
+    errors = capture.records
+    for record in errors:  # as a queue handler would hand them over
+        record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+    return {"log_event": events, "log_error": errors, "mixed": [r for pair in zip(events, errors) for r in pair]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", type=Path, help="also write results as JSON")
+    args = parser.parse_args()
+
+    formatters = {
+        "StructuredFormatter": StructuredFormatter(),
+        "Fast[json]": FastStructuredFormatter(use_orjson=False),
+    }
+    if edge_observability._load_orjson() is not None:
+        formatters["Fast[orjson]"] = FastStructuredFormatter(use_orjson=True)
+    kinds = build_records(args.records)
+
+    reference = formatters["StructuredFormatter"]
+    for name, formatter in formatters.items():
+        for record in kinds["mixed"][:200]:
+            if json.loads(formatter.format(record)) != json.loads(reference.format(record)):
+                raise SystemExit(f"{name} output differs from StructuredFormatter")
+
+    results: dict[str, dict[str, float]] = {}
+    for name, formatter in formatters.items():
+        fmt = formatter.format
+        results[name] = {}
+        for kind, records in kinds.items():
+            best = min(timeit.repeat(lambda: [fmt(r) for r in records], number=1, repeat=args.repeat))
+            results[name][kind] = len(records) / best
+
+    print(f"{args.records} records per kind, best of {args.repeat} (lines/sec)")
+    print(f"{'formatter':<22}" + "".join(f"{kind:>14}" for kind in kinds) + f"{'speedup':>10}")
+    base = results["StructuredFormatter"]["mixed"]
+    for name, row in results.items():
+        cells = "".join(f"{row[kind]:>14,.0f}" for kind in kinds)
+        print(f"{name:<22}{cells}{row['mixed'] / base:>9.2f}x")
+    if args.json:
+        args.json.write_text(json.dumps({"records": args.records, "repeat": args.repeat, **results}, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Microbenchmarks: retention/enrichment helpers and the per-request aggregation loops.
+
+Run from the repo root:
+
+    python tests/benchmarks/bench_retention_hot_paths.py [--count 20000] [--repeat 5] [--json out.json]
+
+Dependency-free (``timeit``). For DEMO_MODE off and on, a fresh catcher is
+loaded and seeded with ``--count`` manifests of mixed package types, tags,
+ages and stations. Helpers (``_age_seconds``, ``_tag_to_package_type``,
+``_station_from_path``, ``_stops_to_boundaries``, ``_get_boundaries``,
+``_bucket_for_age``, ``_enrich_job``) are timed over every seeded job and
+reported as best-of-N ns per call; the aggregation routes (``get_status``,
+``list_buckets``, ``get_projections``) are reported as ms per request.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[2] / "backend"
+PACKAGE_TYPES = ("user_data", "app_logs", "audit_logs", "business_data", "job_package", "cache", None)
+TAGS = ("backup", "audit", "cache", None)
+STATIONS = ("local", "nas", "s3", "offsite", None)
+
+
+def load_main(demo: bool):
+    os.environ["LOG_LEVEL"] = "WARNING"
+    os.environ["DEMO_MODE"] = "1" if demo else "0"
+    os.environ.pop("DATABASE_URL", None)
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, "__file__", None) or ""
+        if module_file and Path(module_file).resolve().parent == BACKEND:
+            del sys.modules[name]
+    if str(BACKEND) not in sys.path:
+        sys.path.insert(0, str(BACKEND))
+    return importlib.import_module("main")
+
+
+def seed(main, count: int, demo: bool) -> list[dict]:
+    """Mixed manifests spread over every bucket (ages in seconds when ``demo``)."""
+    now = datetime.now(timezone.utc)
+    span = timedelta(seconds=300) if demo else timedelta(days=4000)
+    jobs = []
+    for i in range(count):
+        job_id = f"job-{i + 1}"
+        station = STATIONS[i % len(STATIONS)]
+        created = (now - span * ((i * 7919) % 1000) / 1000).isoformat()
+        job = {
+            "job_id": job_id,
+            "source_id": f"engine-{i % 50}",
+            "path": f"{station}/dir-{i % 97}/{i}.dat" if station else f"{i}.dat",
+            "status": ("pending", "in_progress", "completed")[i % 3],
+            "size_bytes": 4096 * (i % 1000),
+            "checksum": f"{i:064x}",
+            "created_at": created,
+            "updated_at": created,
+            "tag": TAGS[i % len(TAGS)],
+            "package_type": PACKAGE_TYPES[i % len(PACKAGE_TYPES)],
+        }
+        main.STATE.set_job(job_id, job)
+        jobs.append(job)
+    return jobs
+
+
+def per_call_ns(fn, inputs: list, repeat: int) -> float:
+    """Best-of-``repeat`` time for one pass over ``inputs``, in ns per call."""
+    best = min(timeit.repeat(lambda: [fn(x) for x in inputs], number=1, repeat=repeat))
+    return best / len(inputs) * 1e9
+
+
+def per_request_ms(fn, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def run(demo: bool, count: int, repeat: int) -> dict:
+    main = load_main(demo)
+    jobs = seed(main, count, demo)
+    ages = [main._age_seconds(j["created_at"]) for j in jobs]
+    if not demo:
+        ages = [age // 86400 for age in ages]
+    ptypes = [j["package_type"] or main._tag_to_package_type(j["tag"]) for j in jobs]
+    rules = [main._get_rule_set(p) for p in ptypes]
+    bucket_fields = main._BUCKET_FIELDS
+
+    helpers = {
+        "_age_seconds": per_call_ns(main._age_seconds, [j["created_at"] for j in jobs], repeat),
+        "_tag_to_package_type": per_call_ns(main._tag_to_package_type, [j["tag"] for j in jobs], repeat),
+        "_station_from_path": per_call_ns(main._station_from_path, [j["path"] for j in jobs], repeat),
+        "_stops_to_boundaries": per_call_ns(main._stops_to_boundaries, rules, repeat),
+        "_get_boundaries": per_call_ns(main._get_boundaries, ptypes, repeat),
+        "_bucket_for_age": per_call_ns(lambda pair: main._bucket_for_age(*pair), list(zip(ages, ptypes)), repeat),
+        "_enrich_job": per_call_ns(main._enrich_job, jobs, repeat),
+        "_enrich_job[bucket]": per_call_ns(lambda j: main._enrich_job(j, bucket_fields), jobs, repeat),
+    }
+    routes = {
+        "get_status": per_request_ms(main.get_status, repeat),
+        "list_buckets": per_request_ms(main.list_buckets, repeat),
+        "get_projections": per_request_ms(main.get_projections, repeat),
+    }
+    return {"helpers_ns_per_call": helpers, "routes_ms_per_request": routes}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", type=Path, help="also write results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for demo in (False, True):
+        label = "demo" if demo else "days"
+        results[label] = run(demo, args.count, args.repeat)
+    print(f"{args.count} jobs, best of {args.repeat}")
+    print(f"{'helper (ns/call)':<24}{'days':>12}{'demo':>12}")
+    for name in results["days"]["helpers_ns_per_call"]:
+        row = [results[label]["helpers_ns_per_call"][name] for label in ("days", "demo")]
+        print(f"{name:<24}{row[0]:>12.0f}{row[1]:>12.0f}")
+    print(f"{'route (ms/request)':<24}{'days':>12}{'demo':>12}")
+    for name in results["days"]["routes_ms_per_request"]:
+        row = [results[label]["routes_ms_per_request"][name] for label in ("days", "demo")]
+        print(f"{name:<24}{row[0]:>12.1f}{row[1]:>12.1f}")
+    if args.json:
+        args.json.write_text(json.dumps({"count": args.count, "repeat": args.repeat, **results}, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""Load test: a seeded catcher under N concurrent engines, with JSON baselines.
+
+Run from the repo root:
+
+    python tests/benchmarks/load_catcher.py --sizes 10000,100000 --storage memory,sqlite \\
+        --transport testclient,uvicorn --engines 16 --requests 400 --output baseline.json
+    python tests/benchmarks/load_catcher.py ... --baseline baseline.json [--max-regression 20]
+
+Each (transport, storage, size) case seeds a fresh dispatcher with synthetic
+manifests (mixed package types, ages and statuses over 100 sources), then
+drives ``ingest``, ``list_jobs`` (one engine's packages) and ``get_status``
+with ``--engines`` concurrent simulated engines: threads over
+``fastapi.testclient``, or an asyncio/httpx load generator against a real
+local uvicorn process. Per endpoint it reports throughput, p50/p95/p99
+latency and the server's RSS. ``--baseline`` diffs against an earlier
+``--output`` file and exits 1 when a p95 latency or a throughput regresses by
+more than ``--max-regression`` percent. 1M-manifest runs (``--sizes
+1000000``) need several GB of RAM and minutes of seeding.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[2] / "backend"
+PACKAGE_TYPES = ("user_data", "app_logs", "audit_logs", "business_data", "job_package", "cache")
+STATUSES = ("pending", "in_progress", "completed", "completed", "failed")
+SOURCES = 100
+ENDPOINTS = ("ingest", "list_jobs", "get_status")
+# (metric, higher is worse, gates --max-regression)
+METRICS = (("throughput_rps", False, True), ("p50_ms", True, False), ("p95_ms", True, True), ("p99_ms", True, False))
+
+
+def load_main(storage: str, data_dir: Path):
+    """Import a fresh catcher app configured for ``storage`` (memory | sqlite)."""
+    os.environ["LOG_LEVEL"] = "WARNING"
+    os.environ.pop("DEMO_MODE", None)
+    if storage == "sqlite":
+        os.environ["DATABASE_URL"] = f"sqlite:///{data_dir / 'catcher.db'}"
+    else:
+        os.environ.pop("DATABASE_URL", None)
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, "__file__", None) or ""
+        if module_file and Path(module_file).resolve().parent == BACKEND:
+            del sys.modules[name]
+    if str(BACKEND) not in sys.path:
+        sys.path.insert(0, str(BACKEND))
+    return importlib.import_module("main")
+
+
+def seed(main, count: int) -> float:
+    """Insert ``count`` synthetic manifests with one storage write; return seconds taken."""
+    started = time.perf_counter()
+    now = datetime.now(timezone.utc)
+    state = main.STATE
+    with state.batched():
+        for i in range(count):
+            job_id = state.reserve_job_id()
+            source_id = f"engine-{i % SOURCES}"
+            created = (now - timedelta(days=i % 800, seconds=i % 86400)).isoformat()
+            state.set_job(
+                job_id,
+                {
+                    "job_id": job_id,
+                    "source_id": source_id,
+                    "path": f"local/station-{i % 200}/{i // 1000}/{i:08d}.dat",
+                    "status": STATUSES[i % len(STATUSES)],
+                    "progress_percent": (i * 7) % 101,
+                    "size_bytes": 1024 * (i % 4096),
+                    "checksum": f"{i:064x}",
+                    "created_at": created,
+                    "updated_at": created,
+                    "tag": None,
+                    "package_type": PACKAGE_TYPES[i % len(PACKAGE_TYPES)],
+                },
+            )
+        for n in range(SOURCES):
+            state.touch_source(f"engine-{n}", now.isoformat())
+    state.flush()
+    return time.perf_counter() - started
+
+
+def rss_mb(pid: int | None = None) -> float | None:
+    try:
+        for line in Path(f"/proc/{pid or 'self'}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if pid is None:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    return None
+
+
+def request_for(endpoint: str, engine: int, n: int) -> tuple[str, str, dict]:
+    """(method, path, kwargs) for the ``n``-th call by simulated ``engine``."""
+    source_id = f"engine-{engine % SOURCES}"
+    if endpoint == "ingest":
+        path = f"local/load/{engine}/{n}-{time.monotonic_ns()}.dat"
+        body = {"source_id": source_id, "path": path, "checksum": path, "size_bytes": 4096}
+        return "POST", "/api/v1/ingest", {"json": body}
+    if endpoint == "list_jobs":
+        return "GET", "/api/v1/packages", {"params": {"source_id": source_id, "fields": "job_id,status,bucket"}}
+    return "GET", "/api/v1/status", {}
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float, rss: float | None) -> dict:
+    ordered = sorted(latencies)
+
+    def pct(q: float) -> float | None:
+        if not ordered:
+            return None
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "rss_mb": rss,
+    }
+
+
+def drive_testclient(client, endpoint: str, engines: int, total: int) -> dict:
+    per_engine = max(1, total // engines)
+
+    def engine_loop(engine: int) -> tuple[list[float], int]:
+        latencies, errors = [], 0
+        for n in range(per_engine):
+            method, path, kwargs = request_for(endpoint, engine, n)
+            started = time.perf_counter()
+            response = client.request(method, path, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            errors += response.status_code >= 400
+        return latencies, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=engines) as pool:
+        results = list(pool.map(engine_loop, range(engines)))
+    elapsed = time.perf_counter() - started
+    latencies = [value for lat, _ in results for value in lat]
+    return summarize(latencies, sum(err for _, err in results), elapsed, rss_mb())
+
+
+async def _drive_http(base_url: str, endpoint: str, engines: int, total: int) -> tuple[list[float], int, float]:
+    import httpx
+
+    per_engine = max(1, total // engines)
+    latencies: list[float] = []
+    errors = 0
+
+    async def engine_loop(client, engine: int) -> None:
+        nonlocal errors
+        for n in range(per_engine):
+            method, path, kwargs = request_for(endpoint, engine, n)
+            started = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            errors += response.status_code >= 400
+
+    limits = httpx.Limits(max_connections=engines)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(engine_loop(client, engine) for engine in range(engines)))
+        return latencies, errors, time.perf_counter() - started
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run_uvicorn_case(storage: str, size: int, engines: int, total: int) -> dict:
+    import httpx
+
+    port = _free_port()
+    cmd = [sys.executable, __file__, "--serve", "--storage", storage, "--sizes", str(size), "--port", str(port)]
+    server = subprocess.Popen(cmd)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        started = time.perf_counter()
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with {server.returncode}")
+            try:
+                if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        case = {"startup_seconds": round(time.perf_counter() - started, 3), "rss_mb_seeded": rss_mb(server.pid)}
+        case["endpoints"] = {}
+        for endpoint in ENDPOINTS:
+            latencies, errors, elapsed = asyncio.run(_drive_http(base_url, endpoint, engines, total))
+            case["endpoints"][endpoint] = summarize(latencies, errors, elapsed, rss_mb(server.pid))
+        return case
+    finally:
+        server.terminate()
+        server.wait(30)
+
+
+def run_testclient_case(storage: str, size: int, engines: int, total: int) -> dict:
+    from fastapi.testclient import TestClient
+
+    with tempfile.TemporaryDirectory() as tmp:
+        main = load_main(storage, Path(tmp))
+        seconds = seed(main, size)
+        case = {"seed_seconds": round(seconds, 3), "rss_mb_seeded": rss_mb(), "endpoints": {}}
+        with TestClient(main.app) as client:
+            for endpoint in ENDPOINTS:
+                case["endpoints"][endpoint] = drive_testclient(client, endpoint, engines, total)
+        return case
+
+
+def serve(storage: str, size: int, port: int) -> None:
+    import uvicorn
+
+    with tempfile.TemporaryDirectory() as tmp:
+        main = load_main(storage, Path(tmp))
+        seed(main, size)
+        uvicorn.run(main.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def compare(current: dict, baseline: dict, max_regression: float) -> list[str]:
+    """Print per-endpoint deltas; return the regressions beyond ``max_regression`` percent."""
+    regressions = []
+    for case, result in current["cases"].items():
+        base_case = baseline.get("cases", {}).get(case)
+        if base_case is None:
+            print(f"{case}: no baseline")
+            continue
+        for endpoint, stats in result["endpoints"].items():
+            base = base_case["endpoints"].get(endpoint)
+            if not base:
+                continue
+            parts = []
+            for metric, higher_is_worse, gated in METRICS:
+                old, new = base.get(metric), stats.get(metric)
+                if not old or new is None:
+                    continue
+                change = (new - old) / old * 100
+                parts.append(f"{metric} {old:g} -> {new:g} ({change:+.1f}%)")
+                worse = change if higher_is_worse else -change
+                if gated and worse > max_regression:
+                    regressions.append(f"{case} {endpoint} {metric} {change:+.1f}%")
+            print(f"{case} {endpoint}: " + ", ".join(parts))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000", help="comma-separated seed sizes (e.g. 10000,100000,1000000)")
+    parser.add_argument("--storage", default="memory,sqlite", help="memory and/or sqlite")
+    parser.add_argument("--transport", default="testclient", help="testclient and/or uvicorn")
+    parser.add_argument("--engines", type=int, default=8, help="concurrent simulated engines")
+    parser.add_argument("--requests", type=int, default=400, help="requests per endpoint per case")
+    parser.add_argument("--output", type=Path, help="write results JSON here (use as a later --baseline)")
+    parser.add_argument("--baseline", type=Path, help="results JSON from an earlier run to diff against")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="percent; exit 1 beyond this")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    storages = [s for s in args.storage.split(",") if s]
+    if args.serve:
+        serve(storages[0], sizes[0], args.port)
+        return 0
+
+    results = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "engines": args.engines,
+            "requests": args.requests,
+        },
+        "cases": {},
+    }
+    for transport in [t for t in args.transport.split(",") if t]:
+        for storage in storages:
+            for size in sizes:
+                case = f"{transport}/{storage}/{size}"
+                print(f"running {case} ...", flush=True)
+                runner = run_uvicorn_case if transport == "uvicorn" else run_testclient_case
+                results["cases"][case] = runner(storage, size, args.engines, args.requests)
+                for endpoint, stats in results["cases"][case]["endpoints"].items():
+                    print(
+                        f"  {endpoint:<10} {stats['throughput_rps']:>9} req/s  p50 {stats['p50_ms']} ms  "
+                        f"p95 {stats['p95_ms']} ms  p99 {stats['p99_ms']} ms  rss {stats['rss_mb']} MB  "
+                        f"errors {stats['errors']}"
+                    )
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.max_regression)
+        if regressions:
+            print("regressions over threshold:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
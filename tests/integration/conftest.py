@@ -0,0 +1,44 @@
+"""Shared fixtures for catcher integration tests."""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+BACKEND = Path(__file__).resolve().parents[2] / "backend"
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+
+def _drop_backend_modules() -> None:
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, "__file__", None) or ""
+        if module_file and Path(module_file).resolve().parent == BACKEND:
+            sys.modules.pop(name, None)
+
+
+@pytest.fixture()
+def load_catcher(tmp_path: Path, monkeypatch):
+    """Return a loader that imports a fresh catcher app with the given env overrides."""
+
+    def _load(persist: bool = False, **env: str):
+        monkeypatch.delenv("DEMO_MODE", raising=False)
+        if persist:
+            monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'catcher.db'}")
+        else:
+            monkeypatch.delenv("DATABASE_URL", raising=False)
+        # Background log/EBK threads are process-global; keep emission synchronous
+        # so it does not leak into later tests' output capture.
+        env.setdefault("LOG_QUEUE", "0")
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+        _drop_backend_modules()
+        main = importlib.import_module("main")
+        return TestClient(main.app), main
+
+    yield _load
+    _drop_backend_modules()
@@ -0,0 +1,53 @@
+"""Integration tests for filtered bulk package deletion."""
+
+from __future__ import annotations
+
+import pytest
+
+
+def _ingest(client, path: str, size: int, secs_ago: int, package_type: str, source_id: str = "laptop") -> str:
+    resp = client.post(
+        "/api/v1/ingest",
+        json={
+            "source_id": source_id,
+            "path": path,
+            "checksum": path,
+            "size_bytes": size,
+            "package_type": package_type,
+        },
+        headers={"X-Demo-Created-Secs-Ago": str(secs_ago)},
+    )
+    return resp.json()["job_id"]
+
+
+@pytest.mark.parametrize("shared", ["0", "1"])
+def test_delete_by_filter_is_one_summarized_event(load_catcher, shared):
+    client, main = load_catcher(persist=shared == "1", DEMO_MODE="1", SHARED_STATE=shared)
+    old = [_ingest(client, f"local/cache/{i}.tmp", 10, 500, "cache") for i in range(5)]
+    _ingest(client, "local/cache/new.tmp", 10, 0, "cache")
+    _ingest(client, "local/docs/a.txt", 99, 500, "user_data")
+    _ingest(client, "local/cache/phone.tmp", 10, 500, "cache", source_id="phone")
+
+    resp = client.delete("/api/v1/packages", params={"package_type": "cache", "older_than": 100, "source_id": "laptop"})
+    assert resp.json() == {
+        "deleted": 5,
+        "freed_bytes": 50,
+        "by_package_type": {"cache": 5},
+        "job_id_ranges": [f"{old[0]}..{old[-1]}"],
+    }
+    events = client.get("/api/v1/journal", params={"event_type": "manifests_deleted"}).json()
+    assert len(events) == 1 and events[0]["details"]["count"] == 5
+    assert client.get("/api/v1/status").json()["components"]["deleted_count"] == 5
+    remaining = {p["path"] for p in client.get("/api/v1/packages").json()}
+    assert remaining == {"local/cache/new.tmp", "local/docs/a.txt", "local/cache/phone.tmp"}
+
+
+def test_delete_by_bucket_and_requires_a_filter(load_catcher):
+    client, _main = load_catcher(DEMO_MODE="1")
+    _ingest(client, "local/docs/hot.txt", 1, 0, "user_data")
+    old = _ingest(client, "local/docs/offsite.txt", 1, 10_000, "user_data")
+    assert client.delete("/api/v1/packages").status_code == 400
+    resp = client.delete("/api/v1/packages", params={"package_type": "user_data", "bucket": "offsite"}).json()
+    assert resp["job_id_ranges"] == [old]
+    assert client.delete("/api/v1/packages", params={"bucket": "offsite"}).json()["deleted"] == 0
+    assert [p["path"] for p in client.get("/api/v1/packages").json()] == ["local/docs/hot.txt"]
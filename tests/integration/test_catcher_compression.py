@@ -0,0 +1,80 @@
+"""Integration tests for negotiated response compression."""
+
+from __future__ import annotations
+
+import gzip
+import sys
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+
+def _seed(client, count: int) -> None:
+    for i in range(count):
+        client.post(
+            "/api/v1/ingest",
+            json={
+                "source_id": f"engine-{i % 4}",
+                "path": f"local/station-{i % 10}/2026/10/archive-{i:05d}.tar",
+                "checksum": f"{i:064x}",
+                "size_bytes": 4096,
+            },
+        )
+
+
+def test_large_listing_is_gzipped_tenfold(load_catcher):
+    client, _main = load_catcher()
+    _seed(client, 300)
+    resp = client.get("/api/v1/packages", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert len(resp.json()) == 300
+    assert resp.num_bytes_downloaded * 10 <= len(resp.content)
+
+
+def test_small_unlisted_or_unaccepted_responses_pass_through(load_catcher):
+    client, _main = load_catcher()
+    _seed(client, 300)
+    assert "content-encoding" not in client.get("/api/v1/packages?bucket=cold", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/api/v1/packages", headers={"Accept-Encoding": "identity"}).headers
+    assert "content-encoding" not in client.get("/api/v1/status", headers={"Accept-Encoding": "gzip"}).headers
+
+
+def test_streaming_responses_are_compressed_per_chunk(load_catcher):
+    load_catcher()
+    compression = sys.modules["compression"]
+
+    async def stream(_request):
+        return StreamingResponse((b'{"path":"local/a"},' * 200 for _ in range(3)), media_type="application/json")
+
+    app = Starlette(routes=[Route("/stream", stream)])
+    app.add_middleware(compression.CompressionMiddleware, paths=("/stream",), minimum_size=10)
+    with TestClient(app).stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as resp:
+        raw = b"".join(resp.iter_raw())
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "content-length" not in resp.headers
+    assert gzip.decompress(raw) == b'{"path":"local/a"},' * 600
+
+
+def test_zstd_dictionary_negotiation(load_catcher, tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    load_catcher()
+    compression = sys.modules["compression"]
+    samples = [f'{{"source_id":"engine-{i % 4}","path":"local/station-{i}/a.tar"}}'.encode() for i in range(2000)]
+    dictionary = compression.train_zstd_dictionary(samples, size=4096)
+    dict_path = tmp_path / "manifests.zdict"
+    dict_path.write_bytes(dictionary)
+    client, main = load_catcher(ZSTD_DICT=str(dict_path), COMPRESSION_MIN_SIZE="1")
+    _seed(client, 20)
+    dict_id = zstandard.ZstdCompressionDict(dictionary).dict_id()
+    headers = {"Accept-Encoding": "zstd", compression.DICTIONARY_HEADER: str(dict_id)}
+    with client.stream("GET", "/api/v1/packages", headers=headers) as resp:
+        raw = b"".join(resp.iter_raw())
+    assert resp.headers["content-encoding"] == "zstd"
+    assert resp.headers[compression.DICTIONARY_HEADER] == str(dict_id)
+    decompressor = zstandard.ZstdDecompressor(dict_data=zstandard.ZstdCompressionDict(dictionary))
+    body = decompressor.decompressobj().decompress(raw)
+    assert len(main.json.loads(body)) == 20
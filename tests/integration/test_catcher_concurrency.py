@@ -0,0 +1,74 @@
+"""Concurrency tests for sharded dispatcher state."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+def test_sharded_dict_keeps_insertion_order(load_catcher):
+    _client, _main = load_catcher()
+    from concurrency import ShardedDict
+
+    data = ShardedDict(shards=4)
+    for i in range(50):
+        data[f"job-{i}"] = {"n": i}
+    data["job-3"] = {"n": 333}
+    del data["job-7"]
+    keys = list(data)
+    assert keys[:4] == ["job-0", "job-1", "job-2", "job-3"]
+    assert "job-7" not in keys and len(keys) == 49
+    assert data.snapshot()["job-3"] == {"n": 333}
+
+
+@pytest.mark.parametrize("shared", ["0", "1"])
+def test_concurrent_ingest_and_patch_keep_ids_and_journal_consistent(load_catcher, shared):
+    client, main = load_catcher(persist=True, STATE_SHARDS="8", SHARED_STATE=shared)
+
+    def worker(n: int) -> list[str]:
+        ids = []
+        for i in range(25):
+            resp = client.post(
+                "/api/v1/ingest",
+                json={"source_id": f"engine-{n % 3}", "path": f"local/{n}/{i}.bin", "checksum": f"{n}-{i}", "size_bytes": 1},
+            )
+            job_id = resp.json()["job_id"]
+            client.patch(f"/api/v1/packages/{job_id}", json={"status": "completed"})
+            ids.append(job_id)
+        return ids
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = [job_id for ids in pool.map(worker, range(8)) for job_id in ids]
+
+    assert len(results) == len(set(results)) == 200
+    assert len(main.JOBS) == 200
+    assert all(main.JOBS[job_id]["status"] == "completed" for job_id in results)
+    event_numbers = [int(event["event_id"].removeprefix("evt-")) for event in main.JOURNAL]
+    assert event_numbers == sorted(event_numbers)
+    assert len(event_numbers) == len(set(event_numbers))
+
+
+def test_scanning_routes_do_not_block_the_event_loop(load_catcher, monkeypatch):
+    client, main = load_catcher()
+    client.post("/api/v1/ingest", json={"source_id": "laptop", "path": "a.txt", "checksum": "a", "size_bytes": 1})
+    entered, release = threading.Event(), threading.Event()
+    enrich = main._enrich_job
+
+    def slow_enrich(job, fields=None):
+        entered.set()
+        release.wait(5)
+        return enrich(job, fields)
+
+    monkeypatch.setattr(main, "_enrich_job", slow_enrich)
+    # One portal (event loop) for both requests, as under a real server.
+    with client, ThreadPoolExecutor(max_workers=2) as pool:
+        listing = pool.submit(client.get, "/api/v1/packages")
+        assert entered.wait(5)
+        health = pool.submit(client.get, "/health")
+        try:
+            assert health.result(timeout=5).status_code == 200
+        finally:
+            release.set()
+        assert listing.result(timeout=5).json()[0]["path"] == "a.txt"
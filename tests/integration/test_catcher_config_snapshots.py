@@ -0,0 +1,38 @@
+"""Integration tests for hash-addressed config snapshots and snapshot diffs."""
+
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.mark.parametrize("shared", ["0", "1"])
+def test_identical_configs_share_one_blob(load_catcher, shared):
+    client, main = load_catcher(persist=True, DEMO_MODE="1", SHARED_STATE=shared)
+    initial = client.get("/api/v1/config/snapshots").json()[0]
+    assert "config" not in initial
+    manual = client.post("/api/v1/config/snapshots").json()
+    assert manual["hash"] == initial["hash"] and manual["config"]["demo_mode"] is True
+    client.patch("/api/v1/config", json={"rule_sets": {"cache": {"cache_seconds": 9}}})
+    snapshots = client.get("/api/v1/config/snapshots").json()
+    assert len(snapshots) == 3 and len(main.STATE.config_blobs) == 2
+
+    client, main = load_catcher(persist=True, DEMO_MODE="1", SHARED_STATE=shared)
+    assert len(main.STATE.config_blobs) == 2
+    restored = client.get(f"/api/v1/config/snapshots/{initial['snapshot_id']}").json()
+    assert restored["config"]["rule_sets"]["cache"] == {"cache_seconds": 5}
+
+
+def test_diff_against_previous_and_explicit_snapshot(load_catcher):
+    client, _main = load_catcher(DEMO_MODE="1")
+    first = client.post("/api/v1/config/snapshots").json()["snapshot_id"]
+    same = client.post("/api/v1/config/snapshots").json()["snapshot_id"]
+    client.patch("/api/v1/config", json={"rule_sets": {"cache": {"cache_seconds": 9}}})
+    latest = client.get("/api/v1/config/snapshots").json()[-1]["snapshot_id"]
+
+    assert client.get(f"/api/v1/config/snapshots/{same}/diff").json()["changes"] == []
+    diff = client.get(f"/api/v1/config/snapshots/{latest}/diff").json()
+    assert diff["against"] == same
+    assert diff["changes"] == [{"path": "rule_sets.cache.cache_seconds", "before": 5, "after": 9}]
+    back = client.get(f"/api/v1/config/snapshots/{first}/diff", params={"against": latest}).json()
+    assert back["changes"] == [{"path": "rule_sets.cache.cache_seconds", "before": 9, "after": 5}]
+    assert client.get(f"/api/v1/config/snapshots/{first}/diff", params={"against": "cfg-99"}).status_code == 404
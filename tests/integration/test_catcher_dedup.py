@@ -0,0 +1,54 @@
+"""Integration tests for the checksum index and dedup accounting."""
+
+from __future__ import annotations
+
+import pytest
+
+
+def _ingest(client, source_id: str, path: str, checksum: str, size: int) -> dict:
+    resp = client.post(
+        "/api/v1/ingest",
+        json={"source_id": source_id, "path": path, "checksum": checksum, "size_bytes": size},
+    )
+    assert resp.status_code == 200
+    return resp.json()
+
+
+@pytest.mark.parametrize("bloom", ["0", "1"])
+def test_ingest_flags_duplicate_payload(load_catcher, bloom):
+    client, _main = load_catcher(DEDUP_BLOOM=bloom, DEDUP_BLOOM_CAPACITY="1000")
+    first = _ingest(client, "laptop", "local/Pictures/a.jpg", "aaa", 100)
+    assert first["duplicate_of"] is None
+    second = _ingest(client, "phone", "s3/Pictures/a-copy.jpg", "aaa", 100)
+    assert second["duplicate_of"] == first["job_id"]
+    assert _ingest(client, "phone", "s3/Pictures/b.jpg", "bbb", 50)["duplicate_of"] is None
+
+
+def test_duplicate_index_follows_patch_and_delete(load_catcher):
+    client, _main = load_catcher()
+    first = _ingest(client, "laptop", "local/a.bin", "aaa", 10)
+    client.patch(f"/api/v1/packages/{first['job_id']}", json={"checksum": "ccc"})
+    assert _ingest(client, "laptop", "local/b.bin", "aaa", 10)["duplicate_of"] is None
+    client.delete(f"/api/v1/jobs/{first['job_id']}")
+    assert _ingest(client, "laptop", "local/c.bin", "ccc", 10)["duplicate_of"] is None
+
+
+def test_dedup_stats_reports_logical_and_unique_bytes(load_catcher):
+    client, _main = load_catcher()
+    _ingest(client, "laptop", "local/a.jpg", "aaa", 100)
+    _ingest(client, "phone", "s3/a.jpg", "aaa", 100)
+    _ingest(client, "phone", "s3/b.jpg", "bbb", 40)
+
+    stats = client.get("/api/v1/dedup/stats").json()
+    assert stats["total"]["logical_bytes"] == 240
+    assert stats["total"]["unique_bytes"] == 140
+    assert stats["total"]["duplicate_bytes"] == 100
+    assert stats["unique_checksums"] == 2
+    assert stats["tiers"]["hot"]["unique_bytes"] == 140
+    assert stats["sources"]["phone"] == {
+        "count": 2,
+        "logical_bytes": 140,
+        "unique_bytes": 140,
+        "duplicate_bytes": 0,
+        "dedup_ratio": 1.0,
+    }
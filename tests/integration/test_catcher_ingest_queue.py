@@ -0,0 +1,111 @@
+"""Integration tests for queued (202 Accepted) ingest and admission control."""
+
+from __future__ import annotations
+
+import threading
+
+PAYLOAD = {"source_id": "queue-test", "path": "local/q/file.txt", "checksum": "abc", "size_bytes": 3}
+
+
+def test_queued_ingest_returns_202_and_materializes(load_catcher):
+    client, main = load_catcher(INGEST_QUEUE="1", INGEST_QUEUE_BATCH="10")
+    resp = client.post("/api/v1/ingest", json=PAYLOAD)
+    assert resp.status_code == 202
+    body = resp.json()
+    assert body["status"] == "queued"
+    assert body["provisional"] is True
+
+    main.INGEST_QUEUE.join()
+    fetched = client.get(f"/api/v1/packages/{body['job_id']}")
+    assert fetched.status_code == 200
+    assert fetched.json()["source_id"] == "queue-test"
+    stats = client.get("/api/v1/ingest/queue").json()
+    assert stats["enabled"] is True
+    assert stats["processed"] == 1
+    main.INGEST_QUEUE.stop()
+
+
+def test_full_queue_answers_429_with_retry_after(load_catcher):
+    client, main = load_catcher(INGEST_QUEUE="1")
+    release = threading.Event()
+    original = main.INGEST_QUEUE
+
+    def blocking_handler(batch):
+        release.wait(5)
+        main._process_ingest_batch(batch)
+
+    main.INGEST_QUEUE = main.IngestQueue(blocking_handler, maxsize=1, workers=1, batch_size=1)
+    try:
+        first = client.post("/api/v1/ingest", json=PAYLOAD)
+        assert first.status_code == 202
+        statuses = [client.post("/api/v1/ingest", json=PAYLOAD).status_code for _ in range(3)]
+        assert 429 in statuses
+        rejected = client.post("/api/v1/ingest", json=PAYLOAD)
+        assert rejected.status_code == 429
+        assert rejected.headers["Retry-After"] == "1"
+
+        queued = client.patch(f"/api/v1/packages/{first.json()['job_id']}", json={"status": "completed"})
+        assert queued.status_code == 409
+    finally:
+        release.set()
+        main.INGEST_QUEUE.join()
+        main.INGEST_QUEUE.stop()
+        original.stop()
+
+
+def test_sync_ingest_reports_queue_disabled(load_catcher):
+    client, _main = load_catcher()
+    assert client.post("/api/v1/ingest", json=PAYLOAD).status_code == 200
+    assert client.get("/api/v1/ingest/queue").json() == {"enabled": False}
+
+
+def test_rejected_ingest_consumes_no_job_id(load_catcher):
+    client, main = load_catcher(INGEST_QUEUE="1")
+    release = threading.Event()
+    original = main.INGEST_QUEUE
+    main.INGEST_QUEUE = main.IngestQueue(lambda batch: release.wait(5), maxsize=1, workers=1, batch_size=1)
+    try:
+        statuses = [client.post("/api/v1/ingest", json=PAYLOAD).status_code for _ in range(5)]
+        assert statuses.count(429) >= 3
+        assert main.STATE.job_id == statuses.count(202)
+    finally:
+        release.set()
+        main.INGEST_QUEUE.stop()
+        original.stop()
+
+
+def test_failed_queued_ingest_is_discoverable(load_catcher, monkeypatch):
+    client, main = load_catcher(INGEST_QUEUE="1")
+
+    def broken(*_args):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(main, "_create_job", broken)
+    job_id = client.post("/api/v1/ingest", json=PAYLOAD).json()["job_id"]
+    main.INGEST_QUEUE.join()
+
+    resp = client.get(f"/api/v1/packages/{job_id}")
+    assert resp.status_code == 422
+    assert resp.json()["detail"]["status"] == "failed"
+    assert "disk full" in resp.json()["detail"]["last_error"]
+    events = client.get("/api/v1/journal", params={"event_type": "ingest_failed"}).json()
+    assert events[-1]["package_id"] == job_id
+    main.INGEST_QUEUE.stop()
+
+
+def test_worker_counters_add_up_across_threads(load_catcher):
+    _client, main = load_catcher(INGEST_QUEUE="1")
+
+    def handler(batch):
+        if batch[0] % 7 == 0:
+            raise ValueError("bad batch")
+
+    ingest_queue = main.IngestQueue(handler, maxsize=10_000, workers=8, batch_size=1)
+    for i in range(2000):
+        ingest_queue.submit(lambda i=i: i)
+    ingest_queue.join()
+    stats = ingest_queue.stats()
+    ingest_queue.stop()
+    assert stats["accepted"] == 2000
+    assert stats["processed"] + stats["failed"] == stats["batches"] == 2000
+    assert stats["failed"] == len(range(0, 2000, 7))
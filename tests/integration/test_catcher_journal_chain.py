@@ -0,0 +1,46 @@
+"""Integration tests for the hash-chained yard ledger and checkpointed verification."""
+
+from __future__ import annotations
+
+import pytest
+
+
+def _ingest(client, path: str) -> None:
+    client.post("/api/v1/ingest", json={"source_id": "laptop", "path": path, "checksum": path, "size_bytes": 1})
+
+
+@pytest.mark.parametrize("shared", ["0", "1"])
+def test_events_are_chained_and_checkpointed(load_catcher, shared):
+    client, main = load_catcher(
+        persist=shared == "1", SHARED_STATE=shared, JOURNAL_CHECKPOINT_EVERY="4", JOURNAL_HMAC_KEY="k"
+    )
+    for i in range(9):
+        _ingest(client, f"local/docs/{i}.txt")
+    events = client.get("/api/v1/journal", params={"limit": 1000}).json()
+    assert all(b["prev_hash"] == a["hash"] for a, b in zip(events, events[1:]))
+    assert sorted(main.STATE.journal_checkpoints) == ["evt-4", "evt-8"]
+
+    full = client.get("/api/v1/journal/verify").json()
+    assert full["ok"] and full["from_checkpoint"] is None
+    assert full["checked_events"] == len(events) and full["verified_checkpoint"] == "evt-8"
+
+    _ingest(client, "local/docs/late.txt")
+    incremental = client.get("/api/v1/journal/verify").json()
+    assert incremental["ok"] and incremental["from_checkpoint"] == "evt-8"
+    assert incremental["checked_events"] < full["checked_events"]
+    assert client.get("/api/v1/journal/verify", params={"from_checkpoint": "evt-5"}).status_code == 404
+
+
+def test_tampering_is_detected(load_catcher):
+    client, main = load_catcher(JOURNAL_CHECKPOINT_EVERY="3")
+    for i in range(7):
+        _ingest(client, f"local/docs/{i}.txt")
+    main.STATE.journal[4]["details"]["path"] = "local/docs/other.txt"
+
+    result = client.get("/api/v1/journal/verify", params={"from_checkpoint": "evt-3"}).json()
+    assert result["ok"] is False
+    assert result["error"] == {"event_id": "evt-5", "reason": "hash does not match event contents"}
+
+    main.STATE.journal_checkpoints["evt-3"]["signature"] = "0" * 64
+    forged = client.get("/api/v1/journal/verify", params={"from_checkpoint": "evt-3"}).json()
+    assert forged["error"]["reason"] == "checkpoint signature or hash mismatch"
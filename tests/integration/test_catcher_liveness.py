@@ -0,0 +1,58 @@
+"""Integration tests for source liveness tracking."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+
+
+def _seen(main, source_id: str, seconds_ago: int) -> None:
+    seen_at = (datetime.now(timezone.utc) - timedelta(seconds=seconds_ago)).isoformat()
+    main.STATE.touch_source(source_id, seen_at)
+
+
+def test_status_and_source_filters_use_last_seen_order(load_catcher):
+    client, main = load_catcher()
+    assert client.get("/api/v1/status").json()["components"]["client"]["status"] == "idle"
+    _seen(main, "old-nas", 86_400)
+    _seen(main, "laptop", 3_600)
+    _seen(main, "phone", 600)
+    main.STATE.set_source("never", {"source_id": "never", "label": None, "last_seen_at": None})
+    assert client.get("/api/v1/status").json()["components"]["client"]["status"] == "idle"
+
+    stale = client.get("/api/v1/sources", params={"stale_for": 1800}).json()
+    assert [s["source_id"] for s in stale] == ["old-nas", "laptop"]
+    assert stale[0]["idle_seconds"] >= 86_400
+    active = client.get("/api/v1/sources", params={"active_within": 7200}).json()
+    assert [s["source_id"] for s in active] == ["laptop", "phone"]
+    window = client.get("/api/v1/sources", params={"active_within": 7200, "stale_for": 1800}).json()
+    assert [s["source_id"] for s in window] == ["laptop"]
+    everything = client.get("/api/v1/sources").json()
+    assert {s["source_id"]: s["idle_seconds"] for s in everything}["never"] is None
+
+    client.post("/api/v1/sources", json={"source_id": "old-nas", "label": "NAS"})
+    assert client.get("/api/v1/status").json()["components"]["client"]["status"] == "active"
+    assert [s["source_id"] for s in client.get("/api/v1/sources", params={"stale_for": 1800}).json()] == ["laptop"]
+
+
+def test_liveness_index_matches_a_sorted_reference_under_heartbeats(load_catcher):
+    _client, main = load_catcher()
+    index = type(main.STATE.liveness)()
+    rng = random.Random(7)
+    epochs: dict[str, float] = {}
+    for _ in range(3000):
+        source_id = f"engine-{rng.randrange(200)}"
+        if rng.random() < 0.1:
+            index.discard(source_id)
+            epochs.pop(source_id, None)
+            continue
+        epoch = float(rng.randrange(1_000_000, 1_001_000))
+        index.update(source_id, {"last_seen_at": datetime.fromtimestamp(epoch, timezone.utc).isoformat()})
+        epochs[source_id] = epoch
+    reference = sorted((epoch, source_id) for source_id, epoch in epochs.items())
+    assert index.latest() == reference[-1][0]
+    for low, high in ((None, None), (1_000_250.0, None), (None, 1_000_500.0), (1_000_100.0, 1_000_900.0)):
+        expected = [s for e, s in reference if (low is None or e >= low) and (high is None or e < high)]
+        assert index.seen_between(low, high) == expected
+    index.clear()
+    assert index.latest() is None and index.seen_between() == []
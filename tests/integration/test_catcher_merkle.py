@@ -0,0 +1,73 @@
+"""Integration tests for per-source Merkle reconciliation against the catcher."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "clients" / "common"))
+
+from merkle import MerkleTree, reconcile  # noqa: E402
+
+
+def _ingest(client, path: str, source_id: str = "laptop", checksum: str | None = None) -> str:
+    body = {"source_id": source_id, "path": path, "checksum": checksum or path, "size_bytes": 1}
+    return client.post("/api/v1/ingest", json=body).json()["job_id"]
+
+
+def _fetchers(client, source_id: str = "laptop"):
+    url = f"/api/v1/sources/{source_id}/merkle"
+
+    def fetch_level(prefix, depth):
+        return client.get(url, params={"prefix": prefix, "depth": depth}).json()
+
+    def fetch_entries(bucket):
+        return [tuple(e) for e in client.get(url, params={"prefix": bucket, "depth": 0}).json()["entries"]]
+
+    return fetch_level, fetch_entries
+
+
+def test_engine_reconciles_with_dispatcher_tree(load_catcher):
+    client, _main = load_catcher()
+    job_ids = {path: _ingest(client, path) for path in (f"local/docs/{i}.txt" for i in range(50))}
+    _ingest(client, "local/phone.jpg", source_id="phone")
+    client.patch(f"/api/v1/packages/{job_ids['local/docs/3.txt']}", json={"status": "completed"})
+    status = client.get(f"/api/v1/packages/{job_ids['local/docs/0.txt']}").json()["status"]
+
+    local = MerkleTree.from_entries([(path, path, status) for path in job_ids])
+    fetch_level, fetch_entries = _fetchers(client)
+    result = reconcile(local, fetch_level, fetch_entries)
+    assert result["only_local"] == [("local/docs/3.txt", "local/docs/3.txt", status)]
+    assert result["only_remote"] == [("local/docs/3.txt", "local/docs/3.txt", "completed")]
+
+    local.update("local/docs/3.txt", "local/docs/3.txt", "local/docs/3.txt", "completed")
+    assert fetch_level("", 1)["digest"] == local.digest()
+    assert fetch_level("", 1)["count"] == 50
+
+
+def test_reingested_path_reconciles_to_its_latest_job(load_catcher):
+    client, main = load_catcher()
+    for path in ("local/a.txt", "local/b.txt"):
+        _ingest(client, path, checksum=f"{path}-v1")
+    second = _ingest(client, "local/a.txt", checksum="local/a.txt-v2")
+    status = client.get(f"/api/v1/packages/{second}").json()["status"]
+
+    local = MerkleTree.from_entries(
+        [("local/a.txt", "local/a.txt-v2", status), ("local/b.txt", "local/b.txt-v1", status)]
+    )
+    fetch_level, fetch_entries = _fetchers(client)
+    result = reconcile(local, fetch_level, fetch_entries)
+    assert result["divergent_buckets"] == [] and result["requests"] == 1
+    assert fetch_level("", 1)["count"] == 2
+
+    main.STATE.delete_job(second)
+    result = reconcile(local, fetch_level, fetch_entries)
+    assert result["only_remote"] == [("local/a.txt", "local/a.txt-v1", status)]
+
+
+def test_merkle_validates_source_and_prefix(load_catcher):
+    client, _main = load_catcher()
+    _ingest(client, "local/a.txt")
+    assert client.get("/api/v1/sources/nobody/merkle").status_code == 404
+    assert client.get("/api/v1/sources/laptop/merkle", params={"prefix": "xyz"}).status_code == 400
+    assert client.get("/api/v1/sources/laptop/merkle", params={"depth": 9}).status_code == 422
@@ -0,0 +1,56 @@
+"""Integration tests for the Prometheus /metrics endpoint."""
+
+from __future__ import annotations
+
+import sys
+
+
+def _sample(text: str, line_prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix} not in metrics output")
+
+
+def test_routes_state_and_journal_are_instrumented(load_catcher):
+    client, _main = load_catcher(persist=True)
+    for i in range(3):
+        client.post("/api/v1/ingest", json={"source_id": "laptop", "path": f"a/{i}.txt", "package_type": "cache"})
+    client.get("/api/v1/packages/job-1")
+    client.get("/api/v1/no-such-route")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200 and resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+    ingest = 'catcher_http_requests_total{method="POST",route="/api/v1/ingest",status="200"}'
+    assert _sample(text, ingest) == 3
+    assert _sample(text, 'catcher_http_requests_total{method="GET",route="/api/v1/packages/{pkg_id}",status="200"}') == 1
+    assert _sample(text, 'catcher_http_requests_total{method="GET",route="unmatched",status="404"}') == 1
+    assert _sample(text, 'catcher_http_request_duration_seconds_count{method="POST",route="/api/v1/ingest"}') == 3
+    assert _sample(text, 'catcher_http_request_duration_seconds_bucket{method="POST",route="/api/v1/ingest",le="+Inf"}') == 3
+    assert _sample(text, 'catcher_manifests_created_total{package_type="cache"}') == 3
+    assert _sample(text, 'catcher_journal_appends_total{event_type="manifest_created"}') == 3
+    assert _sample(text, "catcher_jobs") == 3
+    assert _sample(text, 'catcher_state_persist_seconds_count{mode="blob"}') >= 1
+    assert "# TYPE catcher_http_request_duration_seconds histogram" in text
+
+
+def test_metrics_can_be_disabled(load_catcher):
+    client, _main = load_catcher(METRICS_ENABLED="0")
+    assert client.get("/metrics").status_code == 404
+
+
+def test_log_queue_counters_are_exported(load_catcher):
+    client, main = load_catcher(LOG_QUEUE="1", LOG_QUEUE_SIZE="100", LOG_QUEUE_POLICY="block")
+    emission = sys.modules[main.configure_observability.__module__]
+    try:
+        client.post("/api/v1/ingest", json={"source_id": "laptop", "path": "a.txt"})
+        text = client.get("/metrics").text
+        assert _sample(text, "catcher_log_records_dropped") == 0
+        assert _sample(text, "catcher_status_lines_dropped") == 0
+        assert _sample(text, "catcher_log_queue_depth") >= 0
+        assert emission.observability_stats()["status_queue"]["policy"] == "block"
+    finally:
+        # The EBK writer is process-global; later tests expect synchronous lines.
+        main.flush_observability()
+        emission._STATUS_WRITER = None
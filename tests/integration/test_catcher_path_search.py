@@ -0,0 +1,67 @@
+"""Integration tests for the path-prefix index and package search."""
+
+from __future__ import annotations
+
+
+def _ingest(client, source_id: str, path: str, size: int) -> str:
+    resp = client.post(
+        "/api/v1/ingest",
+        json={"source_id": source_id, "path": path, "checksum": path, "size_bytes": size},
+    )
+    return resp.json()["job_id"]
+
+
+def _seed(client) -> dict[str, str]:
+    return {
+        path: _ingest(client, source, path, size)
+        for source, path, size in (
+            ("laptop", "local/Documents/tax/2025.pdf", 100),
+            ("laptop", "local/Documents/tax/2024.pdf", 90),
+            ("laptop", "local/Documents/cv.odt", 10),
+            ("laptop", "local/Pictures/a.jpg", 500),
+            ("phone", "local/Documents/scan.pdf", 7),
+            ("phone", "s3/exports/db.sql", 1000),
+        )
+    }
+
+
+def test_prefix_search_returns_sorted_matches_totals_and_subdirectories(load_catcher):
+    client, _main = load_catcher()
+    _seed(client)
+    result = client.get("/api/v1/packages/search", params={"prefix": "local/Documents/"}).json()
+    assert [p["path"] for p in result["packages"]] == [
+        "local/Documents/cv.odt",
+        "local/Documents/scan.pdf",
+        "local/Documents/tax/2024.pdf",
+        "local/Documents/tax/2025.pdf",
+    ]
+    assert result["total"] == {"count": 4, "size_bytes": 207}
+    assert result["directories"] == [{"prefix": "local/Documents/tax/", "count": 2, "size_bytes": 190}]
+
+    laptop = client.get("/api/v1/packages/search", params={"prefix": "local/", "source_id": "laptop"}).json()
+    assert laptop["total"] == {"count": 4, "size_bytes": 700}
+    assert [d["prefix"] for d in laptop["directories"]] == ["local/Documents/", "local/Pictures/"]
+
+    partial = client.get("/api/v1/packages/search", params={"prefix": "local/Doc"}).json()
+    assert partial["total"]["count"] == 4
+    assert [d["prefix"] for d in partial["directories"]] == ["local/Documents/"]
+
+
+def test_search_pages_and_follows_deletes(load_catcher):
+    client, _main = load_catcher()
+    ids = _seed(client)
+    client.delete(f"/api/v1/jobs/{ids['local/Documents/tax/2024.pdf']}")
+    seen, cursor = [], None
+    while True:
+        params = {"prefix": "local/", "limit": 2, "fields": "path", **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/v1/packages/search", params=params).json()
+        seen += [p["path"] for p in page["packages"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == sorted(p for p in ids if p.startswith("local/") and p != "local/Documents/tax/2024.pdf")
+    tax = client.get("/api/v1/packages/search", params={"prefix": "local/Documents/tax/"}).json()
+    assert tax["total"] == {"count": 1, "size_bytes": 100}
+    client.delete(f"/api/v1/jobs/{ids['local/Documents/tax/2025.pdf']}")
+    docs = client.get("/api/v1/packages/search", params={"prefix": "local/Documents/"}).json()
+    assert docs["directories"] == []
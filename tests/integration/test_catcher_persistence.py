@@ -18,6 +18,7 @@ sys.path.insert(0, str(BACKEND))
 def client(tmp_path: Path, monkeypatch):
     db_path = tmp_path / "catcher.db"
     monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("LOG_QUEUE", "0")
     monkeypatch.delenv("DEMO_MODE", raising=False)
 
     for name in ("settings", "state", "main"):
@@ -40,6 +41,7 @@ def test_health_reports_persistence(client):
 def test_ingest_persists_across_reload(tmp_path, monkeypatch):
     db_path = tmp_path / "catcher.db"
     monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setenv("LOG_QUEUE", "0")
 
     for name in ("settings", "state", "main"):
         sys.modules.pop(name, None)
@@ -65,3 +67,19 @@ def test_ingest_persists_across_reload(tmp_path, monkeypatch):
     fetched = test_client2.get(f"/api/v1/packages/{job_id}")
     assert fetched.status_code == 200
     assert fetched.json()["source_id"] == "persist-test"
+
+
+def test_response_is_sent_after_writer_stores_mutation(client, tmp_path):
+    import json
+    import sqlite3
+
+    test_client, main = client
+    assert main._await_persistence is not None
+    resp = test_client.post(
+        "/api/v1/ingest",
+        json={"source_id": "writer-test", "path": "local/a.txt", "checksum": "c0ffee", "size_bytes": 1},
+    )
+    job_id = resp.json()["job_id"]
+    with sqlite3.connect(tmp_path / "catcher.db") as conn:
+        payload = json.loads(conn.execute("SELECT payload FROM dispatcher_state WHERE id = 1").fetchone()[0])
+    assert job_id in payload["jobs"]
@@ -0,0 +1,69 @@
+"""Integration tests for the admin profiling and tracemalloc endpoints."""
+
+from __future__ import annotations
+
+import tracemalloc
+
+ADMIN = {"X-Admin-Token": "secret"}
+
+
+def test_admin_surface_is_absent_without_token(load_catcher):
+    client, main = load_catcher()
+    assert client.get("/api/v1/admin/profiles", headers=ADMIN).status_code == 404
+    resp = client.get("/api/v1/status", headers={"X-Profile": "1", **ADMIN})
+    assert resp.status_code == 200 and "x-profile-id" not in resp.headers
+    assert not any(m.cls is main.ProfilerMiddleware for m in main.app.user_middleware)
+
+
+def test_request_profile_via_header(load_catcher):
+    client, _main = load_catcher(ADMIN_TOKEN="secret")
+    for i in range(50):
+        client.post("/api/v1/ingest", json={"source_id": "laptop", "path": f"a/{i}.txt"})
+    assert client.get("/api/v1/status", headers={"X-Profile": "0.001", "X-Admin-Token": "wrong"}).status_code == 403
+    assert client.get("/api/v1/admin/profiles", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+    resp = client.get("/api/v1/status", headers={"X-Profile": "0.001", **ADMIN})
+    assert resp.status_code == 200 and resp.json()["components"]["catcher"]["jobs_count"] == 50
+    profile_id = resp.headers["x-profile-id"]
+    listed = client.get("/api/v1/admin/profiles", headers=ADMIN).json()
+    assert listed[0]["profile_id"] == profile_id and listed[0]["name"] == "GET /api/v1/status"
+
+    collapsed = client.get(f"/api/v1/admin/profiles/{profile_id}", headers=ADMIN)
+    assert collapsed.headers["content-type"].startswith("text/plain")
+    counts = [int(line.rsplit(" ", 1)[1]) for line in collapsed.text.splitlines()]
+    assert sum(counts) == listed[0]["samples"]
+
+    speedscope = client.get(f"/api/v1/admin/profiles/{profile_id}", params={"format": "speedscope"}, headers=ADMIN)
+    doc = speedscope.json()
+    assert doc["$schema"] == "https://www.speedscope.app/file-format-schema.json"
+    for prof in doc["profiles"]:
+        assert prof["type"] == "sampled" and len(prof["samples"]) == len(prof["weights"])
+        assert all(0 <= i < len(doc["shared"]["frames"]) for sample in prof["samples"] for i in sample)
+
+
+def test_window_profile_samples_the_process(load_catcher):
+    client, _main = load_catcher(ADMIN_TOKEN="secret")
+    resp = client.post("/api/v1/admin/profile", params={"seconds": 0.1, "interval": 0.001}, headers=ADMIN)
+    assert resp.status_code == 200
+    assert any(line.startswith("MainThread;") for line in resp.text.splitlines())
+    assert resp.headers["content-disposition"].endswith('.collapsed.txt"')
+
+
+def test_tracemalloc_snapshots_diff(load_catcher):
+    client, _main = load_catcher(ADMIN_TOKEN="secret")
+    assert client.post("/api/v1/admin/tracemalloc/snapshot", headers=ADMIN).status_code == 409
+    try:
+        assert client.post("/api/v1/admin/tracemalloc/start", headers=ADMIN).json()["tracing"] is True
+        first = client.post("/api/v1/admin/tracemalloc/snapshot", headers=ADMIN).json()
+        assert first["snapshot_id"] == "snap-1" and first["diff"] is None
+        for i in range(200):
+            client.post("/api/v1/ingest", json={"source_id": "laptop", "path": f"grow/{i}.txt"})
+        second = client.post("/api/v1/admin/tracemalloc/snapshot", headers=ADMIN).json()
+        assert second["against"] == "snap-1"
+        assert any(row["size_diff_bytes"] > 0 for row in second["diff"])
+        assert client.post(
+            "/api/v1/admin/tracemalloc/snapshot", params={"against": "snap-9"}, headers=ADMIN
+        ).status_code == 404
+    finally:
+        assert client.post("/api/v1/admin/tracemalloc/stop", headers=ADMIN).json()["tracing"] is False
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,43 @@
+"""Integration tests for sparse ``fields=`` projection on packages and journal."""
+
+from __future__ import annotations
+
+
+def _ingest(client, path: str) -> str:
+    resp = client.post(
+        "/api/v1/ingest",
+        json={"source_id": "laptop", "path": path, "checksum": "abc", "size_bytes": 5, "tag": "cache"},
+    )
+    return resp.json()["job_id"]
+
+
+def test_projection_matches_full_payload(load_catcher):
+    client, _main = load_catcher()
+    job_id = _ingest(client, "local/a.txt")
+    full = client.get("/api/v1/packages").json()[0]
+    fields = ["package_id", "source_id", "path", "status", "bucket", "progress_percent", "tier", "package_type"]
+    sparse = client.get("/api/v1/packages", params={"fields": ",".join(fields)}).json()[0]
+    assert sparse == {name: full[name] for name in fields}
+    one = client.get(f"/api/v1/packages/{job_id}", params={"fields": "path,age_days,nope"}).json()
+    assert one == {"path": "local/a.txt", "age_days": full["age_days"]}
+
+
+def test_unrequested_age_and_bucket_are_not_computed(load_catcher, monkeypatch):
+    client, main = load_catcher()
+    _ingest(client, "local/a.txt")
+
+    def fail(*_args):
+        raise AssertionError("age/bucket computed for a projection that does not need it")
+
+    monkeypatch.setattr(main, "_age_days", fail)
+    monkeypatch.setattr(main, "_bucket_for_age", fail)
+    resp = client.get("/api/v1/packages", params={"fields": "package_id,path,status"})
+    assert resp.json() == [{"package_id": "job-1", "path": "local/a.txt", "status": "pending"}]
+
+
+def test_journal_projection(load_catcher):
+    client, _main = load_catcher()
+    job_id = _ingest(client, "local/a.txt")
+    events = client.get("/api/v1/journal", params={"fields": "event_type,package_id"}).json()
+    assert {"event_type": "manifest_created", "package_id": job_id} in events
+    assert all(set(event) <= {"event_type", "package_id"} for event in events)
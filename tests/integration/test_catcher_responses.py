@@ -0,0 +1,34 @@
+"""Integration tests for the fast JSON response path on bulk endpoints."""
+
+from __future__ import annotations
+
+import json
+import sys
+
+import pytest
+
+
+def _seed(client, count: int = 3) -> None:
+    for i in range(count):
+        resp = client.post(
+            "/api/v1/ingest",
+            json={"source_id": "laptop", "path": f"local/docs/ünïcode-{i}.txt", "checksum": f"c{i}", "size_bytes": i},
+        )
+        assert resp.status_code == 200
+
+
+@pytest.mark.parametrize("orjson_installed", [True, False])
+def test_bulk_endpoints_render_plain_json(load_catcher, monkeypatch, orjson_installed):
+    client, main = load_catcher()
+    if not orjson_installed:
+        monkeypatch.setattr(sys.modules[main.FastJSONResponse.__module__], "orjson", None)
+    _seed(client)
+    packages = client.get("/api/v1/packages")
+    assert packages.headers["content-type"] == "application/json"
+    assert [p["path"] for p in json.loads(packages.content)] == [f"local/docs/ünïcode-{i}.txt" for i in range(3)]
+    assert client.get("/api/v1/packages", params={"bucket": "cold"}).json() == []
+
+    resume = client.get("/api/v1/sources/laptop/resume").json()
+    assert resume["count"] == 3
+    export = client.get("/api/v1/journal/export").json()
+    assert export["count"] == len(export["events"])
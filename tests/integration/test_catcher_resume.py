@@ -0,0 +1,47 @@
+"""Integration tests for the per-source resume backlog index."""
+
+from __future__ import annotations
+
+
+def _ingest(client, source_id: str, path: str) -> str:
+    resp = client.post(
+        "/api/v1/ingest",
+        json={"source_id": source_id, "path": path, "checksum": path, "size_bytes": 1},
+    )
+    return resp.json()["job_id"]
+
+
+def test_resume_lists_only_unfinished_in_order_with_pages(load_catcher):
+    client, main = load_catcher()
+    ids = [_ingest(client, "laptop", f"local/{i}.txt") for i in range(12)]
+    _ingest(client, "phone", "s3/x.jpg")
+    client.patch(f"/api/v1/packages/{ids[3]}", json={"status": "completed"})
+    client.patch(f"/api/v1/packages/{ids[5]}", json={"status": "completed"})
+    client.patch(f"/api/v1/packages/{ids[5]}", json={"status": "failed"})
+    client.delete(f"/api/v1/jobs/{ids[7]}")
+    expected = [job_id for i, job_id in enumerate(ids) if i not in (3, 7)]
+
+    full = client.get("/api/v1/sources/laptop/resume").json()
+    assert [item["package_id"] for item in full["switch_list"]] == expected
+    assert full["total"] == 10 and full["next_cursor"] is None
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 4, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/v1/sources/laptop/resume", params=params).json()
+        seen += [item["package_id"] for item in page["switch_list"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == expected
+    assert main.STATE.unfinished_page("phone", None, None)[1] == 1
+
+
+def test_backlog_index_is_rebuilt_on_reload(load_catcher):
+    client, _main = load_catcher(persist=True)
+    first = _ingest(client, "laptop", "local/a.txt")
+    _ingest(client, "laptop", "local/b.txt")
+    client.patch(f"/api/v1/packages/{first}", json={"status": "completed"})
+    client, _main = load_catcher(persist=True)
+    resume = client.get("/api/v1/sources/laptop/resume").json()
+    assert [item["path"] for item in resume["switch_list"]] == ["local/b.txt"]
@@ -0,0 +1,52 @@
+"""Integration tests for the retention executor."""
+
+from __future__ import annotations
+
+
+def _ingest(client, path: str, secs_ago: int, package_type: str) -> str:
+    resp = client.post(
+        "/api/v1/ingest",
+        json={"source_id": "laptop", "path": path, "checksum": path, "size_bytes": 10, "package_type": package_type},
+        headers={"X-Demo-Created-Secs-Ago": str(secs_ago)},
+    )
+    return resp.json()["job_id"]
+
+
+def test_run_deletes_expired_and_keeps_never_delete(load_catcher):
+    client, _main = load_catcher(DEMO_MODE="1")
+    expired = [_ingest(client, f"local/cache/{i}.tmp", 60, "cache") for i in range(3)]
+    _ingest(client, "local/cache/fresh.tmp", 0, "cache")
+    _ingest(client, "local/audit/old.log", 100_000, "audit_logs")
+    _ingest(client, "local/docs/young.txt", 50, "user_data")
+    old_doc = _ingest(client, "local/docs/old.txt", 100_000, "user_data")
+
+    resp = client.post("/api/v1/retention/run").json()
+    assert resp["last_run_deleted"] == 4 and resp["runs"] == 1 and resp["last_error"] is None
+    remaining = {p["path"] for p in client.get("/api/v1/packages").json()}
+    assert remaining == {"local/cache/fresh.tmp", "local/audit/old.log", "local/docs/young.txt"}
+
+    events = client.get("/api/v1/journal", params={"event_type": "retention_expired"}).json()
+    assert len(events) == 1
+    details = events[0]["details"]
+    assert details["count"] == 4
+    assert details["by_package_type"] == {"cache": 3, "user_data": 1}
+    assert set(details["job_id_ranges"]) == {f"{expired[0]}..{expired[-1]}", old_doc}
+    assert "audit_logs" not in details["expiry_seconds"]
+    assert client.get("/api/v1/status").json()["components"]["deleted_count"] == 4
+
+
+def test_run_is_batched_and_capped(load_catcher):
+    client, main = load_catcher(
+        DEMO_MODE="1", RETENTION_BATCH="2", RETENTION_MAX_PER_RUN="5", RETENTION_MAX_PER_SECOND="0"
+    )
+    for i in range(7):
+        _ingest(client, f"local/cache/{i}.tmp", 60, "cache")
+
+    assert client.post("/api/v1/retention/run").json()["last_run_deleted"] == 5
+    events = client.get("/api/v1/journal", params={"event_type": "retention_expired"}).json()
+    assert [e["details"]["count"] for e in events] == [2, 2, 1]
+    status = client.get("/api/v1/retention").json()
+    assert status["enabled"] is False and status["running"] is False and status["deleted"] == 5
+    resp = client.post("/api/v1/retention/run").json()
+    assert resp["last_run_deleted"] == 2 and resp["deleted"] == 7
+    assert main.STATE.jobs_created_between(None, None, None) == []
@@ -0,0 +1,64 @@
+"""Integration tests for multi-worker shared state (SHARED_STATE=1, SQLite WAL rows)."""
+
+from __future__ import annotations
+
+import sqlite3
+
+INGEST = {"source_id": "shared", "path": "local/a.txt", "checksum": "abc", "size_bytes": 3}
+
+
+def _second_worker(main):
+    """Another process's view of the same database."""
+    return main.STATE.__class__.load(main.SETTINGS)
+
+
+def test_shared_state_uses_wal_rows_and_cross_worker_ids(load_catcher, tmp_path):
+    client, main = load_catcher(persist=True, SHARED_STATE="1")
+    other = _second_worker(main)
+
+    first = client.post("/api/v1/ingest", json=INGEST).json()["job_id"]
+    second = other.next_job_id()
+    third = client.post("/api/v1/ingest", json=INGEST).json()["job_id"]
+    assert [first, second, third] == ["job-1", "job-2", "job-3"]
+
+    with sqlite3.connect(tmp_path / "catcher.db") as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 2
+
+
+def test_requests_see_other_worker_writes(load_catcher):
+    client, main = load_catcher(persist=True, SHARED_STATE="1")
+    other = _second_worker(main)
+    job_id = client.post("/api/v1/ingest", json=INGEST).json()["job_id"]
+
+    other.refresh()
+    other.update_job(job_id, lambda job: job.update(status="completed"))
+    other.set_job("job-99", {**other.jobs[job_id], "job_id": "job-99", "path": "local/b.txt"})
+    other.delete_job(job_id)
+
+    packages = client.get("/api/v1/packages").json()
+    assert [p["job_id"] for p in packages] == ["job-99"]
+    journal = client.get("/api/v1/journal").json()
+    assert [e["event_id"] for e in journal] == sorted((e["event_id"] for e in journal), key=lambda v: int(v[4:]))
+
+
+def test_rule_set_changes_reach_other_workers(load_catcher):
+    client, main = load_catcher(persist=True, SHARED_STATE="1")
+    assert client.get("/api/v1/packages").status_code == 200
+    other = _second_worker(main)
+    rules = main._rule_sets_for_api()
+    rules["user_data"]["stops"]["hot"]["wait_days"] = 42
+    other.save_rule_sets("days", rules)
+
+    config = client.get("/api/v1/config").json()
+    assert config["rule_sets"]["user_data"]["stops"]["hot"]["wait_days"] == 42
+    assert main._get_boundaries("user_data")[0] == 42
+
+
+def test_blob_state_migrates_into_rows(load_catcher):
+    client, _main = load_catcher(persist=True)
+    job_id = client.post("/api/v1/ingest", json=INGEST).json()["job_id"]
+
+    client, _main = load_catcher(persist=True, SHARED_STATE="1")
+    assert client.get(f"/api/v1/packages/{job_id}").json()["source_id"] == "shared"
+    assert client.post("/api/v1/ingest", json=INGEST).json()["job_id"] == "job-2"
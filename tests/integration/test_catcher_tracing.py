@@ -0,0 +1,53 @@
+"""Integration tests for catcher server spans and W3C trace context propagation."""
+
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture()
+def spans():
+    sdk = pytest.importorskip("opentelemetry.sdk.trace")
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, sdk.TracerProvider):
+        provider = sdk.TracerProvider()
+        trace.set_tracer_provider(provider)
+    exporter = InMemorySpanExporter()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    yield exporter
+    exporter.shutdown()
+
+
+def test_ingest_joins_the_engine_trace(load_catcher, spans):
+    client, _main = load_catcher(persist=True, OTEL_EXPORTER_OTLP_ENDPOINT="http://127.0.0.1:9")
+    trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+    resp = client.post(
+        "/api/v1/ingest",
+        json={"source_id": "laptop", "path": "docs/a.txt"},
+        headers={"traceparent": f"00-{trace_id}-{parent_id}-01"},
+    )
+    assert resp.status_code == 200
+
+    finished = [s for s in spans.get_finished_spans() if f"{s.context.trace_id:032x}" == trace_id]
+    by_name = {s.name: s for s in finished}
+    server = by_name["POST /api/v1/ingest"]
+    assert server.kind.name == "SERVER" and f"{server.parent.span_id:016x}" == parent_id
+    assert server.attributes["http.route"] == "/api/v1/ingest"
+    assert server.attributes["http.response.status_code"] == 200
+    assert by_name["journal.append"].attributes["event_type"] == "manifest_created"
+    persist = [s for s in finished if s.name == "state.persist"]
+    assert persist and all(s.attributes["mode"] == "blob" for s in persist)
+    # Spans below the route (including the writer thread's blob write) hang off the server span.
+    ids = {s.context.span_id for s in finished}
+    assert all(s.parent.span_id in ids for s in finished if s is not server)
+
+
+def test_no_server_spans_without_an_endpoint(load_catcher, spans):
+    client, main = load_catcher()
+    client.get("/api/v1/status")
+    assert not any(s.kind.name == "SERVER" for s in spans.get_finished_spans())
+    assert not any(m.cls is main.TracingMiddleware for m in main.app.user_middleware)
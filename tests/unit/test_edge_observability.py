@@ -5,6 +5,8 @@ import json
 import logging
 import os
 import sys
+import threading
+import time
 from io import StringIO
 from pathlib import Path
 
@@ -77,3 +79,131 @@ def test_emit_ai_status_stdout(capsys, monkeypatch):
     assert captured.startswith("EBK\t")
     assert "command=upload" in captured
     assert "status=completed" in captured
+
+
+def test_queued_handler_formats_on_listener_thread():
+    import edge_observability
+
+    stream = StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(StructuredFormatter())
+    test_logger = logging.getLogger("test-queued")
+    test_logger.handlers = [edge_observability.queued_handler(handler)]
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        test_logger.exception("copy %s failed", "hop-1", extra={"event_type": "transfer_failed"})
+    edge_observability.flush_observability()
+    payload = json.loads(stream.getvalue().strip())
+    assert payload["message"] == "copy hop-1 failed"
+    assert payload["event_type"] == "transfer_failed"
+    assert "ValueError: boom" in payload["exception"]
+
+
+def test_queued_ai_status_written_in_background(capsys, monkeypatch):
+    import edge_observability
+
+    monkeypatch.setattr(edge_observability, "_STATUS_WRITER", edge_observability._StatusLineWriter())
+    emit_ai_status("upload", source_id="engine-1", status="completed")
+    edge_observability.flush_observability()
+    captured = capsys.readouterr().out.strip()
+    assert captured.startswith("EBK\t")
+    assert "status=completed" in captured
+
+
+def test_full_queue_drops_and_counts():
+    import edge_observability
+
+    release = threading.Event()
+    written: list[list] = []
+
+    def slow_write(batch: list) -> None:
+        release.wait(5)
+        written.append(batch)
+
+    writer = edge_observability._BatchWriter("test-drop", slow_write, maxsize=2, policy="drop", batch_size=10)
+    assert writer.submit(0)
+    while writer.stats()["depth"]:  # the writer thread holds item 0 until released
+        time.sleep(0.001)
+    results = [writer.submit(i) for i in range(1, 6)]
+    assert results == [True, True, False, False, False]
+    assert writer.stats()["dropped"] == 3
+    release.set()
+    writer.flush()
+    assert [item for batch in written for item in batch] == [0, 1, 2]
+    assert writer.stats()["written"] == 3 and writer.stats()["batches"] == 2
+
+
+def test_drop_policy_keeps_error_records():
+    import edge_observability
+
+    written: list = []
+    handler = logging.Handler()
+    handler.emit = written.append
+    queued = edge_observability.queued_handler(handler, maxsize=1, policy="drop")
+    gate = threading.Event()
+    original = queued.writer._write_batch
+    queued.writer._write_batch = lambda batch: (gate.wait(5), original(batch))
+    test_logger = logging.getLogger("test-drop-keeps-errors")
+    test_logger.handlers = [queued]
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+    test_logger.info("held by the writer")
+    while queued.writer.stats()["depth"]:
+        time.sleep(0.001)
+    test_logger.info("fills the queue")
+    test_logger.info("dropped")
+    releaser = threading.Timer(0.05, gate.set)
+    releaser.start()
+    test_logger.error("kept")  # waits for room instead of being dropped
+    edge_observability.flush_observability()
+    releaser.join()
+    assert [record.getMessage() for record in written] == ["held by the writer", "fills the queue", "kept"]
+    assert queued.writer.stats()["dropped"] == 1
+
+
+def test_block_policy_waits_for_room():
+    import edge_observability
+
+    written: list = []
+    writer = edge_observability._BatchWriter(
+        "test-block", lambda batch: (time.sleep(0.001), written.extend(batch)), maxsize=1, policy="block"
+    )
+    for i in range(50):
+        assert writer.submit(i)
+    writer.flush()
+    assert written == list(range(50)) and writer.stats()["dropped"] == 0
+    with pytest.raises(ValueError):
+        edge_observability._BatchWriter("bad", written.extend, policy="spill")
+
+
+def test_queued_stream_handler_writes_batches_once():
+    import edge_observability
+
+    class CountingStream(StringIO):
+        flushes = 0
+
+        def flush(self) -> None:
+            CountingStream.flushes += 1
+
+    stream = CountingStream()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    queued = edge_observability.queued_handler(handler, maxsize=1000, policy="block")
+    queued.writer.batch_size = 1000
+    test_logger = logging.getLogger("test-batched")
+    test_logger.handlers = [queued]
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+    gate = threading.Event()
+    original = queued.writer._write_batch
+    queued.writer._write_batch = lambda batch: (gate.wait(5), original(batch))
+    for i in range(100):
+        test_logger.info("line %d", i)
+    gate.set()
+    edge_observability.flush_observability()
+    assert stream.getvalue().splitlines() == [f"line {i}" for i in range(100)]
+    assert CountingStream.flushes <= 2
+    assert edge_observability.observability_stats()["log_queue"]["written"] >= 100
@@ -0,0 +1,83 @@
+"""Unit tests for FastStructuredFormatter parity with StructuredFormatter."""
+from __future__ import annotations
+
+import json
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "clients" / "common"))
+
+import edge_observability  # noqa: E402
+from edge_observability import FastStructuredFormatter, StructuredFormatter, log_error, log_event  # noqa: E402
+
+BACKENDS = [False] + ([True] if edge_observability._load_orjson() is not None else [])
+
+
+class Capture(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def _records() -> list[logging.LogRecord]:
+    capture = Capture()
+    logger = logging.getLogger("test-fast-formatter")
+    logger.handlers = [capture]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    log_event(
+        logger,
+        logging.INFO,
+        "upload %s",
+        event_type="client_upload",
+        source_id="pc-1",
+        path="docs/naïve.txt",
+        details={"progress_percent": 40, 7: "int key"},
+    )
+    try:
+        raise OSError("disk full")
+    except OSError as exc:
+        log_error(logger, "copy failed", event_type="transfer_failed", error_source="hop", operation="copy", exc=exc)
+    logger.warning("plain %d", 3, extra={"trace_id": "ab" * 16, "span_id": "cd" * 8})
+    capture.records[0].args = ("now",)
+    capture.records[2].created = 1_700_000_000.0  # whole second: isoformat drops the fraction
+    capture.records[1].created = 1_700_000_000.9999996  # rounds up into the next second
+    return capture.records
+
+
+@pytest.mark.parametrize("use_orjson", BACKENDS)
+def test_output_parses_to_the_reference_payload(use_orjson):
+    reference = StructuredFormatter()
+    fast = FastStructuredFormatter(use_orjson=use_orjson)
+    for record in _records():
+        assert json.loads(fast.format(record)) == json.loads(reference.format(record))
+    assert json.loads(fast.format(_records()[0]))["message"] == "upload now"
+
+
+def test_static_fields_are_encoded_once():
+    fast = FastStructuredFormatter(use_orjson=False)
+    line = fast.format(_records()[2])
+    assert line.startswith('{"service.version":')
+    assert json.loads(line)["timestamp"] == "2023-11-14T22:13:20+00:00"
+
+
+@pytest.mark.parametrize("fast_format, expected", [(None, StructuredFormatter), (True, FastStructuredFormatter)])
+def test_configure_keeps_structured_formatter_unless_fast_is_requested(monkeypatch, fast_format, expected):
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", [])
+    monkeypatch.setattr(edge_observability, "_CONFIGURED", set())
+    monkeypatch.setattr(edge_observability, "LOG_FORMAT", "json")
+    monkeypatch.setattr(edge_observability, "LOG_FAST_FORMAT", False)
+    level = root.level
+    try:
+        edge_observability.configure_observability("formatter-default", queued=False, fast_format=fast_format)
+        assert type(root.handlers[0].formatter) is expected
+    finally:
+        root.setLevel(level)
@@ -0,0 +1,135 @@
+"""Unit tests for EBK rate limits, sampling, summaries and async listener dispatch."""
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "clients" / "common"))
+
+import edge_observability  # noqa: E402
+from edge_observability import (  # noqa: E402
+    StatusLimiter,
+    configure_status_emission,
+    emit_ai_status,
+    flush_observability,
+    register_status_listener,
+    unregister_status_listener,
+)
+
+
+@pytest.fixture()
+def captured(monkeypatch):
+    monkeypatch.setattr(edge_observability, "AI_STATUS_ENABLED", False)
+    events: list[tuple[str, dict]] = []
+
+    def listener(command: str, fields: dict) -> None:
+        events.append((command, fields))
+
+    register_status_listener(listener)
+    yield events
+    unregister_status_listener(listener)
+    configure_status_emission(rates={}, sample={}, async_listeners=False)
+
+
+def test_rate_limit_keeps_errors_and_summarizes(captured):
+    configure_status_emission(rates="upload=5", summary_interval=3600)
+    for i in range(100):
+        emit_ai_status("upload", path=f"{i}.txt", status="uploading")
+    emit_ai_status("upload", path="bad.txt", status="failed")
+    emit_ai_status("error", operation="copy")
+    emit_ai_status("journal", event_type="manifest_created")  # no limit for this command
+    uploads = [f for c, f in captured if c == "upload"]
+    assert len(uploads) in (6, 7)  # one second of burst (maybe one refill) plus the failure
+    assert uploads[-1]["status"] == "failed"
+    assert [c for c, _ in captured].count("error") == 1 and ("journal" in [c for c, _ in captured])
+    assert not any(c == "suppressed" for c, _ in captured)
+
+    flush_observability()
+    (summary,) = [f for c, f in captured if c == "suppressed"]
+    assert summary["suppressed_command"] == "upload"
+    assert summary["count"] == summary["rate_limited"] == 101 - len(uploads)
+
+
+def test_sampling_and_wildcard():
+    limiter = StatusLimiter(sample={"*": 0.0, "upload": 1.0}, summary_interval=0)
+    assert limiter.allow("upload", {})
+    assert not limiter.allow("progress", {})
+    assert limiter.allow("progress", {"status": "error"})
+    (summary,) = limiter.due_summaries()
+    assert summary["suppressed_command"] == "progress" and summary["sampled_out"] == 1
+    assert limiter.due_summaries() == []
+
+
+def test_async_listener_dispatch_does_not_block_the_emitter(captured):
+    release = threading.Event()
+    emitter_threads: set[int] = set()
+
+    def slow(command: str, fields: dict) -> None:
+        release.wait(5)
+        emitter_threads.add(threading.get_ident())
+
+    register_status_listener(slow)
+    try:
+        configure_status_emission(async_listeners=True)
+        for i in range(10):
+            emit_ai_status("upload", path=f"{i}.txt")
+        assert captured == []  # still queued behind the slow listener
+        release.set()
+        flush_observability()
+    finally:
+        unregister_status_listener(slow)
+    assert [f["path"] for _, f in captured] == [f"{i}.txt" for i in range(10)]
+    assert threading.get_ident() not in emitter_threads
+    assert edge_observability.observability_stats()["listener_queue"]["written"] == 10
+
+
+def test_quiet_burst_summary_is_emitted_by_the_timer(captured):
+    configure_status_emission(rates="upload=1", summary_interval=0.1)
+    for i in range(5):
+        emit_ai_status("upload", path=f"{i}.txt")
+    deadline = time.monotonic() + 5
+    while not any(c == "suppressed" for c, _ in captured) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    (summary,) = [f for c, f in captured if c == "suppressed"]
+    assert summary["suppressed_command"] == "upload" and summary["count"] >= 3
+
+
+def test_configured_limits_flush_at_exit(monkeypatch):
+    registered = []
+    monkeypatch.setattr(edge_observability, "_EXIT_FLUSH_REGISTERED", False)
+    monkeypatch.setattr(edge_observability.atexit, "register", registered.append)
+    try:
+        configure_status_emission(rates="upload=1", summary_interval=3600)
+        configure_status_emission(rates="upload=2", summary_interval=3600)
+    finally:
+        configure_status_emission(rates={}, sample={})
+    assert registered == [flush_observability]
+
+
+def test_async_listener_errors_are_logged(captured):
+    records: list[logging.LogRecord] = []
+    handler = logging.Handler(logging.ERROR)
+    handler.emit = records.append
+    module_logger = logging.getLogger("edge_observability")
+    module_logger.addHandler(handler)
+
+    def broken(command: str, fields: dict) -> None:
+        raise RuntimeError("listener down")
+
+    register_status_listener(broken)
+    try:
+        configure_status_emission(async_listeners=True)
+        emit_ai_status("upload", path="a.txt")
+        flush_observability()
+    finally:
+        unregister_status_listener(broken)
+        module_logger.removeHandler(handler)
+    assert [f["path"] for _, f in captured] == ["a.txt"]  # other listeners still ran
+    (record,) = records
+    assert "listener down" in str(record.exc_info[1]) and record.event_type == "listener_error"
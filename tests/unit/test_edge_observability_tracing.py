@@ -0,0 +1,89 @@
+"""Unit tests for span helpers and traceparent propagation."""
+from __future__ import annotations
+
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "clients" / "common"))
+
+import catcher_http  # noqa: E402
+from edge_observability import log_event, span, trace_headers  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def spans():
+    sdk = pytest.importorskip("opentelemetry.sdk.trace")
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, sdk.TracerProvider):
+        provider = sdk.TracerProvider()
+        trace.set_tracer_provider(provider)
+    exporter = InMemorySpanExporter()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    yield exporter
+    exporter.shutdown()
+
+
+def test_trace_headers_outside_a_span_only_copy_the_input():
+    headers = {"X-Other": "1"}
+    assert trace_headers(headers) == headers and trace_headers(headers) is not headers
+
+
+def test_spans_nest_and_headers_carry_the_current_span(spans):
+    spans.clear()
+    with span("backup", path="a.txt", size_bytes=None):
+        with span("register") as register:
+            headers = trace_headers({"Accept": "application/json"})
+    assert headers["Accept"] == "application/json"
+    context = register.get_span_context()
+    assert headers["traceparent"].startswith(f"00-{context.trace_id:032x}-{context.span_id:016x}-")
+    finished = {s.name: s for s in spans.get_finished_spans()}
+    assert finished["register"].parent.span_id == finished["backup"].context.span_id
+    assert dict(finished["backup"].attributes) == {"path": "a.txt"}
+
+
+def test_request_with_backoff_sends_traceparent_from_a_client_span(spans, monkeypatch):
+    requests = pytest.importorskip("requests")
+    sent: list[dict] = []
+
+    class Response:
+        status_code = 200
+        headers: dict = {}
+
+    def fake_request(method, url, **kwargs):
+        sent.append(kwargs["headers"])
+        return Response()
+
+    monkeypatch.setattr(requests, "request", fake_request)
+    spans.clear()
+    with span("backup"):
+        catcher_http.request_with_backoff("POST", "http://catcher/api/v1/ingest", json={})
+    client = next(s for s in spans.get_finished_spans() if s.name == "HTTP POST")
+    assert client.kind.name == "CLIENT"
+    assert client.attributes["http.response.status_code"] == 200
+    assert sent[0]["traceparent"].split("-")[2] == f"{client.context.span_id:016x}"
+
+
+def test_log_event_carries_trace_ids(spans):
+    records: list[logging.LogRecord] = []
+
+    class Capture(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            records.append(record)
+
+    logger = logging.getLogger("test-trace-ids")
+    logger.handlers = [Capture()]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    with span("hash") as current:
+        log_event(logger, logging.INFO, "hashed", event_type="client_upload")
+    log_event(logger, logging.INFO, "outside", event_type="client_upload")
+    assert records[0].trace_id == f"{current.get_span_context().trace_id:032x}"
+    assert records[1].trace_id is None
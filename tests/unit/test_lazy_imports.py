@@ -0,0 +1,65 @@
+"""Cold-start guards: entry points must not import optional heavy dependencies up front."""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+HEAVY = ("requests", "rich", "opentelemetry", "orjson")
+
+
+def imported(*args: str) -> tuple[subprocess.CompletedProcess[str], set[str]]:
+    """Run a fresh interpreter with ``-X importtime``; return it and the top-level packages it imported."""
+    env = {**os.environ, "EBK_AI_STATUS": "0"}
+    env.pop("OTEL_EXPORTER_OTLP_ENDPOINT", None)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        cwd=str(ROOT),
+        env=env,
+        check=False,
+    )
+    names = {
+        line.rsplit("|", 1)[1].strip().split(".")[0]
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:") and "self [us]" not in line
+    }
+    return proc, names
+
+
+def test_backup_agent_commands_skips_requests_and_otel():
+    proc, names = imported(str(ROOT / "scripts" / "backup-agent.py"), "commands", "--format", "ai")
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert names.isdisjoint(HEAVY), names & set(HEAVY)
+
+
+def test_silver_fiesta_help_skips_rich():
+    proc, names = imported(str(ROOT / "scripts" / "silver-fiesta.py"), "--help")
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert names.isdisjoint(HEAVY), names & set(HEAVY)
+
+
+def test_watch_and_ingest_import_skips_requests():
+    client = ROOT / "clients" / "docker-client"
+    proc, names = imported("-c", f"import sys; sys.path.insert(0, {str(client)!r}); import watch_and_ingest")
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert names.isdisjoint(HEAVY), names & set(HEAVY)
+
+
+def test_common_package_resolves_exports_on_first_access():
+    paths = [str(ROOT / "clients"), str(ROOT / "clients" / "common")]
+    code = (
+        f"import sys; sys.path[:0] = {paths!r}; import common\n"
+        "assert 'edge_observability' not in sys.modules and 'merkle' not in sys.modules\n"
+        "assert 'span' in dir(common)\n"
+        "with common.span('x') as current: assert current is None\n"
+        "assert 'edge_observability' in sys.modules and 'merkle' not in sys.modules\n"
+        "assert common.MerkleTree.__module__ == 'merkle'\n"
+        "try:\n    common.missing\nexcept AttributeError: pass\nelse: raise SystemExit('no AttributeError')\n"
+    )
+    proc, names = imported("-c", code)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert names.isdisjoint(HEAVY), names & set(HEAVY)
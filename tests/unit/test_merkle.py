@@ -0,0 +1,51 @@
+"""Unit tests for the shared Merkle reconciliation tree."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "clients" / "common"))
+
+from merkle import EMPTY_DIGEST, MAX_DEPTH, MerkleTree, bucket_of, reconcile  # noqa: E402
+
+
+def _entries(n: int) -> list[tuple[str, str, str]]:
+    return [(f"docs/{i}.txt", f"sha-{i}", "completed") for i in range(n)]
+
+
+def test_digest_is_independent_of_order_and_incremental():
+    entries = _entries(300)
+    forward = MerkleTree.from_entries(entries)
+    backward = MerkleTree.from_entries(list(reversed(entries)))
+    assert forward.digest() == backward.digest() != EMPTY_DIGEST
+
+    incremental = MerkleTree.from_entries(entries[:10])
+    incremental.digest()
+    for entry in entries[10:]:
+        incremental.update(entry[0], *entry)
+    incremental.update("extra", "docs/extra.txt", "x", None)
+    incremental.discard("extra")
+    assert incremental.digest() == forward.digest() and len(incremental) == 300
+    assert MerkleTree().digest() == EMPTY_DIGEST
+
+
+def test_reconcile_descends_only_into_divergent_buckets():
+    remote = MerkleTree.from_entries(_entries(2000))
+    local_entries = _entries(2000)
+    local_entries[5] = ("docs/5.txt", "sha-5", "in_progress")
+    local_entries.append(("docs/new.txt", "sha-new", None))
+    local = MerkleTree.from_entries(local_entries[1:])
+
+    def fetch_level(prefix, depth):
+        return {"digest": remote.digest(prefix), "nodes": remote.level(prefix, depth)}
+
+    result = reconcile(local, fetch_level, remote.entries)
+    assert result["only_local"] == [("docs/5.txt", "sha-5", "in_progress"), ("docs/new.txt", "sha-new", None)]
+    assert result["only_remote"] == [("docs/0.txt", "sha-0", "completed"), ("docs/5.txt", "sha-5", "completed")]
+    assert set(result["divergent_buckets"]) == {bucket_of(p) for p in ("docs/0.txt", "docs/5.txt", "docs/new.txt")}
+    assert all(len(b) == MAX_DEPTH for b in result["divergent_buckets"])
+    assert result["requests"] < 20
+
+    same = reconcile(remote, fetch_level, remote.entries)
+    assert same == {"only_local": [], "only_remote": [], "divergent_buckets": [], "requests": 1}